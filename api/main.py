@@ -0,0 +1,46 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from api.plan_executor import PlanExecutor
+from api.routes.therapy_routes import router as therapy_router
+from app.core.utils.metrics import metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    plan_executor = PlanExecutor.from_env()
+    app.state.plan_executor = plan_executor
+    await plan_executor.start()
+    try:
+        yield
+    finally:
+        plan_executor.shutdown()
+
+
+app = FastAPI(title="Mariposa API", lifespan=lifespan)
+app.include_router(therapy_router, prefix="/api/v1")
+
+
+@app.get("/health")
+async def health():
+    """Liveness: the process is up and serving the event loop"""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: the knowledge base is loaded and the worker pool accepts work"""
+    plan_executor = getattr(app.state, "plan_executor", None)
+    if plan_executor is None or not plan_executor.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {
+        "status": "ready",
+        "executor": plan_executor.mode,
+        "workers": plan_executor.max_workers
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Plan pipeline latency, cache and error metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
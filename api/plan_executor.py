@@ -0,0 +1,130 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from core.models.schemas import PatientInput, TherapyPlan
+from core.services.plan_service import KNOWLEDGE_BASE_FILES, TherapyPlanGenerator
+from app.core.services.knowledge_base import KnowledgeBaseWatcher, clear_catalog_caches, knowledge_base_version
+from app.core.services.plan_cache import PlanCache
+from app.core.utils.metrics import metrics
+
+# Worker-local generator: built once per worker process by the pool initializer
+_worker_generator: Optional[TherapyPlanGenerator] = None
+
+
+def _build_generator(plan_cache: PlanCache, kb_version: Optional[str] = None) -> TherapyPlanGenerator:
+    """A generator over the knowledge base as it is on disk now, stamped with that version"""
+    # Stamped before the files are read: if one changes mid-build, the watcher reloads again
+    kb_version = kb_version or knowledge_base_version(KNOWLEDGE_BASE_FILES)
+    clear_catalog_caches()
+    return TherapyPlanGenerator(plan_cache=plan_cache, kb_version=kb_version)
+
+
+def _reload_worker_generator(kb_version: str):
+    global _worker_generator
+    # Built in full before the swap; a plan already running finishes on the old generator
+    _worker_generator = _build_generator(_worker_generator.plan_cache, kb_version)
+
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = _build_generator(PlanCache.from_env())
+    KnowledgeBaseWatcher.from_env(_reload_worker_generator, paths=KNOWLEDGE_BASE_FILES,
+                                  version=_worker_generator.kb_version).start()
+
+
+def _generate_in_worker(patient_input: PatientInput) -> Tuple[Optional[TherapyPlan], Optional[Exception], Dict]:
+    """Run one plan and hand back, with it, the metrics this worker recorded since its last plan"""
+    try:
+        return _worker_generator.generate_therapy_plan(patient_input), None, metrics.drain()
+    except Exception as e:
+        return None, e, metrics.drain()
+
+
+def _worker_ready() -> bool:
+    return _worker_generator is not None
+
+
+class PlanExecutor:
+    """Runs CPU-bound plan generation off the event loop on a bounded pool
+
+    ``mode="process"`` gives every worker process its own preloaded
+    TherapyPlanGenerator, plan cache and knowledge-base watcher so throughput
+    scales with cores. ``mode="thread"`` shares one generator across a thread
+    pool, which is lighter but bound by the GIL. Either way, edited data files
+    are loaded into a new generator that replaces the old one once built.
+    At most ``max_pending`` requests wait for a worker; the rest queue on the loop.
+    """
+
+    def __init__(self,
+                 mode: str = "process",
+                 max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.executor: Optional[Executor] = None
+        self.generator: Optional[TherapyPlanGenerator] = None
+        self.watcher: Optional[KnowledgeBaseWatcher] = None
+        self.ready = False
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "PlanExecutor":
+        workers = os.environ.get("MARIPOSA_API_WORKERS")
+        return cls(
+            mode=os.environ.get("MARIPOSA_API_EXECUTOR", "process"),
+            max_workers=int(workers) if workers else None
+        )
+
+    async def start(self):
+        """Build the services and wait until the pool can serve a request"""
+        loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if self.mode == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                initializer=_init_worker)
+            # Forces at least one worker to load the knowledge base before reporting ready
+            await loop.run_in_executor(self.executor, _worker_ready)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix="plan-worker")
+            self.generator = await loop.run_in_executor(
+                self.executor, lambda: _build_generator(PlanCache.from_env())
+            )
+            self.watcher = KnowledgeBaseWatcher.from_env(self._reload_generator, paths=KNOWLEDGE_BASE_FILES,
+                                                         version=self.generator.kb_version).start()
+        self.ready = True
+
+    def _reload_generator(self, kb_version: str):
+        """Watcher callback in thread mode: build a new generator, then swap it in"""
+        self.generator = _build_generator(self.generator.plan_cache, kb_version)
+
+    async def generate(self, patient_input: PatientInput) -> TherapyPlan:
+        if not self.ready:
+            raise RuntimeError("Plan executor is not ready")
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            if self.mode == "process":
+                therapy_plan, error, worker_metrics = await loop.run_in_executor(
+                    self.executor, _generate_in_worker, patient_input
+                )
+                # Worker processes have their own registries; fold theirs into the one /metrics serves
+                metrics.merge(worker_metrics)
+                if error is not None:
+                    raise error
+                return therapy_plan
+            return await loop.run_in_executor(
+                self.executor, self.generator.generate_therapy_plan, patient_input
+            )
+
+    def shutdown(self):
+        self.ready = False
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
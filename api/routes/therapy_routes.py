@@ -1,13 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from core.models.schemas import PatientInput, TherapyPlan
-from core.services.plan_service import generate_therapy_plan
 
 router = APIRouter()
 
 @router.post("/plans/generate", response_model=TherapyPlan)
-async def generate_plan(patient_input: PatientInput):
+async def generate_plan(patient_input: PatientInput, request: Request):
     try:
-        therapy_plan = generate_therapy_plan(patient_input)
+        # Plan generation is CPU-bound, so it runs on the app's worker pool, never on the loop
+        therapy_plan = await request.app.state.plan_executor.generate(patient_input)
         return therapy_plan
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
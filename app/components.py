@@ -0,0 +1,50 @@
+# Streamlit helpers shared by the main app and the pages
+from typing import Iterable
+import streamlit as st
+from app.core.models.schedule import ScheduleEntry
+from app.core.services.registry import get_registry
+
+
+@st.cache_data(show_spinner=False)
+def technique_markdown(technique_id: str, kb_version: str) -> str:
+    """A technique's description, steps, exercise and resources as one markdown block, built once per technique
+
+    ``kb_version`` is only part of the cache key, so edited technique data is re-rendered.
+    """
+    technique_details = get_registry().get("technique_db").get_technique_by_id(technique_id)
+    if not technique_details:
+        return ""
+
+    lines = ["#### About this Technique", technique_details.get('description', ''), "", "#### Steps"]
+    lines += [f"• {step}" for step in technique_details.get('steps', [])]
+
+    exercises = technique_details.get('exercises', [])
+    if exercises:
+        exercise = exercises[0]
+        lines += ["", "#### Today's Exercise", f"**{exercise['name']}** ({exercise['duration']})"]
+        lines += [f"• {instruction}" for instruction in exercise['instructions']]
+
+    lines += ["", "#### Additional Resources"]
+    lines += [f"• [{resource['title']}]({resource['url']}) ({resource['type']})"
+              for resource in technique_details.get('resources', [])]
+    # Two trailing spaces keep each bullet on its own line
+    return "  \n".join(lines)
+
+
+def show_technique_picker(sessions: Iterable[ScheduleEntry], key: str):
+    """Let the user pick one of the sessions' techniques and render only that one's details"""
+    techniques = {}
+    for session in sessions:
+        if session.technique_id:
+            techniques.setdefault(session.technique_id, session.activity)
+    if not techniques:
+        return
+
+    technique_id = st.selectbox(
+        "Technique details",
+        options=[None] + list(techniques),
+        format_func=lambda option: "Choose a technique to read about" if option is None else techniques[option],
+        key=key
+    )
+    if technique_id:
+        st.markdown(technique_markdown(technique_id, get_registry().get("kb_version")))
@@ -0,0 +1,177 @@
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.services.technique_database import EMPTY_TECHNIQUE, TechniqueDatabase
+
+# Keys exposed by the dict-compatible view, in the order the old schedule dicts used
+ENTRY_KEYS = ("date", "day", "time", "activity", "type", "duration", "technique_details")
+
+
+class ScheduleEntry(Mapping):
+    """A single scheduled activity stored as an ordinal day and interned strings
+
+    Behaves like the dicts the schedule used to hold (``entry['date']``,
+    ``entry.get('technique_details', {})``), but the formatted date strings and
+    technique details are only produced when a page asks for them.
+    """
+    __slots__ = ("ordinal", "time", "activity", "type", "duration", "technique_id", "technique_db")
+
+    def __init__(self,
+                 ordinal: int,
+                 time: str,
+                 activity: str,
+                 type: str,
+                 duration: str,
+                 technique_id: Optional[str],
+                 technique_db: TechniqueDatabase):
+        self.ordinal = ordinal
+        self.time = sys.intern(time)
+        self.activity = sys.intern(activity)
+        self.type = sys.intern(type)
+        self.duration = sys.intern(duration)
+        self.technique_id = sys.intern(technique_id) if technique_id else None
+        self.technique_db = technique_db
+
+    @property
+    def date(self) -> date:
+        return date.fromordinal(self.ordinal)
+
+    @property
+    def technique_details(self) -> Mapping:
+        """Resolve the shared technique record on demand"""
+        if self.technique_id is None:
+            return EMPTY_TECHNIQUE
+        return self.technique_db.get_technique_by_id(self.technique_id)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "date":
+            return self.date.isoformat()
+        if key == "day":
+            return self.date.strftime("%A")
+        if key == "technique_details":
+            return self.technique_details
+        if key in ("time", "activity", "type", "duration"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(ENTRY_KEYS)
+
+    def __len__(self) -> int:
+        return len(ENTRY_KEYS)
+
+    def __repr__(self) -> str:
+        return (f"ScheduleEntry({self.date.isoformat()} {self.time} "
+                f"{self.activity!r}, {self.type!r}, {self.duration!r})")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Materialize the legacy dict form, e.g. for serialization"""
+        return {key: self[key] for key in ENTRY_KEYS}
+
+
+class TherapySchedule(Sequence):
+    """Date-ordered schedule entries that reference techniques by id"""
+    __slots__ = ("entries",)
+
+    def __init__(self, entries: List[ScheduleEntry]):
+        self.entries = entries
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TherapySchedule(self.entries[index])
+        return self.entries[index]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[ScheduleEntry]:
+        return iter(self.entries)
+
+    def __repr__(self) -> str:
+        if not self.entries:
+            return "TherapySchedule([])"
+        return (f"TherapySchedule({len(self.entries)} entries, "
+                f"{self.entries[0].date.isoformat()} to {self.entries[-1].date.isoformat()})")
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize every entry in the legacy dict form"""
+        return [entry.as_dict() for entry in self.entries]
+
+    @property
+    def start_date(self) -> Optional[date]:
+        return self.entries[0].date if self.entries else None
+
+    @property
+    def end_date(self) -> Optional[date]:
+        return self.entries[-1].date if self.entries else None
+
+    def iter_range(self, start: date, end: date) -> Iterator[ScheduleEntry]:
+        """Entries dated between start and end inclusive"""
+        ordinals = [entry.ordinal for entry in self.entries]
+        low = bisect_left(ordinals, start.toordinal())
+        high = bisect_right(ordinals, end.toordinal())
+        return iter(self.entries[low:high])
+
+
+class PlannedSchedule:
+    """A schedule spanning the whole plan, generated lazily from its parameters
+
+    Nothing is materialized up front: ``iter_range`` starts the planner's
+    generator at the first week that overlaps the range, so showing one month
+    of a six-month plan only builds that month.
+    """
+    __slots__ = ("planner", "therapy_type", "session_frequency", "techniques",
+                 "severity", "start_ordinal", "weeks")
+
+    def __init__(self, planner, therapy_type: str, session_frequency: str,
+                 techniques: List[str], severity, start_ordinal: int, weeks: int):
+        self.planner = planner
+        self.therapy_type = therapy_type
+        self.session_frequency = session_frequency
+        self.techniques = techniques
+        self.severity = severity
+        self.start_ordinal = start_ordinal
+        self.weeks = weeks
+
+    @property
+    def start_date(self) -> date:
+        return date.fromordinal(self.start_ordinal)
+
+    @property
+    def end_date(self) -> date:
+        return date.fromordinal(self.start_ordinal + self.weeks * 7 - 1)
+
+    def _iter_weeks(self, start_week: int = 0) -> Iterator[ScheduleEntry]:
+        return self.planner.iter_schedule(
+            therapy_type=self.therapy_type,
+            session_frequency=self.session_frequency,
+            techniques=self.techniques,
+            severity=self.severity,
+            start_date=self.start_date,
+            weeks=self.weeks,
+            start_week=start_week
+        )
+
+    def __iter__(self) -> Iterator[ScheduleEntry]:
+        return self._iter_weeks()
+
+    def __bool__(self) -> bool:
+        return self.weeks > 0
+
+    def __repr__(self) -> str:
+        return (f"PlannedSchedule({self.weeks} weeks, "
+                f"{self.start_date.isoformat()} to {self.end_date.isoformat()})")
+
+    def iter_range(self, start: date, end: date) -> Iterator[ScheduleEntry]:
+        """Entries dated between start and end inclusive, generating only the weeks involved"""
+        first = max(start.toordinal(), self.start_ordinal)
+        last = min(end.toordinal(), self.start_ordinal + self.weeks * 7 - 1)
+        if first > last:
+            return
+        for entry in self._iter_weeks(start_week=(first - self.start_ordinal) // 7):
+            if entry.ordinal > last:
+                return
+            if entry.ordinal >= first:
+                yield entry
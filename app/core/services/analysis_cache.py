@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.utils.metrics import metrics
+
+
+def text_fingerprint(text: str) -> str:
+    """Content hash of a text exactly as analyzed; any change to it is a different text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Thread-safe LRU cache of sentiment analyses, keyed by text fingerprint and analyzer version
+
+    Results are stored serialized and every hit returns a fresh copy, so
+    callers may modify what they get back. ``max_entries=0`` disables caching.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AnalysisCache":
+        """Size from MARIPOSA_SENTIMENT_CACHE_SIZE (0 turns the cache off)"""
+        return cls(max_entries=int(os.environ.get("MARIPOSA_SENTIMENT_CACHE_SIZE", 2048)))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text_hash: str, analyzer_version: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        key = f"{analyzer_version}:{text_hash}"
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        metrics.inc("mariposa_sentiment_cache_requests_total", result="miss" if payload is None else "hit")
+        return None if payload is None else json.loads(payload)
+
+    def put(self, text_hash: str, analyzer_version: str, result: Dict):
+        if not self.enabled:
+            return
+        key = f"{analyzer_version}:{text_hash}"
+        payload = json.dumps(result)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
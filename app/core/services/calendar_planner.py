@@ -1,109 +1,160 @@
-from datetime import datetime, timedelta
-from typing import List, Dict
+import re
+from datetime import date, datetime, timedelta
+from itertools import count
+from typing import Iterator, List, Dict, Optional, Union
 import calendar
 from app.core.services.technique_database import TechniqueDatabase
 from app.core.models.severity_level import SeverityLevel
+from app.core.models.schedule import PlannedSchedule, ScheduleEntry, TherapySchedule
+
+# Adjust activities based on severity
+DAILY_ACTIVITIES = {
+    SeverityLevel.LOW: [
+        ("08:00", "Morning Mindfulness", "15 minutes"),
+        ("20:00", "Progressive Muscle Relaxation", "15 minutes")
+    ],
+    SeverityLevel.MODERATE: [
+        ("08:00", "Morning Mindfulness", "20 minutes"),
+        ("14:00", "Afternoon Practice", "20 minutes"),
+        ("20:00", "Progressive Muscle Relaxation", "20 minutes")
+    ],
+    SeverityLevel.SEVERE: [
+        ("08:00", "Morning Mindfulness", "30 minutes"),
+        ("11:00", "Mid-morning Practice", "30 minutes"),
+        ("14:00", "Afternoon Practice", "30 minutes"),
+        ("17:00", "Evening Practice", "30 minutes"),
+        ("20:00", "Progressive Muscle Relaxation", "30 minutes")
+    ]
+}
+
+# Session frequency based on severity
+SESSIONS_PER_WEEK = {
+    SeverityLevel.LOW: {
+        "bi-weekly": 1,
+        "weekly": 1,
+        "twice-weekly": 2
+    },
+    SeverityLevel.MODERATE: {
+        "bi-weekly": 2,
+        "weekly": 2,
+        "twice-weekly": 3
+    },
+    SeverityLevel.SEVERE: {
+        "bi-weekly": 3,
+        "weekly": 3,
+        "twice-weekly": 5
+    }
+}
+
+# Adjust session duration based on severity
+SESSION_DURATIONS = {
+    SeverityLevel.LOW: "45 minutes",
+    SeverityLevel.MODERATE: "60 minutes",
+    SeverityLevel.SEVERE: "90 minutes"
+}
+
+SESSION_TIME = "14:00"
+DEFAULT_PLAN_WEEKS = 4
+
+
+def parse_duration_weeks(duration: str, default: int = DEFAULT_PLAN_WEEKS) -> int:
+    """Turn a plan duration such as "12-16 weeks" into its upper bound in weeks"""
+    numbers = [int(number) for number in re.findall(r"\d+", duration or "")]
+    if not numbers:
+        return default
+    weeks = max(numbers)
+    if "month" in duration.lower():
+        weeks = -(-weeks * 52 // 12)
+    return weeks
+
 
 class TherapyCalendarPlanner:
-    def __init__(self):
-        self.technique_db = TechniqueDatabase()
+    def __init__(self, technique_db: Optional[TechniqueDatabase] = None):
+        self.technique_db = technique_db or TechniqueDatabase()
 
-    def generate_weekly_schedule(self, 
-                               therapy_type: str,
-                               session_frequency: str,
-                               techniques: List[str],
-                               severity: SeverityLevel,
-                               start_date: datetime = None) -> List[Dict]:
+    def _technique_id(self, name: str) -> Optional[str]:
+        return self.technique_db.get_technique_info(name).get("id")
+
+    def iter_schedule(self,
+                      therapy_type: str,
+                      session_frequency: str,
+                      techniques: List[str],
+                      severity: SeverityLevel,
+                      start_date: Union[date, datetime, None] = None,
+                      weeks: Optional[int] = None,
+                      start_week: int = 0) -> Iterator[ScheduleEntry]:
+        """Yield schedule entries in (date, time) order, one day at a time
+
+        Week numbers count from ``start_date``; generation begins at ``start_week``
+        and stops before ``weeks`` (or never, if ``weeks`` is None). Only one
+        day's handful of entries is ever held and ordered at once.
+        """
         if start_date is None:
             start_date = datetime.now()
+        start_ordinal = start_date.toordinal()
+
+        daily_activities = [
+            (time, activity, duration, self._technique_id(activity))
+            for time, activity, duration in DAILY_ACTIVITIES[severity]
+        ]
+        weekly_sessions = SESSIONS_PER_WEEK[severity].get(session_frequency, 1)
+        session_duration = SESSION_DURATIONS[severity]
+        technique_ids = [self._technique_id(technique) for technique in techniques]
+
+        week_numbers = count(start_week) if weeks is None else range(start_week, weeks)
+        for week in week_numbers:
+            week_start = start_ordinal + week * 7
+            technique_index = week % len(techniques) if techniques else None
 
-        # Create a structured weekly schedule
-        schedule = []
-        
-        # Adjust activities based on severity
-        daily_activities = {
-            SeverityLevel.LOW: [
-                ("08:00", "Morning Mindfulness", "15 minutes"),
-                ("20:00", "Progressive Muscle Relaxation", "15 minutes")
-            ],
-            SeverityLevel.MODERATE: [
-                ("08:00", "Morning Mindfulness", "20 minutes"),
-                ("14:00", "Afternoon Practice", "20 minutes"),
-                ("20:00", "Progressive Muscle Relaxation", "20 minutes")
-            ],
-            SeverityLevel.SEVERE: [
-                ("08:00", "Morning Mindfulness", "30 minutes"),
-                ("11:00", "Mid-morning Practice", "30 minutes"),
-                ("14:00", "Afternoon Practice", "30 minutes"),
-                ("17:00", "Evening Practice", "30 minutes"),
-                ("20:00", "Progressive Muscle Relaxation", "30 minutes")
-            ]
-        }
-
-        # Session frequency based on severity
-        sessions_per_week = {
-            SeverityLevel.LOW: {
-                "bi-weekly": 1,
-                "weekly": 1,
-                "twice-weekly": 2
-            },
-            SeverityLevel.MODERATE: {
-                "bi-weekly": 2,
-                "weekly": 2,
-                "twice-weekly": 3
-            },
-            SeverityLevel.SEVERE: {
-                "bi-weekly": 3,
-                "weekly": 3,
-                "twice-weekly": 5
-            }
-        }
-        
-        weekly_sessions = sessions_per_week[severity].get(session_frequency, 1)
-        
-        # Generate 4-week schedule
-        for week in range(4):
-            current_week_start = start_date + timedelta(weeks=week)
-            
-            # Add daily activities based on severity
             for day in range(7):
-                current_date = current_week_start + timedelta(days=day)
-                
-                # Add severity-based daily activities
-                for time, activity, duration in daily_activities[severity]:
-                    schedule.append({
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "day": current_date.strftime("%A"),
-                        "time": time,
-                        "activity": activity,
-                        "type": "Daily Practice",
-                        "duration": duration,
-                        "technique_details": self.technique_db.get_technique_info(activity)
-                    })
-
-            # Add therapy sessions
-            available_days = list(range(7))  # All days available
-            session_days = available_days[:weekly_sessions]
-            
-            for day_index in session_days:
-                session_date = current_week_start + timedelta(days=day_index)
-                technique = techniques[week % len(techniques)]
-                
-                # Adjust session duration based on severity
-                session_duration = {
-                    SeverityLevel.LOW: "45 minutes",
-                    SeverityLevel.MODERATE: "60 minutes",
-                    SeverityLevel.SEVERE: "90 minutes"
-                }[severity]
-                
-                schedule.append({
-                    "date": session_date.strftime("%Y-%m-%d"),
-                    "day": session_date.strftime("%A"),
-                    "time": "14:00",
-                    "activity": technique,
-                    "type": therapy_type,
-                    "duration": session_duration,
-                    "technique_details": self.technique_db.get_technique_info(technique)
-                })
-
-        return sorted(schedule, key=lambda x: (x['date'], x['time'])) 
\ No newline at end of file
+                ordinal = week_start + day
+                day_entries = [
+                    ScheduleEntry(ordinal, time, activity, "Daily Practice", duration,
+                                  technique_id, self.technique_db)
+                    for time, activity, duration, technique_id in daily_activities
+                ]
+                # Therapy sessions fall on the first days of each week
+                if technique_index is not None and day < weekly_sessions:
+                    day_entries.append(ScheduleEntry(
+                        ordinal, SESSION_TIME, techniques[technique_index], therapy_type,
+                        session_duration, technique_ids[technique_index], self.technique_db
+                    ))
+                # Stable sort keeps daily practice ahead of a session at the same time
+                day_entries.sort(key=lambda entry: entry.time)
+                yield from day_entries
+
+    def plan_schedule(self,
+                      therapy_type: str,
+                      session_frequency: str,
+                      techniques: List[str],
+                      severity: SeverityLevel,
+                      weeks: int = DEFAULT_PLAN_WEEKS,
+                      start_date: Union[date, datetime, None] = None) -> PlannedSchedule:
+        """Describe a schedule over the whole plan without generating any entries yet"""
+        if start_date is None:
+            start_date = datetime.now()
+        return PlannedSchedule(
+            planner=self,
+            therapy_type=therapy_type,
+            session_frequency=session_frequency,
+            techniques=list(techniques),
+            severity=severity,
+            start_ordinal=start_date.toordinal(),
+            weeks=weeks
+        )
+
+    def generate_weekly_schedule(self,
+                               therapy_type: str,
+                               session_frequency: str,
+                               techniques: List[str],
+                               severity: SeverityLevel,
+                               start_date: datetime = None,
+                               weeks: int = DEFAULT_PLAN_WEEKS) -> TherapySchedule:
+        return TherapySchedule(list(self.iter_schedule(
+            therapy_type=therapy_type,
+            session_frequency=session_frequency,
+            techniques=techniques,
+            severity=severity,
+            start_date=start_date,
+            weeks=weeks
+        )))
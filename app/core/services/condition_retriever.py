@@ -0,0 +1,176 @@
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ConditionMatch = Tuple[str, float]
+
+# Postings of the shard each shard worker serves, set by _init_shard_worker
+_worker_shard: Dict[str, object] = {}
+
+
+def select_top_k(candidates: "np.ndarray", scores: "np.ndarray", threshold: float,
+                 top_k: Optional[int] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Keep the candidates scoring above threshold, best first, optionally only the top k
+
+    Ties are broken by catalog position, as a stable sort over the catalog would.
+    """
+    import numpy as np
+
+    above = scores > threshold
+    candidates, scores = candidates[above], scores[above]
+    if top_k is not None and len(candidates) > top_k:
+        # Partitioning is linear, so only the survivors get sorted. Everything
+        # tied with the k-th best score survives too, so the catalog-order
+        # tie-break below still sees every candidate it could pick.
+        kth = np.argpartition(-scores, top_k - 1)[top_k - 1]
+        keep = scores >= scores[kth]
+        candidates, scores = candidates[keep], scores[keep]
+
+    order = np.lexsort((candidates, -scores))
+    if top_k is not None:
+        order = order[:top_k]
+    return candidates[order], scores[order]
+
+
+def _score_shard(postings, query_matrix, offset: int, threshold: float,
+                 top_k: Optional[int]) -> List[Tuple["np.ndarray", "np.ndarray"]]:
+    """Rank one shard's conditions for every query row, as (catalog indices, scores) pairs
+
+    ``postings`` is the shard's term-by-condition matrix, so each query only
+    touches the posting lists of the terms it contains.
+    """
+    import numpy as np
+
+    scores = (query_matrix @ postings).tocsr()
+    results = []
+    for row in range(scores.shape[0]):
+        if threshold < 0:
+            # Conditions sharing no term with the query score 0 and still clear a negative threshold
+            row_scores = scores[row].toarray()[0]
+            candidates = np.arange(len(row_scores))
+        else:
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            candidates, row_scores = scores.indices[start:end], scores.data[start:end]
+        candidates, row_scores = select_top_k(candidates, row_scores, threshold, top_k)
+        results.append((candidates + offset, row_scores))
+    return results
+
+
+def _init_shard_worker(postings, offset: int):
+    _worker_shard["postings"] = postings
+    _worker_shard["offset"] = offset
+
+
+def _score_worker_shard(query_matrix, threshold: float, top_k: Optional[int]):
+    return _score_shard(_worker_shard["postings"], query_matrix, _worker_shard["offset"], threshold, top_k)
+
+
+def _shutdown_executors(executors: List[ProcessPoolExecutor]):
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ConditionRetriever:
+    """Top-k condition retrieval over a TF-IDF index of the condition catalog
+
+    The catalog is kept as an inverted index (one posting list of conditions
+    per vocabulary term), so a query is scored by summing only the posting
+    lists of its own terms, and selection is a linear ``argpartition`` rather
+    than a sort of the whole catalog. Scores are cosine similarities, since
+    TfidfVectorizer rows are L2-normalized.
+
+    With ``shards`` > 1 the catalog is split into contiguous blocks of
+    conditions, each held by its own worker process; every shard returns its
+    local top k and the results are merged here. This only pays off for
+    catalogs far larger than the query overhead of a process round trip;
+    call ``close`` (or drop the retriever) to stop the workers.
+    """
+
+    def __init__(self, conditions: Sequence[str], texts: Sequence[str], shards: int = 1):
+        if len(conditions) != len(texts):
+            raise ValueError("conditions and texts must have the same length")
+        self.conditions = list(conditions)
+        self.vectorizer = None
+        self.postings = None
+        self._shard_executors: List[ProcessPoolExecutor] = []
+        if not self.conditions:
+            return
+
+        # scikit-learn is only needed once the first plan is requested, not to render the app
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        criteria_matrix = self.vectorizer.fit_transform(texts)
+        # Transposed to terms x conditions: row t is the posting list of term t
+        self.postings = criteria_matrix.T.tocsr()
+
+        shards = min(max(shards, 1), len(self.conditions))
+        if shards > 1:
+            self._start_shards(shards)
+
+    @classmethod
+    def from_env(cls, conditions: Sequence[str], texts: Sequence[str]) -> "ConditionRetriever":
+        """Shard count from MARIPOSA_RETRIEVAL_SHARDS (default 1, i.e. in-process)"""
+        return cls(conditions, texts, shards=int(os.environ.get("MARIPOSA_RETRIEVAL_SHARDS", 1)))
+
+    def _start_shards(self, shards: int):
+        bounds = [len(self.conditions) * i // shards for i in range(shards + 1)]
+        for start, end in zip(bounds, bounds[1:]):
+            # One single-worker pool per shard, so each shard's postings are shipped to one process once
+            self._shard_executors.append(ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_shard_worker,
+                initargs=(self.postings[:, start:end].tocsr(), start)
+            ))
+        weakref.finalize(self, _shutdown_executors, self._shard_executors)
+
+    @property
+    def shards(self) -> int:
+        return max(len(self._shard_executors), 1)
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+    def search(self, text: str, threshold: float = 0.0,
+               top_k: Optional[int] = None) -> List[ConditionMatch]:
+        """Conditions whose similarity to ``text`` exceeds threshold, best first"""
+        return self.search_many([text], threshold, top_k)[0]
+
+    def search_many(self, texts: Iterable[str], threshold: float = 0.0,
+                    top_k: Optional[int] = None) -> List[List[ConditionMatch]]:
+        """``search`` for several texts, scored together; one ranked list per text, in order"""
+        texts = list(texts)
+        if top_k is not None and top_k < 0:
+            raise ValueError("top_k must not be negative")
+        if self.postings is None or not texts or top_k == 0:
+            return [[] for _ in texts]
+
+        query_matrix = self.vectorizer.transform(texts)
+        if not self._shard_executors:
+            ranked = _score_shard(self.postings, query_matrix, 0, threshold, top_k)
+        else:
+            ranked = self._search_shards(query_matrix, threshold, top_k)
+        return [[(self.conditions[i], float(score)) for i, score in zip(candidates, scores)]
+                for candidates, scores in ranked]
+
+    def _search_shards(self, query_matrix, threshold: float,
+                       top_k: Optional[int]) -> List[Tuple["np.ndarray", "np.ndarray"]]:
+        import numpy as np
+
+        futures = [executor.submit(_score_worker_shard, query_matrix, threshold, top_k)
+                   for executor in self._shard_executors]
+        per_shard = [future.result() for future in futures]
+        merged = []
+        for row in range(query_matrix.shape[0]):
+            candidates = np.concatenate([shard[row][0] for shard in per_shard])
+            scores = np.concatenate([shard[row][1] for shard in per_shard])
+            # Each shard already applied the threshold; this only merges the local top ks
+            merged.append(select_top_k(candidates, scores, -np.inf, top_k))
+        return merged
+
+    def close(self):
+        _shutdown_executors(self._shard_executors)
+        self._shard_executors = []
@@ -0,0 +1,105 @@
+import calendar
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.models.schedule import ScheduleEntry
+from app.core.services.journal_store import DEFAULT_USER_ID, JournalStore
+
+MonthKey = Tuple[int, int]
+WeekKey = Tuple[int, int]
+
+
+class DayBucket:
+    """Everything the calendar views show for one day"""
+    __slots__ = ("ordinal", "sessions", "journal_count")
+
+    def __init__(self, ordinal: int):
+        self.ordinal = ordinal
+        self.sessions: List[ScheduleEntry] = []
+        self.journal_count = 0
+
+    @property
+    def date(self) -> date:
+        return date.fromordinal(self.ordinal)
+
+
+class DateIndex:
+    """Schedule sessions and journal entry counts keyed by ordinal day
+
+    Days are bucketed by (year, month) and ISO (year, week). A month is filled
+    the first time a view asks for it: the schedule generates only that month
+    and the journal store reads only that month's daily counts. After that,
+    ``add_journal_entry`` keeps the index current as entries are saved.
+    """
+
+    def __init__(self, schedule=None, journal_store: Optional[JournalStore] = None,
+                 user_id: str = DEFAULT_USER_ID):
+        self.schedule = schedule
+        self.journal_store = journal_store
+        self.user_id = user_id
+        self._days: Dict[int, DayBucket] = {}
+        self._months: Dict[MonthKey, Set[int]] = {}
+        self._weeks: Dict[WeekKey, Set[int]] = {}
+        self._loaded_months: Set[MonthKey] = set()
+
+    def _bucket(self, ordinal: int) -> DayBucket:
+        bucket = self._days.get(ordinal)
+        if bucket is None:
+            bucket = self._days[ordinal] = DayBucket(ordinal)
+            day = date.fromordinal(ordinal)
+            iso_year, iso_week, _ = day.isocalendar()
+            self._months.setdefault((day.year, day.month), set()).add(ordinal)
+            self._weeks.setdefault((iso_year, iso_week), set()).add(ordinal)
+        return bucket
+
+    def add_session(self, session: ScheduleEntry):
+        self._bucket(session.ordinal).sessions.append(session)
+
+    def add_journal_entry(self, day: date, count: int = 1):
+        """Record newly saved entries; months not loaded yet will read them from the store"""
+        if (day.year, day.month) in self._loaded_months:
+            self._bucket(day.toordinal()).journal_count += count
+
+    def _ensure_month(self, year: int, month: int):
+        if (year, month) in self._loaded_months:
+            return
+        self._loaded_months.add((year, month))
+        first = date(year, month, 1)
+        last = date(year, month, calendar.monthrange(year, month)[1])
+
+        if self.schedule:
+            for session in self.schedule.iter_range(first, last):
+                self.add_session(session)
+        if self.journal_store is not None:
+            for day in self.journal_store.daily_mood(self.user_id, first, last):
+                self._bucket(date.fromisoformat(day["date"]).toordinal()).journal_count += day["count"]
+
+    def _buckets(self, ordinals: Set[int]) -> Dict[int, DayBucket]:
+        return {ordinal: self._days[ordinal] for ordinal in sorted(ordinals)}
+
+    def day(self, day: date) -> DayBucket:
+        self._ensure_month(day.year, day.month)
+        return self._days.get(day.toordinal()) or DayBucket(day.toordinal())
+
+    def month(self, year: int, month: int) -> Dict[int, DayBucket]:
+        """Non-empty days of a calendar month, in date order"""
+        self._ensure_month(year, month)
+        return self._buckets(self._months.get((year, month), set()))
+
+    def week(self, iso_year: int, iso_week: int) -> Dict[int, DayBucket]:
+        """Non-empty days of an ISO week, in date order"""
+        monday = date.fromisocalendar(iso_year, iso_week, 1)
+        for day in (monday, monday + timedelta(days=6)):
+            self._ensure_month(day.year, day.month)
+        return self._buckets(self._weeks.get((iso_year, iso_week), set()))
+
+    def schedule_weeks(self) -> List[WeekKey]:
+        """ISO weeks covered by the schedule, in order"""
+        if not self.schedule:
+            return []
+        start = self.schedule.start_date
+        monday = start - timedelta(days=start.weekday())
+        weeks = []
+        while monday <= self.schedule.end_date:
+            weeks.append(tuple(monday.isocalendar()[:2]))
+            monday += timedelta(days=7)
+        return weeks
@@ -0,0 +1,232 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from app.core.services.analysis_cache import text_fingerprint
+from app.core.services.journal_store import DEFAULT_USER_ID, JournalStore
+from app.core.services.sentiment_analyzer import SentimentAnalyzer, failed_analysis
+from app.core.utils.exceptions import JournalImportError
+
+JOURNAL_FORMATS = ("jsonl", "csv")
+CSV_FIELDS = ("date", "time", "text", "sentiment_score", "sentiment_label", "emotions", "risk_level")
+# Emotions share one CSV column
+CSV_EMOTION_SEPARATOR = ";"
+DEFAULT_BATCH_SIZE = 500
+# Only the first few bad rows are reported back; the rest are just counted
+MAX_REPORTED_ERRORS = 20
+
+# (line number, parsed record, error message); exactly one of record and error is set
+RawRow = Tuple[int, Optional[Dict], Optional[str]]
+
+
+class ImportProgress(NamedTuple):
+    rows_read: int
+    imported: int
+    skipped: int
+    bytes_read: int
+
+
+class ImportReport(NamedTuple):
+    imported: int
+    skipped: int
+    analysis_failures: int
+    errors: List[str]
+
+
+def journal_format(file_name: str) -> str:
+    """The journal format a file name's extension stands for"""
+    extension = file_name.rsplit(".", 1)[-1].lower()
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    raise JournalImportError(f"Unsupported journal file {file_name}: expected .jsonl or .csv")
+
+
+def _read_jsonl(stream: TextIO) -> Iterator[RawRow]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON ({e.msg})"
+            continue
+        if isinstance(record, dict):
+            yield line_number, record, None
+        else:
+            yield line_number, None, "expected a JSON object"
+
+
+def _read_csv(stream: TextIO) -> Iterator[RawRow]:
+    reader = csv.DictReader(stream)
+    missing = [field for field in ("date", "text") if field not in (reader.fieldnames or ())]
+    if missing:
+        raise JournalImportError(f"CSV journal is missing the {', '.join(missing)} column(s)")
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def _entry_from_record(record: Dict, reanalyze: bool, analyzer_version: str) -> Tuple[Dict, bool]:
+    """Validate one imported record; returns the entry and whether it still needs analysis"""
+    text = record.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("missing text")
+
+    raw_date = record.get("date")
+    if not isinstance(raw_date, str) or not raw_date.strip():
+        raise ValueError("missing date")
+    raw_date, raw_time = raw_date.strip(), record.get("time") or ""
+    try:
+        if len(raw_date) > 10:
+            # A full timestamp carries the time when there is no separate column for it
+            timestamp = datetime.fromisoformat(raw_date)
+            entry_date, raw_time = timestamp.date(), raw_time or timestamp.strftime("%H:%M")
+        else:
+            entry_date = date.fromisoformat(raw_date)
+    except ValueError:
+        raise ValueError(f"invalid date {raw_date!r}, expected YYYY-MM-DD") from None
+    try:
+        entry_time = datetime.strptime(raw_time.strip()[:5], "%H:%M").strftime("%H:%M") if raw_time else "00:00"
+    except (AttributeError, ValueError):
+        raise ValueError(f"invalid time {raw_time!r}, expected HH:MM") from None
+
+    entry = {"date": entry_date.isoformat(), "time": entry_time, "text": text}
+    sentiment, details = record.get("sentiment"), record.get("details")
+    # An analysis made by this very analyzer version would come out the same if recomputed
+    current = (record.get("analyzer_version") == analyzer_version
+               and record.get("text_hash") == text_fingerprint(text))
+    if (current or not reanalyze) and isinstance(sentiment, dict) and isinstance(details, dict):
+        # Exported by Mariposa with its analysis; keep it rather than recompute
+        try:
+            entry["sentiment"] = {
+                "score": float(sentiment["score"]),
+                "label": str(sentiment["label"]),
+                "emotions": [str(emotion) for emotion in sentiment["emotions"]],
+                "risk_level": str(sentiment["risk_level"])
+            }
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("incomplete sentiment analysis") from None
+        entry["details"] = details
+        entry["analyzer_version"] = record.get("analyzer_version")
+        return entry, False
+    return entry, True
+
+
+def import_journal(file: BinaryIO,
+                   file_format: str,
+                   store: JournalStore,
+                   analyzer: SentimentAnalyzer,
+                   user_id: str = DEFAULT_USER_ID,
+                   batch_size: int = DEFAULT_BATCH_SIZE,
+                   reanalyze: bool = False,
+                   progress: Optional[Callable[[ImportProgress], None]] = None) -> ImportReport:
+    """Stream a JSONL or CSV journal into the store, ``batch_size`` entries at a time
+
+    Each batch is analyzed together and written in one transaction, so memory
+    stays bounded by the batch, not the file. Records exported from Mariposa
+    (JSONL with ``sentiment`` and ``details``) keep their analysis; with
+    ``reanalyze`` only those made by the current analyzer version do.
+    Everything else, CSV included, is analyzed on import. Rows
+    that fail validation are skipped and reported; ``progress`` is called after
+    every batch.
+    """
+    if file_format not in JOURNAL_FORMATS:
+        raise JournalImportError(f"Unknown journal format: {file_format}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    # utf-8-sig drops the byte order mark spreadsheet programs put in front of CSV files
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    rows_read = imported = skipped = analysis_failures = 0
+    errors: List[str] = []
+    try:
+        rows = _read_jsonl(stream) if file_format == "jsonl" else _read_csv(stream)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            rows_read += len(batch)
+
+            entries, unanalyzed = [], []
+            for line_number, record, error in batch:
+                if error is None:
+                    try:
+                        entry, needs_analysis = _entry_from_record(record, reanalyze, analyzer.version)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    skipped += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Line {line_number}: {error}")
+                    continue
+                entries.append(entry)
+                if needs_analysis:
+                    unanalyzed.append(entry)
+
+            outcomes = analyzer.analyze_many((entry["text"] for entry in unanalyzed), max_workers=1)
+            for entry, outcome in zip(unanalyzed, outcomes):
+                if outcome.error is not None:
+                    analysis_failures += 1
+                entry.update(outcome.result or failed_analysis(outcome.error["message"]))
+
+            store.append_many(entries, user_id)
+            imported += len(entries)
+            if progress is not None:
+                progress(ImportProgress(rows_read, imported, skipped, file.tell()))
+    except UnicodeDecodeError as e:
+        raise JournalImportError(f"Journal file is not UTF-8 text (after {rows_read} rows): {e}") from e
+    finally:
+        # Leave the caller's file open
+        stream.detach()
+    return ImportReport(imported, skipped, analysis_failures, errors)
+
+
+def _jsonl_record(entry: Dict) -> Dict:
+    return {key: entry[key] for key in ("date", "time", "text", "sentiment", "details",
+                                        "text_hash", "analyzer_version")}
+
+
+def _csv_row(entry: Dict) -> Tuple:
+    sentiment = entry["sentiment"]
+    return (entry["date"], entry["time"], entry["text"], sentiment["score"], sentiment["label"],
+            CSV_EMOTION_SEPARATOR.join(sentiment["emotions"]), sentiment["risk_level"])
+
+
+def export_journal(store: JournalStore,
+                   stream: TextIO,
+                   file_format: str,
+                   user_id: str = DEFAULT_USER_ID) -> int:
+    """Write the journal to a text stream entry by entry, straight from the store; returns the count"""
+    count = 0
+    if file_format == "jsonl":
+        for entry in store.iter_entries(user_id):
+            stream.write(json.dumps(_jsonl_record(entry), ensure_ascii=False) + "\n")
+            count += 1
+    elif file_format == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(CSV_FIELDS)
+        for entry in store.iter_entries(user_id):
+            writer.writerow(_csv_row(entry))
+            count += 1
+    else:
+        raise ValueError(f"Unknown journal format: {file_format}")
+    return count
+
+
+def export_journal_file(store: JournalStore, file_format: str, user_id: str = DEFAULT_USER_ID) -> BinaryIO:
+    """The exported journal in a temporary file, rewound for reading; it is deleted once closed"""
+    file = tempfile.TemporaryFile()
+    stream = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    try:
+        export_journal(store, stream, file_format, user_id)
+        stream.flush()
+    except BaseException:
+        stream.close()
+        raise
+    stream.detach()
+    file.seek(0)
+    return file
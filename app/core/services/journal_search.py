@@ -0,0 +1,63 @@
+import re
+from typing import Iterable, List
+from app.core.utils.exceptions import JournalQueryError
+
+# A quoted phrase (the closing quote may be missing while the user is still typing) or a bare word
+QUERY_TOKEN_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+# Splits words the way the index's unicode61 tokenizer does
+TERM_PATTERN = re.compile(r"\w+")
+OPERATORS = ("AND", "OR", "NOT")
+
+
+def _quote(text: str) -> str:
+    """FTS5 string for the index terms in text, or "" if it has none"""
+    terms = TERM_PATTERN.findall(text)
+    return '"' + " ".join(terms) + '"' if terms else ""
+
+
+def build_match_expression(query: str) -> str:
+    """Translate a search box query into an FTS5 MATCH expression
+
+    Words must all appear (in any order), "quoted text" must appear as a
+    phrase, ``word*`` matches a prefix, ``-word`` excludes entries containing
+    it, and upper-case OR / AND / NOT combine terms (a leading NOT works like
+    ``-``). Every term is quoted, so punctuation in the query can never be
+    read as FTS5 syntax.
+    """
+    parts: List[str] = []
+    excluded: List[str] = []
+    negate_next = False
+    for phrase, word in QUERY_TOKEN_PATTERN.findall(query):
+        if word in OPERATORS:
+            # An operator needs a term on its left; a dangling one at the end is dropped below
+            if parts and parts[-1] not in OPERATORS:
+                parts.append(word)
+            elif word == "NOT":
+                # Without a term on its left, NOT excludes the next term, like -word
+                negate_next = True
+            continue
+        negate, negate_next = negate_next or word.startswith("-"), False
+        if word.startswith("-"):
+            word = word[1:]
+        term = _quote(phrase if not word else word)
+        if not term:
+            continue
+        if word.endswith("*"):
+            term += "*"
+        (excluded if negate else parts).append(term)
+
+    while parts and parts[-1] in OPERATORS:
+        parts.pop()
+    if not parts:
+        raise JournalQueryError("Enter at least one word to search for")
+
+    expression = " ".join(parts)
+    if excluded:
+        expression = f"({expression})" + "".join(f" NOT {term}" for term in excluded)
+    return expression
+
+
+def build_emotion_filter(emotions: Iterable[str]) -> str:
+    """FTS5 expression matching entries whose detected emotions include any of ``emotions``"""
+    terms = [term for term in (_quote(emotion) for emotion in emotions) if term]
+    return f"emotions : ({' OR '.join(terms)})" if terms else ""
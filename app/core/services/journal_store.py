@@ -0,0 +1,438 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Union
+from app.core.services.analysis_cache import text_fingerprint
+from app.core.services.journal_search import build_emotion_filter, build_match_expression
+from app.core.utils.exceptions import JournalQueryError
+
+JOURNAL_DB_PATH = Path(os.environ.get("MARIPOSA_JOURNAL_DB", "data/journal.db"))
+DEFAULT_USER_ID = "local"
+
+DayLike = Union[str, date]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    entry_date TEXT NOT NULL,
+    entry_time TEXT NOT NULL,
+    text TEXT NOT NULL,
+    sentiment_score REAL NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    emotions TEXT NOT NULL,
+    risk_level TEXT NOT NULL,
+    details TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    text_hash TEXT,
+    analyzer_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_journal_user_date
+    ON journal_entries (user_id, entry_date, entry_time, id);
+CREATE TABLE IF NOT EXISTS journal_daily_stats (
+    user_id TEXT NOT NULL,
+    entry_date TEXT NOT NULL,
+    entry_count INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    score_min REAL NOT NULL,
+    score_max REAL NOT NULL,
+    max_risk INTEGER NOT NULL,
+    PRIMARY KEY (user_id, entry_date)
+);
+CREATE TABLE IF NOT EXISTS journal_emotion_counts (
+    user_id TEXT NOT NULL,
+    emotion TEXT NOT NULL,
+    entry_count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, emotion)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS journal_search USING fts5(
+    text, emotions,
+    content='journal_entries', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS journal_search_insert AFTER INSERT ON journal_entries BEGIN
+    INSERT INTO journal_search (rowid, text, emotions) VALUES (new.id, new.text, new.emotions);
+END;
+CREATE TRIGGER IF NOT EXISTS journal_search_delete AFTER DELETE ON journal_entries BEGIN
+    INSERT INTO journal_search (journal_search, rowid, text, emotions)
+        VALUES ('delete', old.id, old.text, old.emotions);
+END;
+CREATE TRIGGER IF NOT EXISTS journal_search_update AFTER UPDATE OF text, emotions ON journal_entries BEGIN
+    INSERT INTO journal_search (journal_search, rowid, text, emotions)
+        VALUES ('delete', old.id, old.text, old.emotions);
+    INSERT INTO journal_search (rowid, text, emotions) VALUES (new.id, new.text, new.emotions);
+END;
+"""
+
+# Risk levels ranked for the per-day maximum; "unknown" (failed analysis) ranks below "none"
+RISK_RANKS = {'unknown': -1, 'none': 0, 'low': 1, 'medium': 2, 'high': 3}
+RISK_LEVELS_BY_RANK = {rank: level for level, rank in RISK_RANKS.items()}
+
+ENTRY_COLUMNS = ("id, entry_date, entry_time, text, sentiment_score, sentiment_label, "
+                 "emotions, risk_level, details, text_hash, analyzer_version")
+# The same columns for queries that join journal_entries (as e) with the search index
+QUALIFIED_ENTRY_COLUMNS = ", ".join(f"e.{column}" for column in ENTRY_COLUMNS.split(", "))
+
+# bm25 weights for the indexed text and emotions columns
+SEARCH_COLUMN_WEIGHTS = (1.0, 0.5)
+
+
+class JournalSearchResults(NamedTuple):
+    total: int
+    entries: List[Dict]
+
+
+def _day_key(day: DayLike) -> str:
+    """Dates are stored as ISO strings so they sort and compare lexically"""
+    return day.isoformat() if isinstance(day, date) else day
+
+
+def _row_to_entry(row: tuple) -> Dict:
+    (entry_id, entry_date, entry_time, text, score, label, emotions, risk_level, details,
+     text_hash, analyzer_version) = row
+    return {
+        "id": entry_id,
+        "date": entry_date,
+        "time": entry_time,
+        "text": text,
+        "sentiment": {
+            "score": score,
+            "label": label,
+            "emotions": json.loads(emotions),
+            "risk_level": risk_level
+        },
+        "details": json.loads(details),
+        "text_hash": text_hash,
+        "analyzer_version": analyzer_version
+    }
+
+
+class JournalStore:
+    """Durable journal entries in SQLite (WAL mode), indexed by user and date
+
+    Each thread gets its own connection, so Streamlit sessions can read while
+    another session writes.
+    """
+
+    def __init__(self, path: Union[str, Path] = JOURNAL_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        existing_tables = {row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )}
+        if "journal_entries" in existing_tables:
+            self._add_analysis_columns()
+        connection.executescript(SCHEMA)
+        if "journal_daily_stats" not in existing_tables:
+            # Journals created before the aggregate tables existed need a one-off backfill
+            self.rebuild_aggregates()
+        if "journal_search" not in existing_tables:
+            # Likewise for the search index; from here on the triggers keep it current
+            self.rebuild_search_index()
+
+    def _add_analysis_columns(self):
+        """Journals from before analyses were fingerprinted get the columns, and the text hashes"""
+        columns = {row[1] for row in self._connection().execute("PRAGMA table_info(journal_entries)")}
+        if "text_hash" in columns:
+            return
+        with self._transaction() as connection:
+            connection.execute("ALTER TABLE journal_entries ADD COLUMN text_hash TEXT")
+            # Left NULL: which analyzer version produced the stored analyses is unknown
+            connection.execute("ALTER TABLE journal_entries ADD COLUMN analyzer_version TEXT")
+            last_id = 0
+            while True:
+                # In id order, a batch at a time, so the update never races an open scan of the table
+                rows = connection.execute(
+                    "SELECT id, text FROM journal_entries WHERE id > ? ORDER BY id LIMIT 500", (last_id,)
+                ).fetchall()
+                if not rows:
+                    break
+                connection.executemany("UPDATE journal_entries SET text_hash = ? WHERE id = ?",
+                                       [(text_fingerprint(text), entry_id) for entry_id, text in rows])
+                last_id = rows[-1][0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps NORMAL durable across application crashes while avoiding an fsync per entry
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def append(self, entry: Dict, user_id: str = DEFAULT_USER_ID) -> int:
+        """Store one analyzed entry, fold it into the progress aggregates and return its id"""
+        with self._transaction() as connection:
+            entry_id = self._insert_entry(connection, entry, user_id)
+            self._update_aggregates(connection, entry, user_id)
+        return entry_id
+
+    def append_many(self, entries: Iterable[Dict], user_id: str = DEFAULT_USER_ID) -> List[int]:
+        """Store a batch of analyzed entries in one transaction (all or none) and return their ids"""
+        entry_ids = []
+        with self._transaction() as connection:
+            for entry in entries:
+                entry_ids.append(self._insert_entry(connection, entry, user_id))
+                self._update_aggregates(connection, entry, user_id)
+        return entry_ids
+
+    def _insert_entry(self, connection: sqlite3.Connection, entry: Dict, user_id: str) -> int:
+        sentiment = entry["sentiment"]
+        cursor = connection.execute(
+            "INSERT INTO journal_entries (user_id, entry_date, entry_time, text, sentiment_score, "
+            "sentiment_label, emotions, risk_level, details, created_at, text_hash, analyzer_version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                user_id,
+                _day_key(entry["date"]),
+                entry["time"],
+                entry["text"],
+                sentiment["score"],
+                sentiment["label"],
+                json.dumps(sentiment["emotions"]),
+                sentiment["risk_level"],
+                json.dumps(entry["details"]),
+                time.time(),
+                text_fingerprint(entry["text"]),
+                # The analysis is stored as computed; its version says whether it is still current
+                entry.get("analyzer_version")
+            )
+        )
+        return cursor.lastrowid
+
+    def _update_aggregates(self, connection: sqlite3.Connection, entry: Dict, user_id: str):
+        """O(1) update of the daily mood stats and emotion counts for one new entry"""
+        sentiment = entry["sentiment"]
+        score = sentiment["score"]
+        connection.execute(
+            "INSERT INTO journal_daily_stats (user_id, entry_date, entry_count, score_sum, "
+            "score_min, score_max, max_risk) VALUES (?, ?, 1, ?, ?, ?, ?) "
+            "ON CONFLICT (user_id, entry_date) DO UPDATE SET "
+            "entry_count = entry_count + 1, "
+            "score_sum = score_sum + excluded.score_sum, "
+            "score_min = MIN(score_min, excluded.score_min), "
+            "score_max = MAX(score_max, excluded.score_max), "
+            "max_risk = MAX(max_risk, excluded.max_risk)",
+            (user_id, _day_key(entry["date"]), score, score, score,
+             RISK_RANKS.get(sentiment["risk_level"], -1))
+        )
+        connection.executemany(
+            "INSERT INTO journal_emotion_counts (user_id, emotion, entry_count) VALUES (?, ?, 1) "
+            "ON CONFLICT (user_id, emotion) DO UPDATE SET entry_count = entry_count + 1",
+            [(user_id, emotion) for emotion in set(sentiment["emotions"])]
+        )
+
+    def rebuild_aggregates(self):
+        """Recompute every aggregate from the stored entries"""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM journal_daily_stats")
+            connection.execute("DELETE FROM journal_emotion_counts")
+            cursor = connection.execute(
+                f"SELECT user_id, {ENTRY_COLUMNS} FROM journal_entries"
+            )
+            for row in cursor.fetchall():
+                self._update_aggregates(connection, _row_to_entry(row[1:]), row[0])
+
+    def rebuild_search_index(self):
+        """Re-index every stored entry for full-text search"""
+        with self._transaction() as connection:
+            connection.execute("INSERT INTO journal_search (journal_search) VALUES ('rebuild')")
+
+    def search(self,
+               query: str = "",
+               user_id: str = DEFAULT_USER_ID,
+               emotions: Optional[Iterable[str]] = None,
+               risk_levels: Optional[Iterable[str]] = None,
+               start: Optional[DayLike] = None,
+               end: Optional[DayLike] = None,
+               limit: int = 20,
+               offset: int = 0) -> JournalSearchResults:
+        """One page of entries matching a search, with the total number of matches
+
+        ``query`` uses the syntax of build_match_expression and is matched
+        against entry text and detected emotions; matches are ranked by
+        relevance (bm25), and entries carry a ``snippet`` with the matched
+        terms in bold. Without a query, entries passing the filters are
+        returned newest first. ``emotions`` keeps entries with any of the given
+        emotions, ``risk_levels`` entries at any of the given levels.
+        """
+        conditions = ["e.user_id = ?", "e.entry_date BETWEEN ? AND ?"]
+        params: List = [user_id, _day_key(start) if start else "", _day_key(end) if end else "9999-12-31"]
+        risk_levels = list(risk_levels or ())
+        if risk_levels:
+            conditions.append(f"e.risk_level IN ({', '.join('?' * len(risk_levels))})")
+            params.extend(risk_levels)
+        where = " AND ".join(conditions)
+        newest_first = "e.entry_date DESC, e.entry_time DESC, e.id DESC"
+        connection = self._connection()
+
+        # Text and emotions are both matched through the index
+        match_terms = []
+        if query.strip():
+            match_terms.append(f"({build_match_expression(query)})")
+        emotion_filter = build_emotion_filter(emotions or ())
+        if emotion_filter:
+            match_terms.append(emotion_filter)
+
+        if not match_terms:
+            total = connection.execute(f"SELECT COUNT(*) FROM journal_entries e WHERE {where}", params).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT {QUALIFIED_ENTRY_COLUMNS} FROM journal_entries e WHERE {where} "
+                f"ORDER BY {newest_first} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+            return JournalSearchResults(total, [_row_to_entry(row) for row in rows])
+
+        expression = " AND ".join(match_terms)
+        weights = ", ".join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS)
+        # Relevance only means something when there is query text; filters alone list newest first
+        if query.strip():
+            score, order = f"bm25(journal_search, {weights})", f"matches.score, {newest_first}"
+        else:
+            score, order = "0", newest_first
+        try:
+            # Parsed on its own first, so only errors in the expression itself become query errors
+            connection.execute("SELECT rowid FROM journal_search WHERE journal_search MATCH ? LIMIT 1",
+                               [expression]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise JournalQueryError(f"Could not search for {query!r}: {e}") from e
+
+        # The index is always queried first and once; left to itself the planner may
+        # walk the date index instead and re-run the full-text match for every entry
+        total = connection.execute(
+            "SELECT COUNT(*) FROM journal_entries e WHERE e.id IN "
+            f"(SELECT rowid FROM journal_search WHERE journal_search MATCH ?) AND {where}",
+            [expression] + params
+        ).fetchone()[0]
+        rows = connection.execute(
+            "WITH matches AS MATERIALIZED ("
+            f"SELECT rowid AS id, {score} AS score "
+            "FROM journal_search WHERE journal_search MATCH ?) "
+            f"SELECT {QUALIFIED_ENTRY_COLUMNS} FROM matches JOIN journal_entries e ON e.id = matches.id "
+            f"WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            [expression] + params + [limit, offset]
+        ).fetchall()
+        # Snippets only for the page being returned, and only when there was text to highlight
+        snippets = dict(connection.execute(
+            "SELECT rowid, snippet(journal_search, 0, '**', '**', '…', 16) FROM journal_search "
+            f"WHERE journal_search MATCH ? AND rowid IN ({', '.join('?' * len(rows))})",
+            [expression] + [row[0] for row in rows]
+        ).fetchall()) if rows and query.strip() else {}
+
+        entries = []
+        for row in rows:
+            entry = _row_to_entry(row)
+            if entry["id"] in snippets:
+                entry["snippet"] = snippets[entry["id"]]
+            entries.append(entry)
+        return JournalSearchResults(total, entries)
+
+    def daily_mood(self,
+                   user_id: str = DEFAULT_USER_ID,
+                   start: Optional[DayLike] = None,
+                   end: Optional[DayLike] = None) -> List[Dict]:
+        """Per-day entry count, mean/min/max mood score and highest risk level, in date order"""
+        rows = self._connection().execute(
+            "SELECT entry_date, entry_count, score_sum, score_min, score_max, max_risk "
+            "FROM journal_daily_stats WHERE user_id = ? AND entry_date BETWEEN ? AND ? "
+            "ORDER BY entry_date",
+            (user_id, _day_key(start) if start else "", _day_key(end) if end else "9999-12-31")
+        ).fetchall()
+        return [
+            {
+                "date": entry_date,
+                "count": count,
+                "mean": score_sum / count,
+                "min": score_min,
+                "max": score_max,
+                "risk_level": RISK_LEVELS_BY_RANK[max_risk]
+            }
+            for entry_date, count, score_sum, score_min, score_max, max_risk in rows
+        ]
+
+    def emotion_counts(self, user_id: str = DEFAULT_USER_ID) -> Dict[str, int]:
+        """How many entries mentioned each emotion, most frequent first"""
+        rows = self._connection().execute(
+            "SELECT emotion, entry_count FROM journal_emotion_counts WHERE user_id = ? "
+            "ORDER BY entry_count DESC, emotion",
+            (user_id,)
+        ).fetchall()
+        return dict(rows)
+
+    def get_by_date(self, day: DayLike, user_id: str = DEFAULT_USER_ID) -> List[Dict]:
+        """Entries written on one day, in time order"""
+        return self.get_range(day, day, user_id)
+
+    def get_range(self,
+                  start: DayLike,
+                  end: DayLike,
+                  user_id: str = DEFAULT_USER_ID,
+                  limit: Optional[int] = None,
+                  offset: int = 0,
+                  newest_first: bool = False) -> List[Dict]:
+        """Entries between two days inclusive"""
+        order = "DESC" if newest_first else "ASC"
+        rows = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM journal_entries "
+            "WHERE user_id = ? AND entry_date BETWEEN ? AND ? "
+            f"ORDER BY entry_date {order}, entry_time {order}, id {order} "
+            "LIMIT ? OFFSET ?",
+            (user_id, _day_key(start), _day_key(end), -1 if limit is None else limit, offset)
+        ).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def page(self, limit: int, offset: int = 0, user_id: str = DEFAULT_USER_ID) -> List[Dict]:
+        """One page of the journal, newest entries first"""
+        rows = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM journal_entries WHERE user_id = ? "
+            "ORDER BY entry_date DESC, entry_time DESC, id DESC LIMIT ? OFFSET ?",
+            (user_id, limit, offset)
+        ).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def count(self, user_id: str = DEFAULT_USER_ID) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM journal_entries WHERE user_id = ?", (user_id,)
+        ).fetchone()[0]
+
+    def dates_with_entries(self, start: DayLike, end: DayLike,
+                           user_id: str = DEFAULT_USER_ID) -> Set[str]:
+        """ISO dates between start and end (inclusive) that have at least one entry"""
+        rows = self._connection().execute(
+            "SELECT DISTINCT entry_date FROM journal_entries "
+            "WHERE user_id = ? AND entry_date BETWEEN ? AND ?",
+            (user_id, _day_key(start), _day_key(end))
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def iter_entries(self, user_id: str = DEFAULT_USER_ID, batch_size: int = 500) -> Iterator[Dict]:
+        """Stream every entry in date order without loading the whole journal"""
+        cursor = self._connection().execute(
+            f"SELECT {ENTRY_COLUMNS} FROM journal_entries WHERE user_id = ? "
+            "ORDER BY entry_date, entry_time, id",
+            (user_id,)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_entry(row)
@@ -0,0 +1,137 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Tuple
+
+EMOTION_KEYWORDS = {
+    'joy': ['happy', 'excited', 'delighted', 'joyful', 'pleased', 'grateful'],
+    'sadness': ['sad', 'depressed', 'unhappy', 'miserable', 'down', 'blue'],
+    'anger': ['angry', 'frustrated', 'irritated', 'annoyed', 'furious'],
+    'anxiety': ['anxious', 'worried', 'nervous', 'stressed', 'tense'],
+    'fear': ['scared', 'afraid', 'terrified', 'fearful', 'panicked'],
+    'hope': ['hopeful', 'optimistic', 'looking forward', 'confident'],
+    'calm': ['peaceful', 'relaxed', 'serene', 'tranquil', 'calm']
+}
+
+# Ordered from most to least severe; the first level with a match wins
+RISK_KEYWORDS = {
+    'high': ['suicide', 'kill myself', 'end my life', 'want to die', 'better off dead'],
+    'medium': ['hopeless', 'worthless', 'can\'t go on', 'give up', 'no point'],
+    'low': ['exhausted', 'overwhelmed', 'struggling', 'difficult', 'hard time']
+}
+
+CRISIS_KEYWORDS = [
+    "suicide", "kill myself", "die", "end my life", "self harm",
+    "hurt myself", "don't want to live", "want to die"
+]
+
+# Words are letters/digits with inner apostrophes, so "can't" stays one token
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase the text and split it into word tokens"""
+    return TOKEN_PATTERN.findall(text.lower().replace("’", "'"))
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over word tokens
+
+    Keywords are matched as whole words or whole phrases ("die" does not hit
+    "diet"), and a text is scanned once regardless of how many keywords are loaded.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[FrozenSet[Hashable]] = []
+        outputs: List[set] = [set()]
+
+        for keyword, label in keywords:
+            node = 0
+            for token in tokenize(keyword):
+                next_node = self._goto[node].get(token)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][token] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                node = next_node
+            if node:
+                outputs[node].add(label)
+
+        # Breadth-first pass to set failure links and inherit suffix matches
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for token, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0) if node else 0
+                outputs[child] |= outputs[self._fail[child]]
+                queue.append(child)
+
+        self._outputs = [frozenset(labels) for labels in outputs]
+
+    def find(self, text: str) -> set:
+        """Return the labels of every keyword that occurs in the text"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class KeywordScan(NamedTuple):
+    emotions: List[str]
+    risk_level: str
+    crisis: bool
+
+
+class KeywordScanner:
+    """Emotion, risk and crisis keyword tables compiled into one automaton
+
+    Emotions are reported in table order and the first risk level with a
+    match wins, so the tables' order matters as well as their contents.
+    """
+
+    def __init__(self,
+                 emotion_keywords: Dict[str, List[str]] = EMOTION_KEYWORDS,
+                 risk_keywords: Dict[str, List[str]] = RISK_KEYWORDS,
+                 crisis_keywords: Iterable[str] = CRISIS_KEYWORDS):
+        self.emotions = list(emotion_keywords)
+        self.risk_levels = list(risk_keywords)
+        keywords = []
+        for emotion, words in emotion_keywords.items():
+            keywords.extend((word, ('emotion', emotion)) for word in words)
+        for level, words in risk_keywords.items():
+            keywords.extend((word, ('risk', level)) for word in words)
+        keywords.extend((word, ('crisis', True)) for word in crisis_keywords)
+        self.matcher = KeywordMatcher(keywords)
+
+    def scan(self, text: str) -> KeywordScan:
+        """Detect emotions, risk level and crisis language in a single pass over the text"""
+        found = self.matcher.find(text)
+        emotions = [emotion for emotion in self.emotions if ('emotion', emotion) in found]
+        risk_level = next((level for level in self.risk_levels if ('risk', level) in found), 'none')
+        return KeywordScan(
+            emotions=emotions or ['neutral'],
+            risk_level=risk_level,
+            crisis=('crisis', True) in found
+        )
+
+
+@lru_cache(maxsize=None)
+def get_keyword_scanner() -> KeywordScanner:
+    """The scanner for the default tables, compiled once per process"""
+    return KeywordScanner()
+
+
+def scan_keywords(text: str) -> KeywordScan:
+    """Scan a text against the default keyword tables"""
+    return get_keyword_scanner().scan(text)
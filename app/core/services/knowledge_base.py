@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from app.core.services.research_database import ARTICLES_PATH, load_article_catalog
+from app.core.services.technique_database import TECHNIQUES_PATH, load_technique_catalog
+
+logger = logging.getLogger(__name__)
+
+DSM5_PATH = Path("data/dsm5/disorders.json")
+DISORDERS_PATH = Path("data/mock/disorders.json")
+
+# Every data file whose contents can change a generated plan
+KNOWLEDGE_BASE_FILES = (DSM5_PATH, DISORDERS_PATH, TECHNIQUES_PATH, ARTICLES_PATH)
+
+
+def knowledge_base_version(paths: Iterable[Path] = KNOWLEDGE_BASE_FILES) -> str:
+    """Short fingerprint of the knowledge-base files, based on their size and mtime
+
+    Cheap enough to call per request (one stat per file); any edit to a data
+    file yields a new version, which downstream caches use in their keys.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = Path(path).stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        except FileNotFoundError:
+            digest.update(f"{path}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+
+def clear_catalog_caches():
+    """Forget the parsed technique and article catalogs so the next load re-reads the files"""
+    load_technique_catalog.cache_clear()
+    load_article_catalog.cache_clear()
+
+
+class KnowledgeBaseWatcher:
+    """Polls the knowledge-base files on a background thread and reports new versions
+
+    ``on_change(version)`` runs on the watcher thread, so rebuilding indexes
+    never blocks a request. A change is only acted on once the files have
+    looked the same for two polls in a row, so a half-written file is not
+    loaded. If ``on_change`` raises (say, the new JSON is invalid), the
+    current data stays in service and that version is not retried until the
+    files change again.
+    """
+
+    def __init__(self,
+                 on_change: Callable[[str], None],
+                 paths: Iterable[Path] = KNOWLEDGE_BASE_FILES,
+                 interval: float = 2.0,
+                 version: Optional[str] = None):
+        self.on_change = on_change
+        self.paths = tuple(paths)
+        self.interval = interval
+        self.version = version or knowledge_base_version(self.paths)
+        self._pending: Optional[str] = None
+        self._failed: Optional[str] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, on_change: Callable[[str], None],
+                 paths: Iterable[Path] = KNOWLEDGE_BASE_FILES,
+                 version: Optional[str] = None) -> "KnowledgeBaseWatcher":
+        """Poll interval from MARIPOSA_KB_WATCH_INTERVAL in seconds; 0 turns watching off"""
+        interval = float(os.environ.get("MARIPOSA_KB_WATCH_INTERVAL", 2.0))
+        return cls(on_change, paths=paths, interval=interval, version=version)
+
+    def start(self) -> "KnowledgeBaseWatcher":
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mariposa-kb-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def check(self) -> bool:
+        """Poll once; return True if a new version was loaded"""
+        version = knowledge_base_version(self.paths)
+        if version == self.version:
+            self._pending = None
+            return False
+        if version != self._pending:
+            # Seen for the first time; wait one poll for writes to settle
+            self._pending = version
+            return False
+        if version == self._failed:
+            return False
+
+        try:
+            self.on_change(version)
+        except Exception:
+            logger.exception("Reloading knowledge base version %s failed; keeping %s", version, self.version)
+            self._failed = version
+            return False
+
+        logger.info("Knowledge base reloaded: %s -> %s", self.version, version)
+        self.version = version
+        self._pending = None
+        self._failed = None
+        return True
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
@@ -0,0 +1,166 @@
+import copy
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from app.core.utils.metrics import metrics
+
+# Same word characters the symptom matcher cares about; case, spacing and punctuation are dropped
+NORMALIZE_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def normalize_symptoms(symptoms: str) -> str:
+    return " ".join(NORMALIZE_PATTERN.findall(symptoms.lower()))
+
+
+def plan_cache_key(symptoms: str, severity: str, kb_version: str) -> str:
+    """Content address for a plan: normalized symptoms, severity and knowledge-base version"""
+    payload = f"{kb_version}\n{severity}\n{normalize_symptoms(symptoms)}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PlanCache:
+    """Thread-safe LRU cache of generated therapy plans with a TTL
+
+    Entries are keyed by ``plan_cache_key``. When a new knowledge-base
+    version arrives, every cached plan is dropped, since they were all built
+    from the old data. The version only moves forward: requests still running
+    on a superseded version compute their plan without reading or storing
+    cached ones. Plans are deep-copied in and out, so sessions and requests
+    never share (or mutate) one cached instance.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.kb_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0
+        self._retired: Set[str] = set()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PlanCache":
+        """Size and TTL from MARIPOSA_PLAN_CACHE_SIZE / MARIPOSA_PLAN_CACHE_TTL"""
+        return cls(
+            max_entries=int(os.environ.get("MARIPOSA_PLAN_CACHE_SIZE", 512)),
+            ttl_seconds=float(os.environ.get("MARIPOSA_PLAN_CACHE_TTL", 3600))
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, value = item
+                if self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    metrics.inc("mariposa_plan_cache_requests_total", result="hit")
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            metrics.inc("mariposa_plan_cache_requests_total", result="miss")
+            return None
+
+    def put(self, key: str, value: Any, kb_version: Optional[str] = None):
+        """Store a plan; one built from another knowledge-base version than the current one is dropped"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            if kb_version is not None and kb_version != self.kb_version:
+                return
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kb_version: Optional[str] = None):
+        """Drop every cached plan, optionally recording the knowledge-base version now in use"""
+        with self._lock:
+            self._invalidate(kb_version)
+
+    def _invalidate(self, kb_version: Optional[str]):
+        self._entries.clear()
+        self._retired.discard(kb_version)
+        self.kb_version = kb_version
+        self.invalidations += 1
+
+    def advance(self, kb_version: str):
+        """Make ``kb_version`` the current version, e.g. once a generator is built over newly loaded data
+
+        Unlike a first lookup under an unseen version, this also brings back a
+        superseded version, such as one whose edit was reverted.
+        """
+        with self._lock:
+            if self.kb_version is None:
+                self.kb_version = kb_version
+            elif kb_version != self.kb_version:
+                self._advance(kb_version)
+
+    def _advance(self, kb_version: str):
+        self._retired.add(self.kb_version)
+        self._invalidate(kb_version)
+
+    def _use_version(self, kb_version: str) -> bool:
+        """Whether plans for ``kb_version`` may come from and go into the cache"""
+        # Checked and switched under the lock, so a concurrent request still on
+        # the old version cannot repopulate the cache after it was cleared
+        with self._lock:
+            if self.kb_version is None:
+                self.kb_version = kb_version
+            elif kb_version in self._retired:
+                self.stale += 1
+                return False
+            elif kb_version != self.kb_version:
+                self._advance(kb_version)
+            return True
+
+    def get_or_compute(self, symptoms: str, severity: str, kb_version: str,
+                       compute: Callable[[], Any]) -> Any:
+        """Return the cached plan for this input, computing and storing it on a miss
+
+        Exceptions from ``compute`` propagate and nothing is cached. A
+        superseded ``kb_version`` always computes, and leaves the cache alone.
+        """
+        if not self._use_version(kb_version):
+            metrics.inc("mariposa_plan_cache_requests_total", result="stale")
+            return compute()
+        key = plan_cache_key(symptoms, severity, kb_version)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, kb_version)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale": self.stale,
+                "kb_version": self.kb_version
+            }
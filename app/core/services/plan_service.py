@@ -1,23 +1,71 @@
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 import streamlit as st
 from app.core.models.schemas import PatientInput, TherapyPlan
 from app.core.services.research_service import ResearchService
 from app.core.utils.exceptions import NoMatchingConditionsError
-from app.core.services.calendar_planner import TherapyCalendarPlanner
+from app.core.services.calendar_planner import TherapyCalendarPlanner, parse_duration_weeks
+from app.core.services.knowledge_base import knowledge_base_version
+from app.core.services.plan_cache import PlanCache
+from app.core.utils.metrics import metrics
 
 class TherapyPlanGenerator:
-    def __init__(self):
-        self.research_service = ResearchService()
+    def __init__(self,
+                 plan_cache: Optional[PlanCache] = None,
+                 research_service: Optional[ResearchService] = None,
+                 calendar_planner: Optional[TherapyCalendarPlanner] = None,
+                 kb_version: Optional[str] = None):
+        self.research_service = research_service or ResearchService()
+        self.calendar_planner = calendar_planner or TherapyCalendarPlanner()
         self.disorders = self._load_disorders()
+        self.plan_cache = plan_cache
+        # Version of the data this generator was built from; plans are cached under it
+        self.kb_version = kb_version
+        if plan_cache is not None and kb_version is not None:
+            # Requests still on an older generator stop using the cache from here on
+            plan_cache.advance(kb_version)
 
     def _load_disorders(self) -> Dict:
         with open('data/mock/disorders.json', 'r') as f:
             return json.load(f)
 
     def generate_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
+        try:
+            with metrics.span("mariposa_plan_generation_seconds"):
+                return self._generate_therapy_plan(patient_input)
+        except Exception as e:
+            metrics.inc("mariposa_plan_errors_total", error=type(e).__name__)
+            raise
+
+    def _generate_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
+        if self.plan_cache is None:
+            therapy_plan = self._build_therapy_plan(patient_input)
+        else:
+            therapy_plan = self.plan_cache.get_or_compute(
+                patient_input.symptoms,
+                patient_input.severity.value,
+                self.kb_version or knowledge_base_version(),
+                lambda: self._build_therapy_plan(patient_input)
+            )
+
+        # Schedules start today, so they are built fresh even for a cached plan
+        with metrics.span("mariposa_plan_stage_seconds", stage="calendar_generation"):
+            schedule = self.calendar_planner.plan_schedule(
+                therapy_type=therapy_plan.therapy_type,
+                session_frequency=therapy_plan.session_frequency,
+                techniques=therapy_plan.techniques,
+                severity=patient_input.severity,
+                weeks=parse_duration_weeks(therapy_plan.duration)
+            )
+        
+        st.session_state.therapy_schedule = schedule
+
+        return therapy_plan
+
+    def _build_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
         # Analyze symptoms to identify possible conditions
-        condition_matches = self.research_service.analyze_symptoms(patient_input.symptoms)
+        with metrics.span("mariposa_plan_stage_seconds", stage="symptom_matching"):
+            condition_matches = self.research_service.analyze_symptoms(patient_input.symptoms)
         
         # Get the most likely condition
         if not condition_matches:
@@ -57,11 +105,14 @@ class TherapyPlanGenerator:
         primary_condition = identified_conditions[0]
         
         # Get DSM-5 info for primary condition
-        dsm5_info = self.research_service.get_dsm5_criteria(primary_condition)
+        with metrics.span("mariposa_plan_stage_seconds", stage="dsm5_lookup"):
+            dsm5_info = self.research_service.get_dsm5_criteria(primary_condition)
         
-        # Get research articles for the condition
-        articles = self.research_service.get_scholarly_articles(primary_condition)
-        treatment_analysis = self.research_service.analyze_treatment_effectiveness(articles)
+        # Get research articles for the condition; their treatment mentions are indexed at load time
+        with metrics.span("mariposa_plan_stage_seconds", stage="article_retrieval"):
+            articles = self.research_service.get_indexed_articles(primary_condition)
+        with metrics.span("mariposa_plan_stage_seconds", stage="treatment_analysis"):
+            treatment_analysis = self.research_service.analyze_indexed_treatments(articles)
 
         # Determine therapy type based on research
         therapy_types = list(treatment_analysis.keys())
@@ -93,17 +144,6 @@ class TherapyPlanGenerator:
         # Determine duration
         duration = dsm5_info.get("recommended_duration", "12-16 weeks")
 
-        # Create schedule with severity-based adjustments
-        calendar_planner = TherapyCalendarPlanner()
-        schedule = calendar_planner.generate_weekly_schedule(
-            therapy_type=therapy_type,
-            session_frequency=session_frequency,
-            techniques=techniques,
-            severity=patient_input.severity
-        )
-        
-        st.session_state.therapy_schedule = schedule
-
         return TherapyPlan(
             identified_conditions=identified_conditions,
             confidence_scores=confidence_scores,
@@ -0,0 +1,24 @@
+from typing import Dict
+from app.core.services.journal_store import DEFAULT_USER_ID, JournalStore
+
+# Position of each risk level on the 0-1 axis of the risk trend chart
+RISK_CHART_VALUES = {'none': 0, 'low': 0.33, 'medium': 0.66, 'high': 1}
+
+
+def build_progress_series(store: JournalStore, user_id: str = DEFAULT_USER_ID) -> Dict:
+    """Chart-ready series read from the journal's running aggregates
+
+    Cost depends on the number of journaled days and emotions, never on how
+    many entries were written.
+    """
+    daily = store.daily_mood(user_id)
+    known_risk = [day for day in daily if day["risk_level"] in RISK_CHART_VALUES]
+    return {
+        "dates": [day["date"] for day in daily],
+        "mean_score": [day["mean"] for day in daily],
+        "min_score": [day["min"] for day in daily],
+        "max_score": [day["max"] for day in daily],
+        "risk_dates": [day["date"] for day in known_risk],
+        "risk": [RISK_CHART_VALUES[day["risk_level"]] for day in known_risk],
+        "emotion_counts": store.emotion_counts(user_id)
+    }
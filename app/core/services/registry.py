@@ -0,0 +1,113 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# A factory receives a resolver for the services it depends on
+Factory = Callable[[Callable[[str], Any]], Any]
+
+
+class ServiceRegistry:
+    """Builds read-only services once per process and hands every caller the same instances
+
+    Services are built on first ``get``. ``reload`` rebuilds every service
+    that was in use (except those registered with ``keep_on_reload``) into a
+    fresh set, then swaps it in. Callers that already hold an instance finish
+    with it undisturbed.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Factory] = {}
+        self._kept_on_reload = set()
+        self._reload_hooks = []
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.generation = 0
+
+    def register(self, name: str, factory: Factory, keep_on_reload: bool = False):
+        with self._lock:
+            self._factories[name] = factory
+            if keep_on_reload:
+                self._kept_on_reload.add(name)
+
+    def on_reload(self, hook: Callable[[], None]):
+        """Run ``hook`` before services are rebuilt, e.g. to clear a loader's cache"""
+        self._reload_hooks.append(hook)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            return self._build(name, self._instances)
+
+    def _build(self, name: str, instances: Dict[str, Any]) -> Any:
+        if name not in instances:
+            if name not in self._factories:
+                raise KeyError(f"No service registered as {name!r}")
+            instances[name] = self._factories[name](lambda dependency: self._build(dependency, instances))
+        return instances[name]
+
+    def reload(self) -> int:
+        """Rebuild the services in use into a fresh set, swap it in and return the new generation"""
+        with self._lock:
+            for hook in self._reload_hooks:
+                hook()
+            instances = {name: instance for name, instance in self._instances.items()
+                         if name in self._kept_on_reload}
+            # Registration order, so services registered first (like a version stamp) are built first
+            for name in self._factories:
+                if name in self._instances:
+                    self._build(name, instances)
+            self._instances = instances
+            self.generation += 1
+            return self.generation
+
+    def loaded(self) -> Dict[str, str]:
+        """Names of the services built so far, with their types"""
+        return {name: type(instance).__name__ for name, instance in self._instances.items()}
+
+
+def _build_default_registry() -> ServiceRegistry:
+    # Imported here so that importing the registry does not pull in every service module
+    from app.core.services.calendar_planner import TherapyCalendarPlanner
+    from app.core.services.journal_store import JournalStore
+    from app.core.services.plan_cache import PlanCache
+    from app.core.services.plan_service import TherapyPlanGenerator
+    from app.core.services.knowledge_base import clear_catalog_caches, knowledge_base_version
+    from app.core.services.research_service import ResearchService
+    from app.core.services.sentiment_analyzer import warm_up_sentiment_analyzer
+    from app.core.services.technique_database import TechniqueDatabase
+
+    registry = ServiceRegistry()
+    registry.on_reload(clear_catalog_caches)
+
+    # Stamped before any data file is read: if a file changes mid-build, the next reload catches it
+    registry.register("kb_version", lambda resolve: knowledge_base_version())
+    registry.register("technique_db", lambda resolve: TechniqueDatabase())
+    registry.register("research_service", lambda resolve: ResearchService())
+    registry.register("calendar_planner",
+                      lambda resolve: TherapyCalendarPlanner(technique_db=resolve("technique_db")))
+    # Cached plans are keyed by knowledge-base version, so the cache itself survives reloads
+    registry.register("plan_cache", lambda resolve: PlanCache.from_env(), keep_on_reload=True)
+    registry.register("plan_generator", lambda resolve: TherapyPlanGenerator(
+        kb_version=resolve("kb_version"),
+        plan_cache=resolve("plan_cache"),
+        research_service=resolve("research_service"),
+        calendar_planner=resolve("calendar_planner")
+    ))
+    registry.register("sentiment_analyzer", lambda resolve: warm_up_sentiment_analyzer(), keep_on_reload=True)
+    registry.register("journal_store", lambda resolve: JournalStore(), keep_on_reload=True)
+    return registry
+
+
+_default_registry: Optional[ServiceRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_registry() -> ServiceRegistry:
+    """The process-wide registry with Mariposa's services registered"""
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = _build_default_registry()
+    return _default_registry
@@ -1,66 +1,131 @@
-from typing import List, Dict
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from app.core.utils.exceptions import ArticleCatalogError
+
+ARTICLES_PATH = Path("data/research/articles.json")
+REQUIRED_FIELDS = ("title", "author", "year", "abstract", "url")
+
+# Therapy terms looked for in abstracts, in the order they rank within one article
+TREATMENT_TERMS = ("cbt", "medication", "mindfulness", "psychotherapy")
+
+
+def find_treatment_mentions(abstract: str) -> Tuple[str, ...]:
+    """Treatment terms mentioned in an abstract, in TREATMENT_TERMS order"""
+    abstract = abstract.lower()
+    return tuple(term for term in TREATMENT_TERMS if term in abstract)
+
+
+def tally_treatments(articles: Iterable[Tuple[Mapping[str, Any], Tuple[str, ...]]]) -> Dict:
+    """Build the treatment table from (article, mentions) pairs, terms in first-mention order"""
+    treatments = {}
+    for article, mentions in articles:
+        for therapy in mentions:
+            if therapy not in treatments:
+                treatments[therapy] = {
+                    'mention_count': 0,
+                    'articles': []
+                }
+            treatments[therapy]['mention_count'] += 1
+            treatments[therapy]['articles'].append(article['title'])
+    return treatments
+
+
+class IndexedArticles(NamedTuple):
+    """A condition's catalog articles, read-only, with the treatment mentions found in each"""
+    condition: str
+    articles: Tuple[Mapping[str, Any], ...]
+    mentions: Tuple[Tuple[str, ...], ...]
+    # Every article the condition has, so its prebuilt treatment table applies
+    complete: bool
+
+
+class ArticleCatalog:
+    """Research articles indexed by condition, with treatment mentions found at load time
+
+    ``treatments_by_condition`` is the treatment-to-articles index: for each
+    condition it maps a term to a (mention count, article titles) pair, in the
+    order ResearchService.analyze_treatment_effectiveness would report them.
+    """
+    __slots__ = ("articles_by_condition", "mentions_by_condition", "treatments_by_condition")
+
+    def __init__(self, articles_by_condition: Dict[str, List[Dict]]):
+        self.articles_by_condition: Mapping[str, Tuple[Mapping[str, Any], ...]] = MappingProxyType({
+            condition: tuple(MappingProxyType(dict(article)) for article in articles)
+            for condition, articles in articles_by_condition.items()
+        })
+        # Per article, parallel to articles_by_condition
+        self.mentions_by_condition: Mapping[str, Tuple[Tuple[str, ...], ...]] = MappingProxyType({
+            condition: tuple(find_treatment_mentions(article['abstract']) for article in articles)
+            for condition, articles in self.articles_by_condition.items()
+        })
+        treatments_by_condition = {}
+        for condition, articles in self.articles_by_condition.items():
+            table = tally_treatments(zip(articles, self.mentions_by_condition[condition]))
+            treatments_by_condition[condition] = MappingProxyType({
+                therapy: (entry['mention_count'], tuple(entry['articles']))
+                for therapy, entry in table.items()
+            })
+        self.treatments_by_condition: Mapping[str, Mapping[str, Tuple[int, Tuple[str, ...]]]] = \
+            MappingProxyType(treatments_by_condition)
+
+
+def parse_article_catalog(raw: Dict, source: str = "<memory>") -> ArticleCatalog:
+    """Validate raw article records keyed by condition and build the indexed catalog"""
+    if not isinstance(raw, dict):
+        raise ArticleCatalogError(f"{source} must map conditions to lists of articles")
+
+    for condition, articles in raw.items():
+        if not isinstance(articles, list):
+            raise ArticleCatalogError(f"Articles for {condition} in {source} must be a list")
+        for position, article in enumerate(articles):
+            missing = [field for field in REQUIRED_FIELDS if field not in article]
+            if missing:
+                raise ArticleCatalogError(
+                    f"Article #{position} for {condition} in {source} is missing {', '.join(missing)}"
+                )
+
+    return ArticleCatalog(raw)
+
+
+@lru_cache(maxsize=None)
+def load_article_catalog(path: Path = ARTICLES_PATH) -> ArticleCatalog:
+    """Parse, validate and index the article corpus once per process"""
+    try:
+        with open(path, 'r') as f:
+            raw = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ArticleCatalogError(f"Unable to load article catalog {path}: {e}") from e
+    return parse_article_catalog(raw, str(path))
+
 
 class ResearchDatabase:
+    def __init__(self, catalog: Optional[ArticleCatalog] = None):
+        self.catalog = catalog or load_article_catalog()
+
     def get_articles(self, condition: str) -> List[Dict]:
-        research_articles = {
-            "anxiety": [
-                {
-                    'title': 'Cognitive Behavioral Therapy for Anxiety: Evidence and Implementation',
-                    'author': 'Carpenter, J. K., et al.',
-                    'year': '2023',
-                    'abstract': 'Meta-analysis of 41 studies showing CBT effectiveness in treating anxiety disorders, with a 68% response rate compared to 36% in control groups.',
-                    'url': 'https://doi.org/10.1016/j.psychres.2023.01.001'
-                },
-                {
-                    'title': 'Digital Interventions for Anxiety Disorders',
-                    'author': 'Andrews, G., et al.',
-                    'year': '2023',
-                    'abstract': 'Review of digital mental health interventions showing comparable efficacy to face-to-face therapy for anxiety disorders.',
-                    'url': 'https://doi.org/10.1016/j.wpsyc.2023.02.002'
-                }
-            ],
-            "depression": [
-                {
-                    'title': 'Combined Treatment Approaches for Major Depression',
-                    'author': 'Williams, L. M., et al.',
-                    'year': '2023',
-                    'abstract': 'Study of 1,200 patients showing 72% improvement rate with combined medication and psychotherapy compared to 45% with single-modality treatment.',
-                    'url': 'https://doi.org/10.1001/jamapsychiatry.2023.0001'
-                },
-                {
-                    'title': 'Exercise as an Intervention for Depression',
-                    'author': 'Thompson, R. W., et al.',
-                    'year': '2023',
-                    'abstract': 'Systematic review demonstrating moderate to large effect sizes for exercise interventions in treating mild to moderate depression.',
-                    'url': 'https://doi.org/10.1016/j.mhpa.2023.03.003'
-                }
-            ],
-            "social_anxiety": [
-                {
-                    'title': 'Virtual Reality Exposure Therapy for Social Anxiety',
-                    'author': 'Kim, H. E., et al.',
-                    'year': '2023',
-                    'abstract': 'Randomized controlled trial showing VR exposure therapy effectiveness comparable to in-vivo exposure with better treatment adherence.',
-                    'url': 'https://doi.org/10.1016/j.brat.2023.04.004'
-                }
-            ],
-            "panic": [
-                {
-                    'title': 'Long-term Outcomes of Panic Disorder Treatment',
-                    'author': 'Martinez, J. P., et al.',
-                    'year': '2023',
-                    'abstract': 'Ten-year follow-up study showing sustained improvement in 65% of patients receiving combined CBT and medication management.',
-                    'url': 'https://doi.org/10.1016/j.janxdis.2023.05.005'
-                }
-            ],
-            "crisis": [
-                {
-                    'title': 'Crisis Intervention Strategies: A Meta-Analysis',
-                    'author': 'Chen, Y. C., et al.',
-                    'year': '2023',
-                    'abstract': 'Analysis of crisis intervention approaches showing immediate professional intervention combined with ongoing support yields best outcomes.',
-                    'url': 'https://doi.org/10.1016/j.cpr.2023.06.006'
-                }
-            ]
+        """Return copies of the articles for a condition, so callers may modify them"""
+        return [dict(article) for article in self.catalog.articles_by_condition.get(condition, ())]
+
+    def get_indexed_articles(self, condition: str, limit: Optional[int] = None) -> IndexedArticles:
+        """A condition's first ``limit`` articles and their mentions, straight from the catalog without copies"""
+        articles = self.catalog.articles_by_condition.get(condition, ())
+        mentions = self.catalog.mentions_by_condition.get(condition, ())
+        if limit is not None and limit < len(articles):
+            return IndexedArticles(condition, articles[:limit], mentions[:limit], False)
+        return IndexedArticles(condition, articles, mentions, True)
+
+    def tally_indexed_treatments(self, indexed: IndexedArticles) -> Dict:
+        """Treatment table for indexed articles, without rescanning abstracts"""
+        if not indexed.complete:
+            return tally_treatments(zip(indexed.articles, indexed.mentions))
+        return {
+            therapy: {'mention_count': count, 'articles': list(titles)}
+            for therapy, (count, titles) in self.catalog.treatments_by_condition.get(indexed.condition, {}).items()
         }
-        return research_articles.get(condition, []) 
\ No newline at end of file
+
+    def get_treatment_mentions(self, condition: str, limit: Optional[int] = None) -> Dict:
+        """Treatment table for a condition's first ``limit`` articles, without rescanning abstracts"""
+        return self.tally_indexed_treatments(self.get_indexed_articles(condition, limit))
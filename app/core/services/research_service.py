@@ -1,19 +1,23 @@
 import json
 import os
-from typing import List, Dict, Tuple
-import pandas as pd
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from app.core.services.research_database import ResearchDatabase
+from app.core.services.condition_retriever import ConditionRetriever
+from app.core.services.research_database import (
+    IndexedArticles, ResearchDatabase, find_treatment_mentions, tally_treatments
+)
 
 class ResearchService:
+    similarity_threshold = 0.05  # Lowered threshold for better matching
+
     def __init__(self):
         self.dsm5_data = self._load_dsm5_data()
         self.cache_dir = Path("data/cache")
         self.cache_dir.mkdir(exist_ok=True)
-        self.vectorizer = TfidfVectorizer(stop_words='english')
         self.research_db = ResearchDatabase()
+        self.retriever = self._build_condition_index()
+        self.conditions = self.retriever.conditions
 
     def _load_dsm5_data(self) -> Dict:
         """Load DSM-5 criteria and treatments from JSON file"""
@@ -23,6 +27,19 @@ class ResearchService:
                 return json.load(f)
         return {}
 
+    def _build_condition_index(self) -> ConditionRetriever:
+        """Index the DSM-5 criteria once for top-k retrieval"""
+        conditions = []
+        criteria_texts = []
+
+        for condition, data in self.dsm5_data.items():
+            conditions.append(condition)
+            # Include both criteria and name in the comparison text
+            criteria_text = data["name"] + " " + " ".join(data["diagnostic_criteria"])
+            criteria_texts.append(criteria_text)
+
+        return ConditionRetriever.from_env(conditions, criteria_texts)
+
     def get_scholarly_articles(self, disorder: str, max_results: int = 5) -> List[Dict]:
         """Get research articles from our database"""
         return self.research_db.get_articles(disorder)[:max_results]
@@ -33,51 +50,52 @@ class ResearchService:
 
     def analyze_treatment_effectiveness(self, articles: List[Dict]) -> Dict:
         """Analyze research papers to extract treatment effectiveness data"""
-        treatments = {}
-        
-        for article in articles:
-            # Basic NLP could be added here to extract treatment mentions
-            # and their reported effectiveness
-            abstract = article.get('abstract', '').lower()
-            
-            # Example analysis (this should be enhanced with proper NLP)
-            for therapy in ["cbt", "medication", "mindfulness", "psychotherapy"]:
-                if therapy in abstract:
-                    if therapy not in treatments:
-                        treatments[therapy] = {
-                            'mention_count': 0,
-                            'articles': []
-                        }
-                    treatments[therapy]['mention_count'] += 1
-                    treatments[therapy]['articles'].append(article['title'])
-
-        return treatments
-
-    def analyze_symptoms(self, symptoms: str) -> List[Tuple[str, float]]:
-        """Analyze symptoms and match with possible conditions"""
-        # Prepare DSM-5 criteria for comparison
-        conditions = []
-        criteria_texts = []
-        
-        for condition, data in self.dsm5_data.items():
-            conditions.append(condition)
-            # Include both criteria and name in the comparison text
-            criteria_text = data["name"] + " " + " ".join(data["diagnostic_criteria"])
-            criteria_texts.append(criteria_text)
+        # Basic NLP could be added here to extract treatment mentions
+        # and their reported effectiveness
+        return tally_treatments((article, find_treatment_mentions(article.get('abstract', '')))
+                                for article in articles)
+
+    def get_indexed_articles(self, disorder: str, max_results: int = 5) -> IndexedArticles:
+        """The articles get_scholarly_articles returns, as read-only catalog records with their treatment mentions"""
+        return self.research_db.get_indexed_articles(disorder, limit=max_results)
+
+    def analyze_indexed_treatments(self, indexed: IndexedArticles) -> Dict:
+        """analyze_treatment_effectiveness for indexed articles, from the treatment mentions found at load time"""
+        return self.research_db.tally_indexed_treatments(indexed)
+
+    def get_treatment_analysis(self, disorder: str, max_results: int = 5) -> Dict:
+        """Treatment table for the articles get_scholarly_articles returns, from the prebuilt index"""
+        return self.research_db.get_treatment_mentions(disorder, limit=max_results)
+
+    def analyze_symptoms(self, symptoms: str, threshold: Optional[float] = None,
+                         top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Analyze symptoms and match with possible conditions, best first
+
+        Conditions must score above ``threshold`` (the service's
+        similarity_threshold by default); ``top_k`` caps how many are returned.
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+        return self.retriever.search(symptoms, threshold, top_k)
+
+    def analyze_symptoms_batch(self,
+                               symptom_texts: Iterable[str],
+                               top_k: Optional[int] = None,
+                               threshold: Optional[float] = None,
+                               chunk_size: int = 1000) -> Iterator[List[Tuple[str, float]]]:
+        """Match many symptom descriptions at once, yielding one ranked list per input in order
+
+        Inputs are consumed ``chunk_size`` at a time and each chunk is scored with a
+        single sparse matrix product, so memory stays bounded however many texts are fed in.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if threshold is None:
+            threshold = self.similarity_threshold
 
-        # Add symptoms to the comparison
-        all_texts = criteria_texts + [symptoms]
-        tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-        
-        # Calculate similarity scores
-        similarities = cosine_similarity(tfidf_matrix[-1:], tfidf_matrix[:-1])[0]
-        
-        # Pair conditions with their similarity scores
-        condition_scores = list(zip(conditions, similarities))
-        
-        # Sort by similarity score and filter those above threshold
-        threshold = 0.05  # Lowered threshold for better matching
-        relevant_conditions = [(cond, score) for cond, score in condition_scores if score > threshold]
-        relevant_conditions.sort(key=lambda x: x[1], reverse=True)
-        
-        return relevant_conditions 
\ No newline at end of file
+        texts = iter(symptom_texts)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                return
+            yield from self.retriever.search_many(chunk, threshold, top_k)
@@ -1,58 +1,164 @@
-from typing import Dict
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 import re
+from app.core.services.analysis_cache import AnalysisCache, text_fingerprint
+from app.core.services.keyword_matcher import (
+    EMOTION_KEYWORDS, RISK_KEYWORDS, KeywordScanner, get_keyword_scanner
+)
 
-class SentimentAnalyzer:
-    def __init__(self):
-        # Download required NLTK data
+# Bump whenever _analyze_text changes what it returns for the same text; stored and
+# cached analyses from another version are then told apart from current ones
+ANALYZER_VERSION = "1"
+
+# NLTK resource paths as nltk.data.find expects them, mapped to their download ids
+NLTK_RESOURCES = {
+    'sentiment/vader_lexicon.zip': 'vader_lexicon',
+    'tokenizers/punkt': 'punkt',
+    'corpora/stopwords': 'stopwords'
+}
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisOutcome(NamedTuple):
+    """Result of one item from SentimentAnalyzer.analyze_many"""
+    index: int
+    result: Optional[Dict]
+    error: Optional[Dict]
+
+
+_shared_analyzer: Optional["SentimentAnalyzer"] = None
+_shared_analyzer_lock = threading.Lock()
+
+
+def failed_analysis(message: str) -> Dict:
+    """Neutral stand-in result for a text that could not be analyzed"""
+    return {
+        "sentiment": {
+            "score": 0.5,
+            "label": "NEUTRAL",
+            "emotions": ["unknown"],
+            "risk_level": "unknown"
+        },
+        "details": {
+            "reasoning": f"Error in analysis: {message}",
+            "suggestions": ["Please try again"]
+        }
+    }
+
+
+def ensure_nltk_data():
+    """Download any NLTK resources that are not installed yet"""
+    import nltk
+
+    for resource, package in NLTK_RESOURCES.items():
         try:
-            nltk.data.find('vader_lexicon')
-            nltk.data.find('punkt')
-            nltk.data.find('stopwords')
+            nltk.data.find(resource)
         except LookupError:
-            nltk.download('vader_lexicon')
-            nltk.download('punkt')
-            nltk.download('stopwords')
+            nltk.download(package, quiet=True)
+
+
+def get_shared_analyzer() -> "SentimentAnalyzer":
+    """Return the process-wide analyzer, loading the VADER lexicon on first use
+
+    The analyzer only reads its lexicon and keyword tables after construction,
+    so one instance can serve every concurrent session.
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_analyzer_lock:
+            if _shared_analyzer is None:
+                _shared_analyzer = SentimentAnalyzer()
+    return _shared_analyzer
+
+
+def warm_up_sentiment_analyzer() -> "SentimentAnalyzer":
+    """Build the shared analyzer and run one analysis so the first real entry pays nothing extra"""
+    analyzer = get_shared_analyzer()
+    analyzer.analyze("Warming up the sentiment analyzer.")
+    return analyzer
+
+
+def lexicon_fingerprint(lexicon: Dict[str, float], *keyword_tables: Dict, nltk_version: str = "") -> str:
+    """Short hash of everything besides the code that decides an analysis
+
+    Keyword tables are hashed in their own order, which decides how emotions
+    are listed and which risk level wins.
+    """
+    tables = [[[key, list(words)] for key, words in table.items()] for table in keyword_tables]
+    payload = json.dumps([nltk_version, sorted(lexicon.items()), tables])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class SentimentAnalyzer:
+    """VADER sentiment plus keyword-based emotion and risk detection
+
+    ``emotion_keywords`` and ``risk_keywords`` default to the tables in
+    keyword_matcher. Assigning a new table recompiles the keyword scanner
+    and changes ``version``; tables are not meant to be modified in place.
+    """
+
+    def __init__(self,
+                 cache: Optional[AnalysisCache] = None,
+                 emotion_keywords: Optional[Dict[str, List[str]]] = None,
+                 risk_keywords: Optional[Dict[str, List[str]]] = None):
+        # Download required NLTK data
+        ensure_nltk_data()
         
+        # NLTK is imported here rather than at module load so app startup stays fast
+        import nltk
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
         self.sia = SentimentIntensityAnalyzer()
-        self.emotion_keywords = {
-            'joy': ['happy', 'excited', 'delighted', 'joyful', 'pleased', 'grateful'],
-            'sadness': ['sad', 'depressed', 'unhappy', 'miserable', 'down', 'blue'],
-            'anger': ['angry', 'frustrated', 'irritated', 'annoyed', 'furious'],
-            'anxiety': ['anxious', 'worried', 'nervous', 'stressed', 'tense'],
-            'fear': ['scared', 'afraid', 'terrified', 'fearful', 'panicked'],
-            'hope': ['hopeful', 'optimistic', 'looking forward', 'confident'],
-            'calm': ['peaceful', 'relaxed', 'serene', 'tranquil', 'calm']
-        }
-        
-        self.risk_keywords = {
-            'high': ['suicide', 'kill myself', 'end my life', 'want to die', 'better off dead'],
-            'medium': ['hopeless', 'worthless', 'can\'t go on', 'give up', 'no point'],
-            'low': ['exhausted', 'overwhelmed', 'struggling', 'difficult', 'hard time']
-        }
+        self._nltk_version = nltk.__version__
+        self._emotion_keywords = EMOTION_KEYWORDS if emotion_keywords is None else emotion_keywords
+        self._risk_keywords = RISK_KEYWORDS if risk_keywords is None else risk_keywords
+        self._compile_keywords()
+        self.cache = cache if cache is not None else AnalysisCache.from_env()
+
+    @property
+    def emotion_keywords(self) -> Dict[str, List[str]]:
+        return self._emotion_keywords
+
+    @emotion_keywords.setter
+    def emotion_keywords(self, keywords: Dict[str, List[str]]):
+        self._emotion_keywords = keywords
+        self._compile_keywords()
+
+    @property
+    def risk_keywords(self) -> Dict[str, List[str]]:
+        return self._risk_keywords
+
+    @risk_keywords.setter
+    def risk_keywords(self, keywords: Dict[str, List[str]]):
+        self._risk_keywords = keywords
+        self._compile_keywords()
+
+    def _compile_keywords(self):
+        if self._emotion_keywords is EMOTION_KEYWORDS and self._risk_keywords is RISK_KEYWORDS:
+            # The default tables are compiled once per process and shared
+            self.keyword_scanner = get_keyword_scanner()
+        else:
+            self.keyword_scanner = KeywordScanner(self._emotion_keywords, self._risk_keywords)
+        # Fingerprinted from the tables just compiled, so analyses made with other tables never match
+        self.lexicon_version = lexicon_fingerprint(self.sia.lexicon, self._emotion_keywords,
+                                                   self._risk_keywords, nltk_version=self._nltk_version)
+        # Stamped on every result and stored with journal entries
+        self.version = f"{ANALYZER_VERSION}-{self.lexicon_version}"
 
     def detect_emotions(self, text: str) -> list:
         """Detect emotions present in the text"""
-        text = text.lower()
-        detected_emotions = []
-        
-        for emotion, keywords in self.emotion_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                detected_emotions.append(emotion)
-        
-        return detected_emotions if detected_emotions else ['neutral']
+        return self.keyword_scanner.scan(text).emotions
 
     def assess_risk_level(self, text: str) -> str:
         """Assess risk level based on keywords"""
-        text = text.lower()
-        
-        for level, keywords in self.risk_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return level
-        return 'none'
+        return self.keyword_scanner.scan(text).risk_level
 
     def get_suggestions(self, sentiment_score: float, emotions: list, risk_level: str) -> list:
         """Generate suggestions based on analysis"""
@@ -81,61 +187,145 @@ class SentimentAnalyzer:
             
         return suggestions if suggestions else ["Continue your current positive practices"]
 
+    def _analyze_text(self, text: str) -> Dict:
+        """Analyze the sentiment of a text, letting any error propagate"""
+        # Get VADER sentiment scores
+        scores = self.sia.polarity_scores(text)
+        
+        # Normalize compound score to 0-1 range
+        normalized_score = (scores['compound'] + 1) / 2
+        
+        # Determine sentiment label
+        if normalized_score > 0.6:
+            sentiment_label = "POSITIVE"
+        elif normalized_score < 0.4:
+            sentiment_label = "NEGATIVE"
+        else:
+            sentiment_label = "NEUTRAL"
+        
+        # Detect emotions and risk level in one pass over the text
+        keyword_scan = self.keyword_scanner.scan(text)
+        emotions = keyword_scan.emotions
+        risk_level = keyword_scan.risk_level
+        
+        # Generate suggestions
+        suggestions = self.get_suggestions(normalized_score, emotions, risk_level)
+        
+        # Generate reasoning
+        reasoning = f"Analysis shows {sentiment_label.lower()} sentiment"
+        if emotions != ['neutral']:
+            reasoning += f" with detected emotions: {', '.join(emotions)}"
+        if risk_level != 'none':
+            reasoning += f". Risk level: {risk_level}"
+        
+        return {
+            "sentiment": {
+                "score": normalized_score,
+                "label": sentiment_label,
+                "emotions": emotions,
+                "risk_level": risk_level
+            },
+            "details": {
+                "reasoning": reasoning,
+                "suggestions": suggestions
+            }
+        }
+
+    def _analyze_cached(self, text: str) -> Dict:
+        """``_analyze_text`` memoized by content hash and analyzer version; errors are not cached"""
+        text_hash = text_fingerprint(text)
+        result = self.cache.get(text_hash, self.version)
+        if result is None:
+            result = self._analyze_text(text)
+            result["text_hash"] = text_hash
+            result["analyzer_version"] = self.version
+            self.cache.put(text_hash, self.version, result)
+        return result
+
     def analyze(self, text: str) -> Dict:
-        """Analyze the sentiment of a text"""
+        """Analyze the sentiment of a text
+
+        The result carries the ``text_hash`` and ``analyzer_version`` it was
+        computed for, so it can be stored and recognized later.
+        """
         try:
-            # Get VADER sentiment scores
-            scores = self.sia.polarity_scores(text)
-            
-            # Normalize compound score to 0-1 range
-            normalized_score = (scores['compound'] + 1) / 2
-            
-            # Determine sentiment label
-            if normalized_score > 0.6:
-                sentiment_label = "POSITIVE"
-            elif normalized_score < 0.4:
-                sentiment_label = "NEGATIVE"
-            else:
-                sentiment_label = "NEUTRAL"
-            
-            # Detect emotions and risk level
-            emotions = self.detect_emotions(text)
-            risk_level = self.assess_risk_level(text)
-            
-            # Generate suggestions
-            suggestions = self.get_suggestions(normalized_score, emotions, risk_level)
-            
-            # Generate reasoning
-            reasoning = f"Analysis shows {sentiment_label.lower()} sentiment"
-            if emotions != ['neutral']:
-                reasoning += f" with detected emotions: {', '.join(emotions)}"
-            if risk_level != 'none':
-                reasoning += f". Risk level: {risk_level}"
-            
-            return {
-                "sentiment": {
-                    "score": normalized_score,
-                    "label": sentiment_label,
-                    "emotions": emotions,
-                    "risk_level": risk_level
-                },
-                "details": {
-                    "reasoning": reasoning,
-                    "suggestions": suggestions
-                }
-            }
-            
+            return self._analyze_cached(text)
+        except Exception as e:
+            logger.exception("Error in sentiment analysis")
+            return failed_analysis(str(e))
+
+    def analyze_many(self,
+                     texts: Iterable[str],
+                     max_workers: Optional[int] = None,
+                     chunk_size: int = 256,
+                     max_pending_chunks: Optional[int] = None) -> Iterator[AnalysisOutcome]:
+        """Analyze many texts on a process pool, yielding outcomes in input order
+
+        Each worker builds its own analyzer with this analyzer's keyword
+        tables. Failures are reported per item in ``AnalysisOutcome.error``
+        instead of being replaced by a neutral result. Only ``max_pending_chunks``
+        chunks are in flight at once, so the input can be an arbitrarily long stream.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        texts = iter(texts)
+        chunks = _enumerate_chunks(texts, chunk_size)
+
+        if max_workers == 1:
+            # Run in-process with this analyzer; useful for small batches and debugging
+            for start, chunk in chunks:
+                yield from _analyze_chunk(start, chunk, self)
+            return
+
+        max_workers = max_workers or os.cpu_count() or 1
+        max_pending_chunks = max_pending_chunks or max_workers * 2
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_analysis_worker,
+                                 initargs=(self.emotion_keywords, self.risk_keywords)) as executor:
+            pending = deque()
+            for start, chunk in chunks:
+                pending.append(executor.submit(_analyze_chunk, start, chunk))
+                if len(pending) >= max_pending_chunks:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _enumerate_chunks(texts: Iterator[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Split a stream of texts into (start index, chunk) pairs"""
+    start = 0
+    while True:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+# Analyzer of an analyze_many worker process, set by _init_analysis_worker
+_worker_analyzer: Optional[SentimentAnalyzer] = None
+
+
+def _init_analysis_worker(emotion_keywords: Dict[str, List[str]], risk_keywords: Dict[str, List[str]]):
+    """Process pool initializer: load the lexicon once per worker, with the caller's keyword tables"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(emotion_keywords=emotion_keywords, risk_keywords=risk_keywords)
+    _worker_analyzer.analyze("Warming up the sentiment analyzer.")
+
+
+def _analyze_chunk(start: int,
+                   texts: List[str],
+                   analyzer: Optional[SentimentAnalyzer] = None) -> List[AnalysisOutcome]:
+    """Analyze one chunk, recording failures per item"""
+    analyzer = analyzer or _worker_analyzer or get_shared_analyzer()
+    outcomes = []
+    for offset, text in enumerate(texts):
+        try:
+            outcomes.append(AnalysisOutcome(start + offset, analyzer._analyze_cached(text), None))
         except Exception as e:
-            print(f"Error in sentiment analysis: {str(e)}")
-            return {
-                "sentiment": {
-                    "score": 0.5,
-                    "label": "NEUTRAL",
-                    "emotions": ["unknown"],
-                    "risk_level": "unknown"
-                },
-                "details": {
-                    "reasoning": f"Error in analysis: {str(e)}",
-                    "suggestions": ["Please try again"]
-                }
-            } 
\ No newline at end of file
+            outcomes.append(AnalysisOutcome(start + offset, None, {
+                "type": type(e).__name__,
+                "message": str(e)
+            }))
+    return outcomes
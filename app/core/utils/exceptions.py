@@ -9,4 +9,27 @@ class NoMatchingConditionsError(Exception):
             "Describe any changes in sleep, appetite, or energy levels"
         ]
         message = "Unable to identify matching conditions. Here are some suggestions to help us better understand your symptoms:"
-        super().__init__(message) 
\ No newline at end of file
+        super().__init__(message) 
+
+
+class TechniqueCatalogError(Exception):
+    """Raised when the technique catalog file cannot be parsed or fails validation"""
+
+
+class DuplicateTechniqueError(TechniqueCatalogError):
+    def __init__(self, path: str, duplicates: list):
+        self.path = path
+        self.duplicates = duplicates
+        super().__init__(f"Duplicate technique names in {path}: {', '.join(duplicates)}")
+
+
+class ArticleCatalogError(Exception):
+    """Raised when the research article file cannot be parsed or fails validation"""
+
+
+class JournalQueryError(ValueError):
+    """Raised when a journal search query has nothing to search for"""
+
+
+class JournalImportError(ValueError):
+    """Raised when a journal file cannot be imported at all, e.g. an unknown format or missing columns"""
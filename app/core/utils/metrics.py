@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Latency buckets in seconds, from sub-millisecond lookups up to slow network fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def _label_set(labels: Dict[str, object]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+
+class Histogram:
+    """Per-bucket counts plus sum and count, as Prometheus histograms expose them"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: List[int], total: float, count: int):
+        for i, bucket_count in enumerate(counts):
+            self.counts[i] += bucket_count
+        self.sum += total
+        self.count += count
+
+
+class _NoopSpan:
+    """Shared do-nothing span handed out while metrics are disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Times a block and records it into a histogram when the block exits"""
+    __slots__ = ("registry", "name", "labels", "start", "duration")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: LabelSet):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        self.registry._record_span(self, failed=exc_type is not None)
+        return False
+
+
+class MetricsRegistry:
+    """Thread-safe counters and latency histograms, exportable as Prometheus text
+
+    While disabled, ``span`` returns a shared no-op context manager and
+    ``inc``/``observe`` return immediately, so instrumented code pays next to
+    nothing.
+    """
+
+    def __init__(self, enabled: bool = True, recent_span_limit: int = 200):
+        self.enabled = enabled
+        self._counters: Dict[Tuple[str, LabelSet], float] = {}
+        self._histograms: Dict[Tuple[str, LabelSet], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._recent_spans = deque(maxlen=recent_span_limit)
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_set(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_set(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def span(self, name: str, **labels):
+        """``with metrics.span("..._seconds", stage="..."):`` records the block's duration"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, _label_set(labels))
+
+    def _record_span(self, span: Span, failed: bool):
+        key = (span.name, span.labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(span.duration)
+            self._recent_spans.append({
+                "name": span.name,
+                "labels": dict(span.labels),
+                "seconds": span.duration,
+                "failed": failed,
+                "finished_at": time.time()
+            })
+
+    def recent_spans(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent spans first"""
+        with self._lock:
+            spans = list(self._recent_spans)
+        spans.reverse()
+        return spans[:limit] if limit else spans
+
+    def _snapshot_locked(self) -> Dict:
+        return {
+            "counters": [(name, labels, value) for (name, labels), value in self._counters.items()],
+            "histograms": [
+                (name, labels, list(histogram.counts), histogram.sum, histogram.count)
+                for (name, labels), histogram in self._histograms.items()
+            ],
+            "spans": list(self._recent_spans)
+        }
+
+    def snapshot(self) -> Dict:
+        """Plain, picklable copy of every metric, e.g. to ship from a worker process"""
+        with self._lock:
+            return self._snapshot_locked()
+
+    def drain(self) -> Dict:
+        """Snapshot and reset, so repeated drains yield deltas"""
+        with self._lock:
+            snapshot = self._snapshot_locked()
+            self._counters = {}
+            self._histograms = {}
+            self._recent_spans.clear()
+        return snapshot
+
+    def merge(self, snapshot: Dict):
+        """Add a snapshot from another registry (typically a worker's ``drain``) into this one"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, labels)
+                self._counters[key] = self._counters.get(key, 0) + value
+            for name, labels, counts, total, count in snapshot["histograms"]:
+                key = (name, labels)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.merge(counts, total, count)
+            self._recent_spans.extend(snapshot["spans"])
+
+    def reset(self):
+        self.drain()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                ((key, (list(h.buckets), list(h.counts), h.sum, h.count)) for key, h in self._histograms.items()),
+                key=lambda item: item[0]
+            )
+
+        lines = []
+        last_name = None
+        for (name, labels), value in counters:
+            if name != last_name:
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                last_name = name
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            if name != last_name:
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                last_name = name
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _enabled_from_env() -> bool:
+    return os.environ.get("MARIPOSA_METRICS", "1").lower() not in ("0", "false", "no", "off")
+
+
+# Process-wide registry; MARIPOSA_METRICS=0 turns instrumentation into no-ops
+metrics = MetricsRegistry(enabled=_enabled_from_env())
+
+metrics.describe("mariposa_plan_generation_seconds", "End-to-end therapy plan generation time")
+metrics.describe("mariposa_plan_stage_seconds", "Time spent in each plan generation stage")
+metrics.describe("mariposa_plan_errors_total", "Plan generations that raised, by exception type")
+metrics.describe("mariposa_plan_cache_requests_total", "Plan cache lookups by result")
+metrics.describe("mariposa_sentiment_cache_requests_total", "Sentiment analysis cache lookups by result")
@@ -0,0 +1,134 @@
+"""Import-time profile of the Streamlit entry points
+
+Runs the target module in a fresh interpreter under ``python -X importtime``
+and prints the modules that dominate startup. With ``--budget-ms`` or the
+default list of forbidden heavy packages it doubles as a regression check:
+
+    python -m app.core.utils.startup_profile
+    python -m app.core.utils.startup_profile --module main --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+APP_DIR = REPO_ROOT / "app"
+
+# Heavy libraries that must only load on first use. Streamlit itself already pulls in
+# plotly.graph_objects, so only plotly.express is ours to defer
+DEFERRED_PACKAGES = ("sklearn", "scipy", "pandas", "nltk", "plotly.express")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+CHILD_CODE = """
+import importlib, json, os, sys, time
+sys.path[0:0] = [{app_dir!r}, {repo_root!r}]
+os.chdir({repo_root!r})
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print("__startup_profile__" + json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class StartupProfile(NamedTuple):
+    module: str
+    elapsed_ms: float
+    timings: List[ImportTiming]
+    loaded_modules: List[str]
+
+    def top(self, count: int) -> List[ImportTiming]:
+        return sorted(self.timings, key=lambda t: t.cumulative_us, reverse=True)[:count]
+
+    def by_package(self) -> Dict[str, float]:
+        """Self time per top-level package, in milliseconds"""
+        totals = defaultdict(float)
+        for timing in self.timings:
+            totals[timing.module.split(".")[0]] += timing.self_us / 1000
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def deferred_packages_loaded(self, packages=DEFERRED_PACKAGES) -> List[str]:
+        loaded = set(self.loaded_modules)
+        return [package for package in packages if package in loaded]
+
+
+def profile_startup(module: str = "main") -> StartupProfile:
+    """Import ``module`` the way ``streamlit run app/...`` would and collect import timings"""
+    code = CHILD_CODE.format(app_dir=str(APP_DIR), repo_root=str(REPO_ROOT), module=module)
+    env = dict(os.environ, MARIPOSA_WARM_UP="0")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=REPO_ROOT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), len(indent) // 2))
+
+    marker = next(line for line in completed.stdout.splitlines()
+                  if line.startswith("__startup_profile__"))
+    summary = json.loads(marker[len("__startup_profile__"):])
+    return StartupProfile(module, summary["elapsed"] * 1000, timings, summary["modules"])
+
+
+def format_report(profile: StartupProfile, top: int = 25) -> str:
+    lines = [f"Startup import profile for {profile.module}: {profile.elapsed_ms:.0f} ms", ""]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for timing in profile.top(top):
+        lines.append(f"{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>9.1f}  "
+                     f"{'  ' * timing.depth}{timing.module}")
+    lines.extend(["", "Self time by package:"])
+    for package, milliseconds in list(profile.by_package().items())[:10]:
+        lines.append(f"{milliseconds:>14.1f}  {package}")
+    return "\n".join(lines)
+
+
+def check_profile(profile: StartupProfile, budget_ms: Optional[float]) -> List[str]:
+    """Regression check: heavy packages must stay deferred and startup within budget"""
+    problems = [f"{package} is imported at startup"
+                for package in profile.deferred_packages_loaded()]
+    if budget_ms is not None and profile.elapsed_ms > budget_ms:
+        problems.append(f"startup took {profile.elapsed_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", action="append",
+                        help="module to import, relative to app/ (default: main and the journal page)")
+    parser.add_argument("--top", type=int, default=25, help="number of modules to list")
+    parser.add_argument("--budget-ms", type=float, help="fail if a module takes longer to import")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.module or ["main", "pages.01_Calendar_and_Journal"]:
+        profile = profile_startup(module)
+        print(format_report(profile, args.top))
+        problems = check_profile(profile, args.budget_ms)
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        failed = failed or bool(problems)
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
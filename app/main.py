@@ -1,13 +1,22 @@
+import logging
+import os
+import threading
 import streamlit as st
-from core.models.schemas import PatientInput, Schedule
-from core.models.severity_level import SeverityLevel
-from core.services.plan_service import TherapyPlanGenerator
-from core.services.calendar_planner import TherapyCalendarPlanner
-from core.utils.exceptions import NoMatchingConditionsError
+from app.core.models.schemas import PatientInput, Schedule
+from app.core.models.severity_level import SeverityLevel
+from app.core.services.keyword_matcher import scan_keywords
+from app.core.services.registry import get_registry
+from app.core.services.knowledge_base import KnowledgeBaseWatcher
+from app.components import show_technique_picker
+from app.core.utils.exceptions import NoMatchingConditionsError
+from app.core.utils.metrics import metrics
 from typing import List, Dict
-from datetime import datetime
-import pandas as pd
-import plotly.graph_objects as go
+from datetime import timedelta
+
+logger = logging.getLogger(__name__)
+
+# DEBUG=1 (as docker-compose sets it) adds the pipeline metrics panel to the sidebar
+DEBUG = os.environ.get("DEBUG", "").lower() in ("1", "true", "yes")
 
 st.set_page_config(
     page_title="Mariposa - Therapy Plan Optimizer",
@@ -15,12 +24,32 @@ st.set_page_config(
     layout="wide"
 )
 
+def _warm_up():
+    # The knowledge base and symptom index are built before the first plan request needs them
+    registry = get_registry()
+    registry.get("plan_generator")
+    # Data file edits are picked up by rebuilding the services on the watcher thread
+    KnowledgeBaseWatcher.from_env(lambda version: registry.reload(),
+                                  version=registry.get("kb_version")).start()
+    try:
+        registry.get("sentiment_analyzer")
+    except LookupError as e:
+        # Missing NLTK data only affects journaling; the intake form should still load
+        logger.warning("Sentiment analyzer warm-up failed: %s", e)
+
+@st.cache_resource(show_spinner=False)
+def warm_up_services() -> threading.Thread:
+    """Load shared resources once per server process, in the background so the intake form renders first"""
+    thread = threading.Thread(target=_warm_up, name="mariposa-warm-up", daemon=True)
+    # MARIPOSA_WARM_UP=0 skips it, e.g. when profiling imports
+    if os.environ.get("MARIPOSA_WARM_UP", "1") != "0":
+        thread.start()
+    return thread
+
+warm_up_services()
+
 def check_for_crisis(symptoms: str) -> bool:
-    crisis_keywords = [
-        "suicide", "kill myself", "die", "end my life", "self harm",
-        "hurt myself", "don't want to live", "want to die"
-    ]
-    return any(keyword in symptoms.lower() for keyword in crisis_keywords)
+    return scan_keywords(symptoms).crisis
 
 def show_crisis_resources():
     st.error("🚨 IMMEDIATE SUPPORT AVAILABLE 🚨")
@@ -95,57 +124,52 @@ def show_research_articles(articles: List[Dict]):
         else:
             st.info("No research articles available for this condition.")
 
-def show_therapy_calendar(schedule: List[Dict]):
-    st.markdown("### 📅 Your 4-Week Therapy Schedule")
-    
-    current_week = None
-    for session in schedule:
-        session_date = datetime.strptime(session['date'], "%Y-%m-%d")
-        week_num = (session_date - datetime.now()).days // 7 + 1
-        
-        if week_num != current_week:
-            current_week = week_num
-            st.markdown(f"\n#### Week {week_num}")
-        
-        # Create a container for each session
-        with st.container():
-            # Session Header
-            st.markdown(f"""
-            ### 📆 {session['date']} ({session['day']})
-            
-            **Activity:** {session['activity']}
-            
-            **Type:** {session['type']}
-            
-            **Duration:** {session['duration']}
-            """)
-            
-            technique_details = session.get('technique_details', {})
-            if technique_details:
-                # About Section
-                st.markdown("### About this Technique")
-                st.write(technique_details.get('description', ''))
-                
-                # Steps Section
-                st.markdown("### Steps")
-                for step in technique_details.get('steps', []):
-                    st.markdown(f"• {step}")
-                
-                # Exercise Section
-                st.markdown("### Today's Exercise")
-                exercises = technique_details.get('exercises', [])
-                if exercises:
-                    exercise = exercises[0]
-                    st.markdown(f"**{exercise['name']}** ({exercise['duration']})")
-                    for instruction in exercise['instructions']:
-                        st.markdown(f"• {instruction}")
-                
-                # Resources Section
-                st.markdown("### Additional Resources")
-                for resource in technique_details.get('resources', []):
-                    st.markdown(f"• [{resource['title']}]({resource['url']}) ({resource['type']})")
-            
-            st.markdown("---")  # Divider between sessions
+def show_therapy_calendar(schedule):
+    """Show one week of the schedule at a time, with details only for the technique picked"""
+    if not schedule or schedule.start_date is None:
+        st.info("No sessions scheduled yet")
+        return
+
+    total_weeks = (schedule.end_date - schedule.start_date).days // 7 + 1
+    st.markdown(f"### 📅 Your {total_weeks}-Week Therapy Schedule")
+
+    week = st.number_input("Week", min_value=1, max_value=total_weeks, value=1, step=1,
+                           key="therapy_calendar_week")
+    week_start = schedule.start_date + timedelta(days=(week - 1) * 7)
+    sessions = list(schedule.iter_range(week_start, week_start + timedelta(days=6)))
+
+    # The whole week goes out as a single table rather than one element per session
+    rows = ["| Date | Time | Activity | Type | Duration |", "|---|---|---|---|---|"]
+    rows += [
+        f"| {session['date']} ({session['day']}) | {session['time']} | {session['activity']} "
+        f"| {session['type']} | {session['duration']} |"
+        for session in sessions
+    ]
+    st.markdown("\n".join(rows))
+
+    show_technique_picker(sessions, key="therapy_calendar_technique")
+
+def show_debug_panel():
+    """Per-stage timings of recent plans, plan and sentiment cache stats and the raw metrics"""
+    with st.sidebar.expander("🔧 Plan pipeline metrics"):
+        spans = metrics.recent_spans(limit=30)
+        if not spans:
+            st.caption("No plans generated yet")
+        else:
+            st.text("\n".join(
+                f"{span['labels'].get('stage', 'total plan'):<20} {span['seconds'] * 1000:9.2f} ms"
+                + (" (failed)" if span["failed"] else "")
+                for span in spans
+            ))
+        registry = get_registry()
+        if st.button("Reload knowledge base"):
+            registry.reload()
+        st.json(registry.get("plan_cache").stats())
+        # Only once loaded; building the analyzer here would pull in NLTK
+        if "sentiment_analyzer" in registry.loaded():
+            st.json(registry.get("sentiment_analyzer").cache.stats())
+        st.caption(f"Services (generation {registry.generation}): {', '.join(registry.loaded())}")
+        st.code(metrics.render_prometheus(), language="text")
 
 def main():
     st.title("🦋 Mariposa")
@@ -199,7 +223,8 @@ def main():
 
                 try:
                     # Generate plan
-                    planner = TherapyPlanGenerator()
+                    # Shared by every session; building it per submit re-read the knowledge base each time
+                    planner = get_registry().get("plan_generator")
                     therapy_plan = planner.generate_therapy_plan(patient_input)
                     
                     # Display identified conditions
@@ -240,17 +265,6 @@ def main():
 
                     st.info("⚠️ Note: This is an AI-generated suggestion. Please consult with a mental health professional for a proper diagnosis and treatment plan.")
 
-                    # In the main function, after generating the therapy plan:
-                    calendar_planner = TherapyCalendarPlanner()
-                    schedule = calendar_planner.generate_weekly_schedule(
-                        therapy_type=therapy_plan.therapy_type,
-                        session_frequency=therapy_plan.session_frequency,
-                        techniques=therapy_plan.techniques,
-                        severity=patient_input.severity
-                    )
-                    print("Generated schedule:", schedule)  # Debug print
-                    st.session_state.therapy_schedule = schedule
-
                 except NoMatchingConditionsError as e:
                     st.error("We need more information to help you better")
                     
@@ -271,5 +285,10 @@ def main():
                 except Exception as e:
                     st.error(f"Error generating therapy plan: {str(e)}")
 
+    if st.session_state.get("therapy_schedule"):
+        show_therapy_calendar(st.session_state.therapy_schedule)
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
+    if DEBUG:
+        show_debug_panel() 
\ No newline at end of file
@@ -1,11 +1,34 @@
 import streamlit as st
 import calendar
-from datetime import datetime, timedelta
-import pandas as pd
-import plotly.graph_objects as go
-import nltk
+import uuid
+from datetime import date, datetime, timedelta
 from typing import List, Dict
-from core.services.sentiment_analyzer import SentimentAnalyzer
+from app.core.services.sentiment_analyzer import SentimentAnalyzer
+from app.core.services.journal_store import JournalStore
+from app.core.services.progress_service import build_progress_series
+from app.core.services.date_index import DateIndex
+from app.core.services.registry import get_registry
+from app.core.services.journal_io import (
+    JOURNAL_FORMATS, ImportProgress, export_journal_file, import_journal, journal_format
+)
+from app.components import show_technique_picker
+from app.core.utils.exceptions import JournalImportError, JournalQueryError
+
+HISTORY_PAGE_SIZE = 20
+
+def get_sentiment_analyzer() -> SentimentAnalyzer:
+    """Shared analyzer for every session in this server process"""
+    return get_registry().get("sentiment_analyzer")
+
+def get_journal_store() -> JournalStore:
+    """Process-wide handle on the persistent journal"""
+    return get_registry().get("journal_store")
+
+def get_journal_user_id() -> str:
+    """This session's journal owner, so sessions never see each other's entries"""
+    if "journal_user_id" not in st.session_state:
+        st.session_state.journal_user_id = uuid.uuid4().hex
+    return st.session_state.journal_user_id
 
 def analyze_journal_entry(text: str) -> dict:
     """Analyze journal entry using our custom SentimentAnalyzer"""
@@ -13,30 +36,47 @@ def analyze_journal_entry(text: str) -> dict:
         return None
     
     # Use our custom sentiment analyzer
-    analyzer = SentimentAnalyzer()
+    analyzer = get_sentiment_analyzer()
     analysis = analyzer.analyze(text)
     
     return {
         "sentiment": analysis["sentiment"],
         "details": analysis["details"],
+        "analyzer_version": analysis.get("analyzer_version"),
         "date": datetime.now().strftime("%Y-%m-%d")
     }
 
-def show_progress_charts(journal_entries):
-    """Display progress charts based on journal entries"""
-    if not journal_entries:
+def show_progress_charts(store: JournalStore, user_id: str):
+    """Display progress charts from the journal's running aggregates"""
+    import plotly.graph_objects as go
+
+    series = build_progress_series(store, user_id)
+    if not series["dates"]:
         st.info("Start journaling to see your progress!")
         return
     
-    # Convert journal entries to DataFrame
-    df = pd.DataFrame(journal_entries)
-    df['date'] = pd.to_datetime(df['date'])
-    
-    # Create sentiment trend chart
+    # Create sentiment trend chart: daily mean with the day's range shaded
     fig_sentiment = go.Figure()
     fig_sentiment.add_trace(go.Scatter(
-        x=df['date'],
-        y=[entry['score'] for entry in df['sentiment']],
+        x=series["dates"],
+        y=series["max_score"],
+        mode='lines',
+        line=dict(width=0),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    fig_sentiment.add_trace(go.Scatter(
+        x=series["dates"],
+        y=series["min_score"],
+        mode='lines',
+        line=dict(width=0),
+        fill='tonexty',
+        name='Daily Range',
+        hoverinfo='skip'
+    ))
+    fig_sentiment.add_trace(go.Scatter(
+        x=series["dates"],
+        y=series["mean_score"],
         mode='lines+markers',
         name='Emotional State Score'
     ))
@@ -47,21 +87,8 @@ def show_progress_charts(journal_entries):
     )
     st.plotly_chart(fig_sentiment)
     
-    # Create emotions frequency chart
-    all_emotions = []
-    emotion_counts = {}
-    
-    # Collect all emotions and their frequencies
-    for entry in journal_entries:
-        emotions = entry['sentiment']['emotions']
-        for emotion in emotions:
-            if emotion not in emotion_counts:
-                emotion_counts[emotion] = 0
-            emotion_counts[emotion] += 1
-            if emotion not in all_emotions:
-                all_emotions.append(emotion)
-    
     # Create bar chart for emotions
+    emotion_counts = series["emotion_counts"]
     fig_emotions = go.Figure(data=[
         go.Bar(
             name='Frequency',
@@ -76,16 +103,12 @@ def show_progress_charts(journal_entries):
     )
     st.plotly_chart(fig_emotions)
     
-    # Create risk level trend if applicable
-    risk_levels = {'none': 0, 'low': 0.33, 'medium': 0.66, 'high': 1}
-    risk_data = [risk_levels[entry['sentiment']['risk_level']] 
-                 for entry in journal_entries if entry['sentiment']['risk_level'] != 'unknown']
-    
-    if any(level > 0 for level in risk_data):
+    # Create risk level trend (highest level per day) if applicable
+    if any(level > 0 for level in series["risk"]):
         fig_risk = go.Figure()
         fig_risk.add_trace(go.Scatter(
-            x=df['date'],
-            y=risk_data,
+            x=series["risk_dates"],
+            y=series["risk"],
             mode='lines+markers',
             name='Risk Level'
         ))
@@ -128,57 +151,45 @@ def show_technique_details(technique: dict, session: dict):
         for resource in technique.get('resources', []):
             st.markdown(f"\n• [{resource['title']}]({resource['url']}) ({resource['type']})")
 
-def show_daily_activities(sessions: List[Dict], date: datetime):
+def show_daily_activities(sessions: List[Dict], date: datetime, journal_count: int = None):
     """Display activities and journal entries for a day"""
-    # Show journal entries first
-    if 'journal_entries' in st.session_state:
-        entries = [
-            entry for entry in st.session_state.journal_entries 
-            if entry['date'] == date.strftime("%Y-%m-%d")
-        ]
-        if entries:
-            st.markdown("#### 📝 Journal Entries")
-            for entry in entries:
-                st.markdown(f"**Time:** {entry['time']}")
-                st.markdown(f"**Mood Score:** {entry['sentiment']['score']:.2f}")
-                st.markdown(f"**Mood:** {entry['sentiment']['label']}")
-                st.markdown("**Entry:**")
-                st.write(entry['text'])
-                st.markdown("---")
+    # Show journal entries first; the date index already knows when a day has none
+    entries = []
+    if journal_count != 0:
+        entries = get_journal_store().get_by_date(date.strftime("%Y-%m-%d"), get_journal_user_id())
+    if entries:
+        st.markdown("#### 📝 Journal Entries")
+        for entry in entries:
+            st.markdown(f"**Time:** {entry['time']}")
+            st.markdown(f"**Mood Score:** {entry['sentiment']['score']:.2f}")
+            st.markdown(f"**Mood:** {entry['sentiment']['label']}")
+            st.markdown("**Entry:**")
+            st.write(entry['text'])
+            st.markdown("---")
 
-    # Show activities
+    # Show activities; technique details are rendered only for the one picked
     st.markdown("#### 📅 Activities")
-    for session in sessions:
-        st.markdown(f"**🕐 {session['time']} - {session['activity']} ({session['duration']})**")
-        st.markdown(f"Type: {session['type']}")
-        
-        technique_details = session.get('technique_details', {})
-        if technique_details:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### About this Technique")
-                st.write(technique_details.get('description', ''))
-                
-                st.markdown("### Steps")
-                for step in technique_details.get('steps', []):
-                    st.markdown(f"• {step}")
-            
-            with col2:
-                st.markdown("### Today's Exercise")
-                exercises = technique_details.get('exercises', [])
-                if exercises:
-                    exercise = exercises[0]
-                    st.markdown(f"**{exercise['name']}** ({exercise['duration']})")
-                    for instruction in exercise['instructions']:
-                        st.markdown(f"• {instruction}")
-                
-                st.markdown("### Additional Resources")
-                for resource in technique_details.get('resources', []):
-                    st.markdown(f"• [{resource['title']}]({resource['url']}) ({resource['type']})")
-        st.markdown("---")
+    st.markdown("  \n".join(
+        f"**🕐 {session['time']} - {session['activity']} ({session['duration']})** · {session['type']}"
+        for session in sessions
+    ))
+    show_technique_picker(sessions, key=f"technique_details_{date}")
+
+def get_date_index(schedule) -> DateIndex:
+    """This session's date index, rebuilt whenever a new schedule is generated"""
+    index = st.session_state.get('date_index')
+    if index is None or index.schedule is not schedule:
+        index = DateIndex(schedule, get_journal_store(), get_journal_user_id())
+        st.session_state.date_index = index
+    return index
+
+def record_journal_entry(entry_date: datetime):
+    """Keep the date index in step with a newly saved entry"""
+    index = st.session_state.get('date_index')
+    if index is not None:
+        index.add_journal_entry(entry_date)
 
-def create_calendar_view(schedule: List[Dict]):
+def create_calendar_view(schedule):
     """Create an interactive calendar view"""
     if not schedule:
         st.info("No schedule available yet. Generate a therapy plan first!")
@@ -196,20 +207,8 @@ def create_calendar_view(schedule: List[Dict]):
     # Create calendar
     cal = calendar.monthcalendar(year, month)
     
-    # Create schedule lookup that groups sessions by date
-    schedule_lookup = {}
-    for session in schedule:
-        date = datetime.strptime(session['date'], "%Y-%m-%d").date()
-        if date not in schedule_lookup:
-            schedule_lookup[date] = []
-        schedule_lookup[date].append(session)
-    
-    # Add journal entries to calendar
-    if 'journal_entries' in st.session_state:
-        for entry in st.session_state.journal_entries:
-            date = datetime.strptime(entry['date'], "%Y-%m-%d").date()
-            if date not in schedule_lookup:
-                schedule_lookup[date] = []
+    # Only the shown month's sessions and journal counts are loaded into the index
+    days = get_date_index(schedule).month(year, month)
     
     # Display calendar
     st.markdown("### Therapy Calendar")
@@ -220,7 +219,6 @@ def create_calendar_view(schedule: List[Dict]):
         cols[idx].markdown(f"**{day}**")
     
     # Display calendar weeks
-    selected_date = None
     for week in cal:
         cols = st.columns(7)
         for idx, day in enumerate(week):
@@ -229,73 +227,67 @@ def create_calendar_view(schedule: List[Dict]):
                 continue
             
             date = datetime(year, month, day).date()
+            bucket = days.get(date.toordinal())
             
             with cols[idx]:
-                has_journal = date in schedule_lookup
-                has_activities = any(isinstance(s, dict) and 'activity' in s 
-                                  for s in schedule_lookup.get(date, []))
+                has_journal = bucket is not None and bucket.journal_count > 0
+                has_activities = bucket is not None and bool(bucket.sessions)
                 
                 if has_journal or has_activities:
                     if st.button(
                         f"**{day}** {'📝' if has_journal else ''} {'📅' if has_activities else ''}",
                         key=f"day_{date}"
                     ):
-                        selected_date = date
+                        # Remembered, so the day stays open while its technique picker reruns the page
+                        st.session_state.calendar_selected_day = date
                 else:
                     st.markdown(str(day))
     
     # Show selected day's activities
-    if selected_date and selected_date in schedule_lookup:
+    selected_date = st.session_state.get("calendar_selected_day")
+    selected_day = days.get(selected_date.toordinal()) if selected_date else None
+    if selected_day:
         st.markdown("---")
-        st.markdown(f"### Activities for {selected_date.strftime('%A, %B %d, %Y')}")
-        show_daily_activities(schedule_lookup[selected_date], selected_date)
+        st.markdown(f"### Activities for {selected_day.date.strftime('%A, %B %d, %Y')}")
+        show_daily_activities(selected_day.sessions, selected_day.date, selected_day.journal_count)
 
-def show_schedule_view(schedule: List[Dict]):
-    """Display schedule in a day-by-day view"""
+def show_schedule_view(schedule):
+    """Display one week of the schedule in a day-by-day view"""
     if not schedule:
         st.info("No schedule available yet. Generate a therapy plan first!")
         return
 
-    # Group sessions by week and day
-    weeks = {}
-    for session in schedule:
-        date = datetime.strptime(session['date'], "%Y-%m-%d")
-        week_num = (date - datetime.now()).days // 7 + 1
-        if week_num not in weeks:
-            weeks[week_num] = {}
-        
-        day = date.strftime("%Y-%m-%d")
-        if day not in weeks[week_num]:
-            weeks[week_num][day] = []
-        weeks[week_num][day].append(session)
+    index = get_date_index(schedule)
+    weeks = index.schedule_weeks()
+    week_labels = {
+        week: f"Week {number} (from {date.fromisocalendar(week[0], week[1], 1).strftime('%B %d, %Y')})"
+        for number, week in enumerate(weeks, start=1)
+    }
+    selected_week = st.selectbox("Week", weeks, format_func=week_labels.get)
 
-    # Display each week
-    for week_num in sorted(weeks.keys()):
-        with st.expander(f"Week {week_num}", expanded=True):
-            # Display each day
-            for day, sessions in sorted(weeks[week_num].items()):
-                date_obj = datetime.strptime(day, "%Y-%m-%d")
-                st.markdown(f"### {date_obj.strftime('%A, %B %d, %Y')}")
-                
-                # Create a table for daily schedule
-                schedule_data = []
-                for session in sorted(sessions, key=lambda x: x['time']):
-                    schedule_data.append([
-                        session['time'],
-                        session['activity'],
-                        session['type'],
-                        session['duration']
-                    ])
-                
-                if schedule_data:
-                    df = pd.DataFrame(
-                        schedule_data,
-                        columns=['Time', 'Activity', 'Type', 'Duration']
-                    )
-                    st.table(df)
-                
-                # Show detailed activities
-                show_daily_activities(sorted(sessions, key=lambda x: x['time']), date_obj)
+    # Display each day of the selected week only
+    for bucket in index.week(*selected_week).values():
+        if not bucket.sessions:
+            continue
+        date_obj = bucket.date
+        st.markdown(f"### {date_obj.strftime('%A, %B %d, %Y')}")
+        
+        # Create a table for daily schedule; sessions are already in time order
+        schedule_data = [
+            [session['time'], session['activity'], session['type'], session['duration']]
+            for session in bucket.sessions
+        ]
+        
+        if schedule_data:
+            import pandas as pd
+            df = pd.DataFrame(
+                schedule_data,
+                columns=['Time', 'Activity', 'Type', 'Duration']
+            )
+            st.table(df)
+        
+        # Show detailed activities
+        show_daily_activities(bucket.sessions, date_obj, bucket.journal_count)
 
 def show_journal_entry_form():
     """Show the journal entry form"""
@@ -317,8 +309,8 @@ def show_journal_entry_form():
     
     if st.button("Save Entry"):
         if journal_text:
-            # Initialize sentiment analyzer
-            analyzer = SentimentAnalyzer()
+            # Reuse the shared sentiment analyzer
+            analyzer = get_sentiment_analyzer()
             analysis = analyzer.analyze(journal_text)
             
             # Create entry
@@ -329,12 +321,9 @@ def show_journal_entry_form():
                 **analysis
             }
             
-            # Initialize journal entries if not exists
-            if 'journal_entries' not in st.session_state:
-                st.session_state.journal_entries = []
-            
             # Add entry
-            st.session_state.journal_entries.append(entry)
+            get_journal_store().append(entry, get_journal_user_id())
+            record_journal_entry(entry_date)
             st.success("Journal entry saved!")
             
             # Show mood feedback
@@ -347,13 +336,19 @@ def show_journal_entry_form():
                 - Consider scheduling an extra therapy session
                 """)
 
-def show_journal_history(journal_entries):
-    """Display journal history with detailed analysis"""
+def show_journal_history(store: JournalStore, user_id: str):
+    """Display one page of journal history with detailed analysis"""
     st.markdown("### Journal History")
     
+    total_entries = store.count(user_id)
+    page_count = max(1, -(-total_entries // HISTORY_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1,
+                           key="journal_history_page")
+    st.caption(f"{total_entries} entries, page {page} of {page_count}")
+    
     # Group entries by date
     entries_by_date = {}
-    for entry in reversed(journal_entries):
+    for entry in store.page(HISTORY_PAGE_SIZE, (page - 1) * HISTORY_PAGE_SIZE, user_id):
         date = entry['date']
         if date not in entries_by_date:
             entries_by_date[date] = []
@@ -363,34 +358,134 @@ def show_journal_history(journal_entries):
     for date, entries in entries_by_date.items():
         st.markdown(f"#### {date}")
         for entry in entries:
-            st.markdown(f"**Time:** {entry['time']}")
-            st.write(entry['text'])
-            
-            # Show sentiment analysis
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.progress(entry['sentiment']['score'])
-                st.write(f"Emotions detected: {', '.join(entry['sentiment']['emotions'])}")
-            with col2:
-                st.write(f"Mood: {entry['sentiment']['label']}")
-                if entry['sentiment']['risk_level'] != 'none':
-                    st.warning(f"Risk Level: {entry['sentiment']['risk_level']}")
+            show_journal_entry(entry)
+
+def show_journal_entry(entry: Dict):
+    """Display one journal entry with its analysis"""
+    st.markdown(f"**Time:** {entry['time']}")
+    st.write(entry['text'])
+    
+    # Show sentiment analysis
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.progress(entry['sentiment']['score'])
+        st.write(f"Emotions detected: {', '.join(entry['sentiment']['emotions'])}")
+    with col2:
+        st.write(f"Mood: {entry['sentiment']['label']}")
+        if entry['sentiment']['risk_level'] != 'none':
+            st.warning(f"Risk Level: {entry['sentiment']['risk_level']}")
+    
+    # Show analysis details
+    with st.expander("Analysis Details"):
+        st.write("**Analysis:**", entry['details'].get('reasoning', ''))
+        st.write("**Suggestions:**")
+        for suggestion in entry['details'].get('suggestions', []):
+            st.write(f"• {suggestion}")
+    
+    st.markdown("---")
+
+def show_journal_import_export(store: JournalStore, user_id: str):
+    """Import a journal from another app, or export this one, as JSONL or CSV"""
+    with st.expander("📦 Import / Export Journal"):
+        uploaded = st.file_uploader(
+            "Import entries",
+            type=["jsonl", "ndjson", "csv"],
+            help="JSONL with one entry per line, or CSV with date, time and text columns. "
+                 "Entries without an analysis are analyzed as they are imported.",
+            key="journal_import_file"
+        )
+        reanalyze = st.checkbox("Re-analyze entries analyzed by another version of the analyzer",
+                                key="journal_import_reanalyze")
+        if uploaded is not None and st.button("Import", key="journal_import_button"):
+            progress_bar = st.progress(0.0, text="Importing...")
             
-            # Show analysis details
-            with st.expander("Analysis Details"):
-                st.write("**Analysis:**", entry['details']['reasoning'])
-                st.write("**Suggestions:**")
-                for suggestion in entry['details']['suggestions']:
-                    st.write(f"• {suggestion}")
+            def report_progress(progress: ImportProgress):
+                fraction = min(progress.bytes_read / uploaded.size, 1.0) if uploaded.size else 1.0
+                progress_bar.progress(fraction, text=f"Imported {progress.imported} entries...")
             
-            st.markdown("---")
+            try:
+                report = import_journal(uploaded, journal_format(uploaded.name), store,
+                                        get_sentiment_analyzer(), user_id=user_id, reanalyze=reanalyze,
+                                        progress=report_progress)
+            except JournalImportError as e:
+                progress_bar.empty()
+                st.error(str(e))
+            else:
+                progress_bar.progress(1.0, text="Import finished")
+                # The calendar's journal counts are rebuilt from the store on next use
+                st.session_state.pop('date_index', None)
+                st.success(f"Imported {report.imported} entries")
+                if report.analysis_failures:
+                    st.warning(f"{report.analysis_failures} entries could not be analyzed and were saved as neutral")
+                if report.skipped:
+                    st.warning(f"Skipped {report.skipped} row(s):\n\n" +
+                               "\n".join(f"- {error}" for error in report.errors))
+        
+        export_format = st.radio("Export format", JOURNAL_FORMATS, horizontal=True,
+                                 key="journal_export_format")
+        # The export is only written when the button is clicked, straight from the store
+        st.download_button(
+            "Download journal",
+            data=lambda: export_journal_file(store, export_format, user_id),
+            file_name=f"mariposa-journal.{export_format}",
+            mime="application/jsonl" if export_format == "jsonl" else "text/csv",
+            key="journal_export_button"
+        )
+
+def show_journal_search(store: JournalStore, user_id: str):
+    """Search past entries by words, phrases, emotions, risk level and date"""
+    st.markdown("### Search Your Journal")
+    query = st.text_input(
+        "Search",
+        key="journal_search_query",
+        help='All words must appear. Use "quotes" for a phrase, OR for alternatives, '
+             '-word to exclude a word and word* to match its beginning.'
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        emotions = st.multiselect("Emotions", list(store.emotion_counts(user_id)), key="journal_search_emotions")
+    with col2:
+        risk_levels = st.multiselect("Risk level", ["high", "medium", "low", "none"],
+                                     key="journal_search_risk")
+    date_range = st.date_input("Between", value=(), key="journal_search_dates")
+    
+    if not (query.strip() or emotions or risk_levels or date_range):
+        return
+    
+    start = date_range[0] if date_range else None
+    end = date_range[1] if len(date_range) > 1 else start
+    page = st.session_state.get("journal_search_page", 1)
+    try:
+        results = store.search(query, user_id, emotions=emotions, risk_levels=risk_levels, start=start, end=end,
+                               limit=HISTORY_PAGE_SIZE, offset=(page - 1) * HISTORY_PAGE_SIZE)
+    except JournalQueryError as e:
+        st.warning(str(e))
+        return
+    
+    if not results.total:
+        st.info("No journal entries match your search.")
+        return
+    
+    page_count = max(1, -(-results.total // HISTORY_PAGE_SIZE))
+    if page > page_count:
+        # The filters changed under a later page; start again from the first
+        page = st.session_state.journal_search_page = 1
+        results = store.search(query, user_id, emotions=emotions, risk_levels=risk_levels, start=start, end=end,
+                               limit=HISTORY_PAGE_SIZE)
+    st.number_input("Results page", min_value=1, max_value=page_count, step=1, key="journal_search_page")
+    st.caption(f"{results.total} matching entries, page {page} of {page_count}")
+    
+    for entry in results.entries:
+        st.markdown(f"#### {entry['date']}")
+        if entry.get('snippet'):
+            st.markdown(f"> {entry['snippet']}")
+        show_journal_entry(entry)
 
 def main():
     st.title("🗓️ Therapy Calendar & Journal")
     
-    # Get session state for journal entries
-    if 'journal_entries' not in st.session_state:
-        st.session_state.journal_entries = []
+    journal_store = get_journal_store()
+    user_id = get_journal_user_id()
     
     # Create tabs
     calendar_tab, journal_tab, progress_tab = st.tabs(["Calendar", "Journal", "Progress"])
@@ -438,9 +533,11 @@ def main():
                     "date": entry_date.strftime("%Y-%m-%d"),
                     "time": entry_time.strftime("%H:%M"),
                     "sentiment": analysis["sentiment"],
-                    "details": analysis["details"]
+                    "details": analysis["details"],
+                    "analyzer_version": analysis["analyzer_version"]
                 }
-                st.session_state.journal_entries.append(entry)
+                journal_store.append(entry, user_id)
+                record_journal_entry(entry_date)
                 st.success("Journal entry saved!")
                 
                 # Provide feedback based on analysis
@@ -452,14 +549,19 @@ def main():
                     - Reach out to your support network
                     - Consider scheduling an extra therapy session
                     """)
+        
+        show_journal_import_export(journal_store, user_id)
+        
+        if journal_store.count(user_id):
+            show_journal_search(journal_store, user_id)
     
     with progress_tab:
         st.markdown("### Your Progress")
-        show_progress_charts(st.session_state.journal_entries)
+        show_progress_charts(journal_store, user_id)
         
         # Show detailed journal history
-        if st.session_state.journal_entries:
-            show_journal_history(st.session_state.journal_entries)
+        if journal_store.count(user_id):
+            show_journal_history(journal_store, user_id)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Run the benchmark suite
+
+    python -m benchmarks                                  # run and print a summary
+    python -m benchmarks --output results.json            # also write machine-readable results
+    python -m benchmarks --save-baseline                  # record benchmarks/baseline.json
+    python -m benchmarks --fail-on-regression             # exit 1 if any p50 regressed
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks import inputs
+from benchmarks.harness import compare_to_baseline, run_benchmark
+from benchmarks.suite import default_suite
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for Mariposa's hot paths")
+    parser.add_argument("-k", "--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--iterations", type=int, help="override every benchmark's iteration count")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="p50 slowdown allowed before a benchmark counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Data files are read relative to the repository root
+    os.chdir(REPO_ROOT)
+
+    benchmarks = [benchmark for benchmark in default_suite()
+                  if not args.filter or args.filter in benchmark.name]
+    results = []
+    print(f"{'benchmark':<44} {'ops/sec':>10} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, args.iterations)
+        results.append(result)
+        print(f"{result.name:<44} {result.ops_per_sec:>10.1f} {result.p50_us:>10.1f} "
+              f"{result.p99_us:>10.1f} {result.peak_memory_kib:>10.1f}")
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": inputs.SEED
+        },
+        "results": [result._asdict() for result in results]
+    }
+
+    regressed = False
+    if args.baseline.exists() and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = {result["name"]: result for result in json.load(f)["results"]}
+        comparisons = compare_to_baseline(results, baseline, args.tolerance)
+        report["comparison"] = comparisons
+        print(f"\nCompared with {args.baseline}:")
+        for comparison in comparisons:
+            ratio = comparison["p50_ratio"]
+            ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+            print(f"{comparison['name']:<44} {ratio_text:>8}  {comparison['status']}")
+        regressed = any(comparison["status"] == "regression" for comparison in comparisons)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Timing, memory and baseline comparison for the benchmark suite"""
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class Benchmark(NamedTuple):
+    """A named workload; ``setup`` builds its inputs and returns the callable to time
+
+    Calls that take well under a microsecond are timed ``batch`` at a time, so
+    timer resolution does not dominate; results are always per call.
+    """
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    iterations: int = 200
+    warmup: int = 10
+    batch: int = 1
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    iterations: int
+    ops_per_sec: float
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    peak_memory_kib: float
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def run_benchmark(benchmark: Benchmark, iterations: Optional[int] = None) -> BenchmarkResult:
+    """Time each call separately, then measure peak allocation on one extra traced call"""
+    func = benchmark.setup()
+    iterations = iterations or benchmark.iterations
+
+    for _ in range(benchmark.warmup):
+        func()
+
+    batch = range(benchmark.batch)
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            for _ in batch:
+                func()
+            samples.append((time.perf_counter_ns() - start) / 1000 / benchmark.batch)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Tracing slows every allocation down, so it never overlaps the timed calls
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    total_us = sum(samples)
+    return BenchmarkResult(
+        name=benchmark.name,
+        iterations=iterations,
+        ops_per_sec=iterations / (total_us / 1_000_000) if total_us else float("inf"),
+        mean_us=total_us / iterations,
+        p50_us=percentile(samples, 0.50),
+        p99_us=percentile(samples, 0.99),
+        peak_memory_kib=peak / 1024
+    )
+
+
+def compare_to_baseline(results: List[BenchmarkResult],
+                        baseline: Dict[str, Dict],
+                        tolerance: float = 0.25) -> List[Dict]:
+    """Relate each result to the saved baseline by p50 latency
+
+    A benchmark counts as a regression when its p50 grew by more than
+    ``tolerance`` (0.25 means 25% slower). Benchmarks missing from the
+    baseline are reported with no ratio.
+    """
+    comparisons = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            comparisons.append({"name": result.name, "status": "new", "p50_ratio": None})
+            continue
+        ratio = result.p50_us / previous["p50_us"] if previous["p50_us"] else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparisons.append({
+            "name": result.name,
+            "status": status,
+            "p50_ratio": ratio,
+            "baseline_p50_us": previous["p50_us"],
+            "p50_us": result.p50_us
+        })
+    return comparisons
@@ -0,0 +1,94 @@
+"""Seeded synthetic inputs, so every run measures the same workload"""
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+SEED = 1729
+
+# Everyday journal vocabulary mixed with the emotion and risk keywords the analyzer looks for
+JOURNAL_WORDS = (
+    "today work family friend sleep walk morning evening coffee meeting call dinner "
+    "weekend tired busy quiet long short good bad great awful fine okay better worse "
+    "happy sad angry anxious worried scared calm excited grateful lonely hopeful "
+    "stressed overwhelmed nervous proud relieved frustrated content peaceful"
+).split()
+
+FILLER_WORDS = (
+    "i have been feeling lately and it makes me really very often when at night "
+    "during the day around other people my with about most of time"
+).split()
+
+SYMPTOM_PHRASES = (
+    "i feel sad most of the day",
+    "i worry constantly about everything",
+    "my heart races and i can't breathe",
+    "i avoid social situations because people judge me",
+    "i can't sleep and feel tired all the time",
+    "i lost interest in things i used to enjoy",
+    "i feel restless and on edge",
+    "sudden panic attacks with chest pain",
+    "i feel worthless and hopeless",
+    "hard to concentrate at work"
+)
+
+
+def journal_texts(count: int, words_per_text: int, seed: int = SEED) -> List[str]:
+    rng = random.Random(seed)
+    vocabulary = JOURNAL_WORDS + FILLER_WORDS
+    return [" ".join(rng.choices(vocabulary, k=words_per_text)).capitalize() + "."
+            for _ in range(count)]
+
+
+def symptom_texts(count: int, dsm5_data: Dict, seed: int = SEED) -> List[str]:
+    """Symptom descriptions mixing DSM-5 criteria with free-text phrasing and filler"""
+    rng = random.Random(seed)
+    criteria = [criterion for data in dsm5_data.values() for criterion in data["diagnostic_criteria"]]
+    texts = []
+    for _ in range(count):
+        parts = rng.sample(criteria, k=min(2, len(criteria))) if criteria else []
+        parts += rng.sample(SYMPTOM_PHRASES, k=2)
+        parts.append(" ".join(rng.choices(FILLER_WORDS, k=8)))
+        rng.shuffle(parts)
+        texts.append(". ".join(parts))
+    return texts
+
+
+def condition_catalog(count: int, terms_per_condition: int = 60, vocabulary_size: int = 20000,
+                      seed: int = SEED) -> Tuple[List[str], List[str]]:
+    """(condition names, criteria texts) for a synthetic catalog the size of a full diagnostic manual"""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(vocabulary_size)] + list(JOURNAL_WORDS)
+    names = [f"condition_{i}" for i in range(count)]
+    texts = [" ".join(rng.choices(vocabulary, k=terms_per_condition)) for _ in range(count)]
+    return names, texts
+
+
+def technique_names(count: int, known_names: List[str], seed: int = SEED) -> List[str]:
+    """Mostly catalog names, with one lookup in ten missing the catalog"""
+    rng = random.Random(seed)
+    return [rng.choice(known_names) if rng.random() < 0.9 else f"Unknown Technique {rng.randrange(100)}"
+            for _ in range(count)]
+
+
+def journal_entries(count: int, days: int, seed: int = SEED) -> List[Dict]:
+    """Analyzed journal entries spread over ``days`` days, in the shape JournalStore stores"""
+    rng = random.Random(seed)
+    first_day = date(2024, 1, 1)
+    emotions = ["joy", "sadness", "anger", "fear", "anxiety", "neutral"]
+    risk_levels = ["none", "none", "none", "low", "medium", "high"]
+    entries = []
+    for text in journal_texts(count, 40, seed):
+        score = rng.random()
+        entries.append({
+            "date": first_day + timedelta(days=rng.randrange(days)),
+            "time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+            "text": text,
+            "sentiment": {
+                "score": score,
+                "label": "POSITIVE" if score > 0.6 else "NEGATIVE" if score < 0.4 else "NEUTRAL",
+                "emotions": rng.sample(emotions, k=rng.randint(1, 2)),
+                "risk_level": rng.choice(risk_levels)
+            },
+            "details": {"reasoning": "", "suggestions": []}
+        })
+    return entries
@@ -0,0 +1,147 @@
+"""The benchmarked hot paths
+
+Each setup function builds its service and seeded inputs outside the timed
+region and returns a zero-argument callable that handles one input per call.
+"""
+import logging
+import tempfile
+from datetime import datetime
+from itertools import cycle
+from pathlib import Path
+from typing import List
+
+from app.core.models.schemas import PatientInput, Schedule
+from app.core.models.severity_level import SeverityLevel
+from benchmarks import inputs
+from benchmarks.harness import Benchmark
+
+# Fixed start date so every run generates the same calendar
+SCHEDULE_START = datetime(2024, 1, 1, 9, 0)
+
+
+def _bench_analyze_symptoms():
+    from app.core.services.research_service import ResearchService
+
+    service = ResearchService()
+    texts = cycle(inputs.symptom_texts(500, service.dsm5_data))
+    return lambda: service.analyze_symptoms(next(texts))
+
+
+def _bench_retrieve_conditions(count: int, top_k: int):
+    def setup():
+        from app.core.services.condition_retriever import ConditionRetriever
+
+        names, criteria = inputs.condition_catalog(count)
+        retriever = ConditionRetriever(names, criteria)
+        # Queries drawn from the same vocabulary, so each one hits real posting lists
+        queries = cycle(text[:len(text) // 2] for text in inputs.condition_catalog(200, seed=inputs.SEED + 1)[1])
+        return lambda: retriever.search(next(queries), threshold=0.05, top_k=top_k)
+    return setup
+
+
+def _bench_generate_therapy_plan(severity: SeverityLevel):
+    def setup():
+        from app.core.services.plan_service import TherapyPlanGenerator
+
+        # Outside `streamlit run` every session_state write logs a warning; keep the output readable
+        for name in ("streamlit.runtime.scriptrunner_utils.script_run_context",
+                     "streamlit.runtime.state.session_state_proxy"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        generator = TherapyPlanGenerator()
+        patients = cycle([
+            PatientInput(symptoms=text, severity=severity, schedule=Schedule(availability=[]))
+            for text in inputs.symptom_texts(200, generator.research_service.dsm5_data)
+        ])
+        return lambda: generator.generate_therapy_plan(next(patients))
+    return setup
+
+
+def _bench_generate_weekly_schedule(severity: SeverityLevel):
+    def setup():
+        from app.core.services.calendar_planner import TherapyCalendarPlanner
+
+        planner = TherapyCalendarPlanner()
+        techniques = ["Cognitive Restructuring", "Mindfulness Meditation",
+                      "Behavioral Activation", "Gradual Exposure Therapy"]
+        return lambda: planner.generate_weekly_schedule(
+            therapy_type="cbt",
+            session_frequency="twice-weekly",
+            techniques=techniques,
+            severity=severity,
+            start_date=SCHEDULE_START
+        )
+    return setup
+
+
+def _bench_get_technique_info():
+    from app.core.services.technique_database import TechniqueDatabase
+
+    database = TechniqueDatabase()
+    names = cycle(inputs.technique_names(1000, list(database.catalog.by_name)))
+    return lambda: database.get_technique_info(next(names))
+
+
+def _bench_sentiment(words_per_text: int, cached: bool = False):
+    def setup():
+        from app.core.services.analysis_cache import AnalysisCache
+        from app.core.services.sentiment_analyzer import SentimentAnalyzer
+
+        # The inputs repeat, so uncached runs turn the cache off; otherwise every lap after the first would hit
+        analyzer = SentimentAnalyzer(cache=AnalysisCache() if cached else AnalysisCache(max_entries=0))
+        texts = cycle(inputs.journal_texts(200, words_per_text))
+        if cached:
+            for _ in range(200):
+                analyzer.analyze(next(texts))
+        return lambda: analyzer.analyze(next(texts))
+    return setup
+
+
+def _bench_progress_series():
+    from app.core.services.journal_store import JournalStore
+    from app.core.services.progress_service import build_progress_series
+
+    # The store outlives setup; the temporary directory goes when the process exits
+    directory = tempfile.mkdtemp(prefix="mariposa-bench-")
+    store = JournalStore(Path(directory) / "journal.db")
+    for entry in inputs.journal_entries(5000, days=365):
+        store.append(entry)
+    return lambda: build_progress_series(store)
+
+
+def _bench_journal_search():
+    from app.core.services.journal_store import JournalStore
+
+    directory = tempfile.mkdtemp(prefix="mariposa-bench-")
+    store = JournalStore(Path(directory) / "journal.db")
+    for entry in inputs.journal_entries(5000, days=365):
+        store.append(entry)
+    searches = cycle([
+        {"query": "lonely"},
+        {"query": '"feeling sad" OR hopeless'},
+        {"query": "anxious -work", "start": "2024-03-01", "end": "2024-05-31"},
+        {"query": "tired", "risk_levels": ["medium", "high"]},
+        {"emotions": ["fear", "anxiety"]},
+    ])
+    return lambda: store.search(limit=20, **next(searches))
+
+
+def default_suite() -> List[Benchmark]:
+    severities = list(SeverityLevel)
+    return [
+        Benchmark("research.analyze_symptoms", _bench_analyze_symptoms, iterations=500),
+        Benchmark("retrieval.search[10k]", _bench_retrieve_conditions(10000, top_k=10), iterations=500),
+        *[Benchmark(f"plan.generate_therapy_plan[{severity.value}]",
+                    _bench_generate_therapy_plan(severity), iterations=200)
+          for severity in severities],
+        *[Benchmark(f"schedule.generate_weekly_schedule[{severity.value}]",
+                    _bench_generate_weekly_schedule(severity), iterations=200)
+          for severity in severities],
+        Benchmark("techniques.get_technique_info", _bench_get_technique_info,
+                  iterations=1000, batch=100),
+        Benchmark("sentiment.analyze[short]", _bench_sentiment(12), iterations=1000),
+        Benchmark("sentiment.analyze[long]", _bench_sentiment(400), iterations=200),
+        Benchmark("sentiment.analyze[long, cached]", _bench_sentiment(400, cached=True), iterations=1000),
+        Benchmark("progress.build_progress_series", _bench_progress_series, iterations=200),
+        Benchmark("journal.search", _bench_journal_search, iterations=200),
+    ]
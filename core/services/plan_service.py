@@ -1,20 +1,48 @@
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from core.models.schemas import PatientInput, TherapyPlan
 from core.services.research_service import ResearchService
+from app.core.services.knowledge_base import KNOWLEDGE_BASE_FILES, knowledge_base_version
+from app.core.services.plan_cache import PlanCache
+from app.core.utils.metrics import metrics
 
 class TherapyPlanGenerator:
-    def __init__(self):
+    def __init__(self, plan_cache: Optional[PlanCache] = None, kb_version: Optional[str] = None):
         self.research_service = ResearchService()
         self.disorders = self._load_disorders()
+        self.plan_cache = plan_cache
+        # Version of the data this generator was built from; plans are cached under it
+        self.kb_version = kb_version
+        if plan_cache is not None and kb_version is not None:
+            # Requests still on an older generator stop using the cache from here on
+            plan_cache.advance(kb_version)
 
     def _load_disorders(self) -> Dict:
         with open('data/mock/disorders.json', 'r') as f:
             return json.load(f)
 
     def generate_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
+        try:
+            with metrics.span("mariposa_plan_generation_seconds"):
+                return self._generate_therapy_plan(patient_input)
+        except Exception as e:
+            metrics.inc("mariposa_plan_errors_total", error=type(e).__name__)
+            raise
+
+    def _generate_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
+        if self.plan_cache is None:
+            return self._build_therapy_plan(patient_input)
+        return self.plan_cache.get_or_compute(
+            patient_input.symptoms,
+            patient_input.severity.value,
+            self.kb_version or knowledge_base_version(KNOWLEDGE_BASE_FILES),
+            lambda: self._build_therapy_plan(patient_input)
+        )
+
+    def _build_therapy_plan(self, patient_input: PatientInput) -> TherapyPlan:
         # Analyze symptoms to identify possible conditions
-        condition_matches = self.research_service.analyze_symptoms(patient_input.symptoms)
+        with metrics.span("mariposa_plan_stage_seconds", stage="symptom_matching"):
+            condition_matches = self.research_service.analyze_symptoms(patient_input.symptoms)
         
         # Get the most likely condition
         if not condition_matches:
@@ -28,11 +56,14 @@ class TherapyPlanGenerator:
         primary_condition = identified_conditions[0]
         
         # Get DSM-5 info for primary condition
-        dsm5_info = self.research_service.get_dsm5_criteria(primary_condition)
+        with metrics.span("mariposa_plan_stage_seconds", stage="dsm5_lookup"):
+            dsm5_info = self.research_service.get_dsm5_criteria(primary_condition)
         
         # Get research articles for the condition
-        articles = self.research_service.get_scholarly_articles(primary_condition)
-        treatment_analysis = self.research_service.analyze_treatment_effectiveness(articles)
+        with metrics.span("mariposa_plan_stage_seconds", stage="article_retrieval"):
+            articles = self.research_service.get_scholarly_articles(primary_condition)
+        with metrics.span("mariposa_plan_stage_seconds", stage="treatment_analysis"):
+            treatment_analysis = self.research_service.analyze_treatment_effectiveness(articles)
 
         # Determine therapy type based on research
         therapy_types = list(treatment_analysis.keys())
@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PATTERN = re.compile(r"[^a-z0-9_-]+")
+
+
+class ArticleFetcher(ABC):
+    """Source of research articles behind the cache; ``fetch`` may block on the network"""
+
+    @abstractmethod
+    def fetch(self, disorder: str, max_results: int) -> List[Dict]:
+        ...
+
+
+class ScholarlyFetcher(ArticleFetcher):
+    """Searches Google Scholar through the ``scholarly`` package"""
+
+    def fetch(self, disorder: str, max_results: int) -> List[Dict]:
+        # Imported on first use; only the network path needs it
+        from scholarly import scholarly
+
+        query = f"treatment therapy {disorder} clinical effectiveness"
+        articles = []
+        for pub in scholarly.search_pubs(query):
+            bib = pub.get('bib', {})
+            author = bib.get('author', '')
+            articles.append({
+                'title': bib.get('title', ''),
+                'author': ", ".join(author) if isinstance(author, list) else author,
+                'year': str(bib.get('pub_year', '')),
+                'abstract': bib.get('abstract', ''),
+                'url': pub.get('pub_url', '')
+            })
+            if len(articles) >= max_results:
+                break
+        return articles
+
+
+class LocalArticleFetcher(ArticleFetcher):
+    """Serves the bundled article corpus; stands in for the network in tests and offline runs"""
+
+    def __init__(self, research_db=None):
+        from app.core.services.research_database import ResearchDatabase
+        self.research_db = research_db or ResearchDatabase()
+
+    def fetch(self, disorder: str, max_results: int) -> List[Dict]:
+        return self.research_db.get_articles(disorder)[:max_results]
+
+
+def article_fetcher_from_env() -> ArticleFetcher:
+    """MARIPOSA_RESEARCH_FETCHER=local serves the bundled corpus instead of Google Scholar"""
+    source = os.environ.get("MARIPOSA_RESEARCH_FETCHER", "scholarly")
+    if source == "scholarly":
+        return ScholarlyFetcher()
+    if source == "local":
+        return LocalArticleFetcher()
+    raise ValueError(f"Unknown research fetcher: {source}")
+
+
+class CachedArticles(NamedTuple):
+    fetched_at: float
+    max_results: int
+    articles: List[Dict]
+
+
+class TieredResearchCache:
+    """In-memory LRU in front of a JSON file cache, in front of an ArticleFetcher
+
+    Entries younger than ``ttl_seconds`` are served as they are. Older ones,
+    up to ``stale_ttl_seconds``, are still served, while a background refresh
+    replaces them (stale-while-revalidate). Anything older, or missing, is
+    fetched on the caller's thread. Concurrent misses for the same disorder
+    share a single fetch. If a fetch fails, any cached copy is served,
+    however old; the error propagates only when nothing is cached.
+
+    Disk writes go to a temporary file that is renamed into place, so readers
+    never see a partial file. De-duplication is per process; worker processes
+    share the disk tier only.
+    """
+
+    def __init__(self,
+                 fetcher: ArticleFetcher,
+                 cache_dir: Path = Path("data/cache"),
+                 memory_entries: int = 256,
+                 ttl_seconds: float = 24 * 3600,
+                 stale_ttl_seconds: float = 7 * 24 * 3600,
+                 clock: Callable[[], float] = time.time):
+        self.fetcher = fetcher
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = memory_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = max(stale_ttl_seconds, ttl_seconds)
+        self.clock = clock
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.shared_fetches = 0
+        self._memory: "OrderedDict[str, CachedArticles]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, fetcher: ArticleFetcher, cache_dir: Path = Path("data/cache")) -> "TieredResearchCache":
+        """TTLs from MARIPOSA_RESEARCH_CACHE_TTL / MARIPOSA_RESEARCH_CACHE_STALE_TTL (seconds)"""
+        return cls(
+            fetcher,
+            cache_dir=cache_dir,
+            ttl_seconds=float(os.environ.get("MARIPOSA_RESEARCH_CACHE_TTL", 24 * 3600)),
+            stale_ttl_seconds=float(os.environ.get("MARIPOSA_RESEARCH_CACHE_STALE_TTL", 7 * 24 * 3600))
+        )
+
+    def get(self, disorder: str, max_results: int = 5) -> List[Dict]:
+        key = CACHE_KEY_PATTERN.sub("_", disorder.lower())
+        cached = self._read_memory(key) or self._read_disk(key)
+        if cached is not None and cached.max_results >= max_results:
+            age = self.clock() - cached.fetched_at
+            if age < self.ttl_seconds:
+                return cached.articles[:max_results]
+            if age < self.stale_ttl_seconds:
+                with self._lock:
+                    self.stale_hits += 1
+                self._refresh_in_background(key, disorder, max_results)
+                return cached.articles[:max_results]
+
+        try:
+            return self._fetch_once(key, disorder, max_results).articles[:max_results]
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning("Refreshing research articles for %s failed, serving cached copy: %s", disorder, e)
+            return cached.articles[:max_results]
+
+    def invalidate(self, disorder: Optional[str] = None):
+        """Forget one disorder (or everything) in both tiers"""
+        with self._lock:
+            if disorder is None:
+                keys = list(self._memory)
+                self._memory.clear()
+            else:
+                keys = [CACHE_KEY_PATTERN.sub("_", disorder.lower())]
+                for key in keys:
+                    self._memory.pop(key, None)
+        paths = self.cache_dir.glob("*_research.json") if disorder is None else \
+            [self._disk_path(key) for key in keys]
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self):
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=True)
+            self._refresher = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "memory_size": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "fetches": self.fetches,
+                "shared_fetches": self.shared_fetches,
+                "fetch_errors": self.fetch_errors,
+                "in_flight": len(self._in_flight)
+            }
+
+    def _is_fresh(self, cached: Optional[CachedArticles], max_results: int) -> bool:
+        return (cached is not None and cached.max_results >= max_results
+                and self.clock() - cached.fetched_at < self.ttl_seconds)
+
+    def _read_memory(self, key: str) -> Optional[CachedArticles]:
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return cached
+
+    def _remember(self, key: str, cached: CachedArticles):
+        with self._lock:
+            self._memory[key] = cached
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}_research.json"
+
+    def _read_disk(self, key: str) -> Optional[CachedArticles]:
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r') as f:
+                payload = json.load(f)
+            if isinstance(payload, list):
+                # Written before entries carried a timestamp; age it by the file instead
+                cached = CachedArticles(path.stat().st_mtime, len(payload), payload)
+            else:
+                cached = CachedArticles(payload["fetched_at"], payload["max_results"], payload["articles"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable research cache file %s", path)
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, cached)
+        return cached
+
+    def _write_disk(self, key: str, cached: CachedArticles):
+        payload = {"fetched_at": cached.fetched_at, "max_results": cached.max_results,
+                   "articles": cached.articles}
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            logger.exception("Could not write research cache file for %s", key)
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError:
+            logger.exception("Could not write research cache file for %s", key)
+            with suppress(OSError):
+                os.unlink(temp_path)
+
+    def _fetch_once(self, key: str, disorder: str, max_results: int) -> CachedArticles:
+        """Fetch unless another thread already is, in which case wait for its result"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.shared_fetches += 1
+
+        if not leader:
+            cached = future.result()
+            if cached.max_results >= max_results:
+                return cached
+            # The shared fetch asked for fewer articles than this caller needs
+            return self._fetch_once(key, disorder, max_results)
+
+        try:
+            # Another process may have refreshed the shared disk tier already
+            cached = self._read_disk(key)
+            if not self._is_fresh(cached, max_results):
+                articles = self.fetcher.fetch(disorder, max_results)
+                cached = CachedArticles(self.clock(), max_results, articles)
+                self._remember(key, cached)
+                self._write_disk(key, cached)
+                with self._lock:
+                    self.fetches += 1
+            future.set_result(cached)
+            return cached
+        except BaseException as e:
+            with self._lock:
+                self.fetch_errors += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _refresh_in_background(self, key: str, disorder: str, max_results: int):
+        with self._lock:
+            if key in self._in_flight:
+                return
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="research-refresh")
+            refresher = self._refresher
+        refresher.submit(self._refresh, key, disorder, max_results)
+
+    def _refresh(self, key: str, disorder: str, max_results: int):
+        try:
+            self._fetch_once(key, disorder, max_results)
+        except Exception:
+            logger.exception("Background refresh of research articles for %s failed", disorder)
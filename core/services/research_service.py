@@ -1,18 +1,22 @@
-import scholarly
 import json
 import os
-from typing import List, Dict, Tuple
-import pandas as pd
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from app.core.services.condition_retriever import ConditionRetriever
+from core.services.research_cache import TieredResearchCache, article_fetcher_from_env
 
 class ResearchService:
-    def __init__(self):
+    similarity_threshold = 0.1
+
+    def __init__(self, article_cache: Optional[TieredResearchCache] = None):
         self.dsm5_data = self._load_dsm5_data()
         self.cache_dir = Path("data/cache")
-        self.cache_dir.mkdir(exist_ok=True)
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.article_cache = article_cache or TieredResearchCache.from_env(
+            article_fetcher_from_env(), cache_dir=self.cache_dir
+        )
+        self.retriever = self._build_condition_index()
+        self.conditions = self.retriever.conditions
 
     def _load_dsm5_data(self) -> Dict:
         """Load DSM-5 criteria and treatments from JSON file"""
@@ -22,38 +26,21 @@ class ResearchService:
                 return json.load(f)
         return {}
 
-    def get_scholarly_articles(self, disorder: str, max_results: int = 5) -> List[Dict]:
-        """Fetch relevant research papers from Google Scholar"""
-        cache_file = self.cache_dir / f"{disorder.lower()}_research.json"
-        
-        # Check cache first
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+    def _build_condition_index(self) -> ConditionRetriever:
+        """Index the DSM-5 criteria once for top-k retrieval"""
+        conditions = []
+        criteria_texts = []
 
-        # Search query construction
-        query = f"treatment therapy {disorder} clinical effectiveness"
-        search_query = scholarly.search_pubs(query)
-        
-        articles = []
-        try:
-            for i in range(max_results):
-                pub = next(search_query)
-                articles.append({
-                    'title': pub.bib.get('title', ''),
-                    'author': pub.bib.get('author', ''),
-                    'year': pub.bib.get('year', ''),
-                    'abstract': pub.bib.get('abstract', ''),
-                    'url': pub.bib.get('url', '')
-                })
-        except StopIteration:
-            pass
+        for condition, data in self.dsm5_data.items():
+            conditions.append(condition)
+            criteria_text = " ".join(data["diagnostic_criteria"])
+            criteria_texts.append(criteria_text)
 
-        # Cache the results
-        with open(cache_file, 'w') as f:
-            json.dump(articles, f)
+        return ConditionRetriever.from_env(conditions, criteria_texts)
 
-        return articles
+    def get_scholarly_articles(self, disorder: str, max_results: int = 5) -> List[Dict]:
+        """Fetch relevant research papers, served from the tiered cache when possible"""
+        return self.article_cache.get(disorder, max_results)
 
     def get_dsm5_criteria(self, disorder: str) -> Dict:
         """Get DSM-5 criteria and recommended treatments for a disorder"""
@@ -81,30 +68,35 @@ class ResearchService:
 
         return treatments 
 
-    def analyze_symptoms(self, symptoms: str) -> List[Tuple[str, float]]:
-        """Analyze symptoms and match with possible conditions"""
-        # Prepare DSM-5 criteria for comparison
-        conditions = []
-        criteria_texts = []
-        
-        for condition, data in self.dsm5_data.items():
-            conditions.append(condition)
-            criteria_text = " ".join(data["diagnostic_criteria"])
-            criteria_texts.append(criteria_text)
+    def analyze_symptoms(self, symptoms: str, threshold: Optional[float] = None,
+                         top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Analyze symptoms and match with possible conditions, best first
 
-        # Add symptoms to the comparison
-        all_texts = criteria_texts + [symptoms]
-        tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-        
-        # Calculate similarity scores
-        similarities = cosine_similarity(tfidf_matrix[-1:], tfidf_matrix[:-1])[0]
-        
-        # Pair conditions with their similarity scores
-        condition_scores = list(zip(conditions, similarities))
-        
-        # Sort by similarity score and filter those above threshold
-        threshold = 0.1
-        relevant_conditions = [(cond, score) for cond, score in condition_scores if score > threshold]
-        relevant_conditions.sort(key=lambda x: x[1], reverse=True)
-        
-        return relevant_conditions 
\ No newline at end of file
+        Conditions must score above ``threshold`` (the service's
+        similarity_threshold by default); ``top_k`` caps how many are returned.
+        """
+        if threshold is None:
+            threshold = self.similarity_threshold
+        return self.retriever.search(symptoms, threshold, top_k)
+
+    def analyze_symptoms_batch(self,
+                               symptom_texts: Iterable[str],
+                               top_k: Optional[int] = None,
+                               threshold: Optional[float] = None,
+                               chunk_size: int = 1000) -> Iterator[List[Tuple[str, float]]]:
+        """Match many symptom descriptions at once, yielding one ranked list per input in order
+
+        Inputs are consumed ``chunk_size`` at a time and each chunk is scored with a
+        single sparse matrix product, so memory stays bounded however many texts are fed in.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if threshold is None:
+            threshold = self.similarity_threshold
+
+        texts = iter(symptom_texts)
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                return
+            yield from self.retriever.search_many(chunk, threshold, top_k)
@@ -11,6 +11,9 @@ setup(
         "scikit-learn",
         "plotly",
         "pydantic",
-        "nltk"
+        "nltk",
+        "fastapi",
+        "uvicorn",
+        "scholarly"
     ],
 ) 
\ No newline at end of file
@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.core.services.journal_store import JournalStore
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    """Services read the bundled data files by path relative to the repository root"""
+    monkeypatch.chdir(REPO_ROOT)
+
+
+@pytest.fixture
+def make_entry():
+    """Build a journal entry as the pages save it, analysis included"""
+    def make(entry_date, text="A quiet day", score=0.5, emotions=("neutral",), risk_level="none",
+             entry_time="09:00"):
+        return {
+            "date": entry_date,
+            "time": entry_time,
+            "text": text,
+            "sentiment": {"score": score, "label": "NEUTRAL", "emotions": list(emotions), "risk_level": risk_level},
+            "details": {"reasoning": "Analysis shows neutral sentiment", "suggestions": ["Keep going"]}
+        }
+    return make
+
+
+@pytest.fixture
+def store(tmp_path):
+    """An empty journal in a temporary directory"""
+    return JournalStore(tmp_path / "journal.db")
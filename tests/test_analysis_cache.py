@@ -0,0 +1,66 @@
+import pytest
+
+from app.core.services.analysis_cache import AnalysisCache, text_fingerprint
+
+RESULT = {"sentiment": {"score": 0.7, "label": "POSITIVE", "emotions": ["joy"], "risk_level": "none"}}
+
+
+def test_fingerprint_is_exact_content():
+    assert text_fingerprint("I feel fine") == text_fingerprint("I feel fine")
+    assert text_fingerprint("I feel fine") != text_fingerprint("I feel fine ")
+    assert len(text_fingerprint("")) == 64
+
+
+def test_entries_are_keyed_by_hash_and_version():
+    cache = AnalysisCache()
+    cache.put("hash", "1-a", RESULT)
+    assert cache.get("hash", "1-a") == RESULT
+    assert cache.get("hash", "1-b") is None
+    assert cache.get("other", "1-a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, pytest.approx(1 / 3))
+
+
+def test_hits_are_copies():
+    cache = AnalysisCache()
+    cache.put("hash", "1", RESULT)
+    hit = cache.get("hash", "1")
+    hit["sentiment"]["emotions"].append("anger")
+    assert cache.get("hash", "1") == RESULT
+    assert RESULT["sentiment"]["emotions"] == ["joy"]
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AnalysisCache(max_entries=2)
+    cache.put("a", "1", RESULT)
+    cache.put("b", "1", RESULT)
+    cache.get("a", "1")
+    cache.put("c", "1", RESULT)
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") is not None
+    assert len(cache) == 2 and cache.stats()["evictions"] == 1
+
+
+def test_zero_size_disables_the_cache():
+    cache = AnalysisCache(max_entries=0)
+    cache.put("hash", "1", RESULT)
+    assert not cache.enabled
+    assert cache.get("hash", "1") is None
+    assert len(cache) == 0 and cache.stats()["misses"] == 0
+
+
+def test_size_from_env(monkeypatch):
+    monkeypatch.setenv("MARIPOSA_SENTIMENT_CACHE_SIZE", "7")
+    assert AnalysisCache.from_env().max_entries == 7
+    with pytest.raises(ValueError):
+        AnalysisCache(max_entries=-1)
+
+
+def test_clear_keeps_counters():
+    cache = AnalysisCache()
+    cache.put("hash", "1", RESULT)
+    cache.get("hash", "1")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("hash", "1") is None
+    assert cache.stats()["hits"] == 1
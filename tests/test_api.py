@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.plan_executor import PlanExecutor
+
+SYMPTOMS = "anxious and worried all the time, heart racing in social situations, trouble sleeping"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("MARIPOSA_API_EXECUTOR", "thread")
+    monkeypatch.setenv("MARIPOSA_API_WORKERS", "2")
+    # The bundled article corpus instead of Google Scholar
+    monkeypatch.setenv("MARIPOSA_RESEARCH_FETCHER", "local")
+    monkeypatch.setenv("MARIPOSA_KB_WATCH_INTERVAL", "0")
+    with TestClient(app) as client:
+        yield client
+
+
+def request_plan(client, symptoms=SYMPTOMS):
+    return client.post("/api/v1/plans/generate", json={
+        "symptoms": symptoms, "severity": "moderate", "schedule": {"availability": []}
+    })
+
+
+def test_health_and_readiness(client):
+    assert client.get("/health").json() == {"status": "ok"}
+    assert client.get("/ready").json() == {"status": "ready", "executor": "thread", "workers": 2}
+
+
+def test_generates_a_plan(client):
+    response = request_plan(client)
+    assert response.status_code == 200
+    plan = response.json()
+    assert plan["identified_conditions"]
+    assert plan["session_frequency"] == "weekly"
+    assert request_plan(client).json() == plan
+
+
+def test_unmatched_symptoms_are_a_client_error(client):
+    response = request_plan(client, "zzz qqq")
+    assert response.status_code == 422
+
+
+def test_metrics_are_exposed(client):
+    request_plan(client)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "mariposa_plan_generation_seconds_count" in response.text
+
+
+def test_executor_rejects_unknown_modes_and_early_requests():
+    with pytest.raises(ValueError):
+        PlanExecutor(mode="fibers")
+    with pytest.raises(RuntimeError):
+        asyncio.run(PlanExecutor(mode="thread").generate(None))
@@ -0,0 +1,39 @@
+from benchmarks.harness import Benchmark, BenchmarkResult, compare_to_baseline, percentile, run_benchmark
+from benchmarks.suite import default_suite
+
+
+def make_result(name, p50_us):
+    return BenchmarkResult(name, 10, 1000.0, p50_us, p50_us, p50_us, 1.0)
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 0.50) == 50.0
+    assert percentile(samples, 0.99) == 99.0
+    assert percentile([7.0], 0.99) == 7.0
+
+
+def test_run_benchmark_times_every_call():
+    calls = []
+    result = run_benchmark(Benchmark("append", lambda: lambda: calls.append(1), iterations=5, warmup=2, batch=3))
+    # Warmup, the timed batches and one traced call for peak memory
+    assert len(calls) == 2 + 5 * 3 + 1
+    assert result.name == "append" and result.iterations == 5
+    assert 0 < result.p50_us <= result.p99_us
+    assert result.peak_memory_kib >= 0
+
+
+def test_compare_to_baseline():
+    baseline = {"same": {"p50_us": 100.0}, "slower": {"p50_us": 100.0}, "faster": {"p50_us": 100.0}}
+    results = [make_result("same", 110.0), make_result("slower", 130.0), make_result("faster", 70.0),
+               make_result("added", 5.0)]
+    assert [(comparison["name"], comparison["status"]) for comparison in compare_to_baseline(results, baseline)] == [
+        ("same", "unchanged"), ("slower", "regression"), ("faster", "improvement"), ("added", "new")
+    ]
+
+
+def test_suite_names_are_unique_and_runnable():
+    suite = default_suite()
+    names = [benchmark.name for benchmark in suite]
+    assert len(names) == len(set(names))
+    run_benchmark(suite[0], iterations=1)
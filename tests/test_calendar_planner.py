@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+from itertools import islice
+
+import pytest
+
+from app.core.models.schedule import PlannedSchedule
+from app.core.models.severity_level import SeverityLevel
+from app.core.services.calendar_planner import (
+    DAILY_ACTIVITIES, SESSION_TIME, SESSIONS_PER_WEEK, TherapyCalendarPlanner, parse_duration_weeks
+)
+
+START = date(2024, 1, 1)
+TECHNIQUES = ["Cognitive Behavioral Therapy (CBT)", "Behavioral Activation"]
+
+
+@pytest.fixture(scope="module")
+def planner():
+    return TherapyCalendarPlanner()
+
+
+def plan(planner, severity=SeverityLevel.MODERATE, weeks=12):
+    return planner.plan_schedule("Cognitive Behavioral Therapy", "weekly", TECHNIQUES, severity,
+                                 weeks=weeks, start_date=START)
+
+
+@pytest.mark.parametrize("duration, weeks", [
+    ("12-16 weeks", 16),
+    ("8 weeks", 8),
+    ("3-6 months", 26),
+    ("", 4),
+    ("ongoing", 4),
+])
+def test_parse_duration_weeks(duration, weeks):
+    assert parse_duration_weeks(duration) == weeks
+
+
+def test_planned_schedule_spans_the_whole_plan(planner):
+    schedule = plan(planner, weeks=12)
+    assert isinstance(schedule, PlannedSchedule)
+    assert schedule.start_date == START
+    assert schedule.end_date == START + timedelta(weeks=12, days=-1)
+    entries = list(schedule)
+    assert entries[0].date == START and entries[-1].date == schedule.end_date
+    assert [(e.ordinal, e.time) for e in entries] == sorted((e.ordinal, e.time) for e in entries)
+
+
+@pytest.mark.parametrize("severity", list(SeverityLevel))
+def test_entries_per_week(planner, severity):
+    week = list(plan(planner, severity, weeks=1))
+    sessions = [entry for entry in week if entry.type != "Daily Practice"]
+    assert len(week) == 7 * len(DAILY_ACTIVITIES[severity]) + len(sessions)
+    assert len(sessions) == SESSIONS_PER_WEEK[severity]["weekly"]
+    assert all(session.time == SESSION_TIME for session in sessions)
+
+
+def test_sessions_rotate_through_the_techniques(planner):
+    schedule = plan(planner, weeks=4)
+    weekly_techniques = []
+    for week in range(4):
+        week_start = START + timedelta(weeks=week)
+        sessions = [entry for entry in schedule.iter_range(week_start, week_start + timedelta(days=6))
+                    if entry.type != "Daily Practice"]
+        weekly_techniques.append({session.activity for session in sessions})
+    assert weekly_techniques == [{TECHNIQUES[0]}, {TECHNIQUES[1]}, {TECHNIQUES[0]}, {TECHNIQUES[1]}]
+    assert all(session.technique_id for session in schedule if session.type != "Daily Practice")
+
+
+def test_ranges_match_the_materialized_schedule(planner):
+    schedule = plan(planner, weeks=26)
+    full = planner.generate_weekly_schedule("Cognitive Behavioral Therapy", "weekly", TECHNIQUES,
+                                            SeverityLevel.MODERATE, start_date=START, weeks=26)
+    for start, end in [(date(2024, 3, 5), date(2024, 3, 20)), (date(2023, 12, 1), date(2024, 1, 2)),
+                       (date(2024, 6, 20), date(2024, 9, 1)), (date(2025, 1, 1), date(2025, 2, 1))]:
+        assert [(e.ordinal, e.time, e.activity) for e in schedule.iter_range(start, end)] == \
+            [(e.ordinal, e.time, e.activity) for e in full.iter_range(start, end)]
+
+
+def test_open_ended_schedule_is_generated_lazily(planner):
+    entries = planner.iter_schedule("CBT", "weekly", TECHNIQUES, SeverityLevel.LOW, start_date=START)
+    first_year = list(islice(entries, 7 * 2 * 52))
+    assert first_year[-1].date < START + timedelta(weeks=53)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.core.services.condition_retriever import ConditionRetriever, select_top_k
+from app.core.services.research_service import ResearchService
+
+CONDITIONS = ["Anxiety", "Depression", "Insomnia", "Panic Disorder", "Social Anxiety"]
+TEXTS = [
+    "excessive worry restlessness anxious tension",
+    "persistent sadness low mood loss of interest fatigue",
+    "trouble sleeping insomnia waking early fatigue",
+    "sudden panic attacks heart racing fear of dying",
+    "fear of social situations anxious about judgement"
+]
+QUERIES = [
+    "I feel anxious and worry all the time",
+    "heart racing panic and fear",
+    "sleeping badly and tired, fatigue every day",
+    "nothing in common here",
+    ""
+]
+
+
+@pytest.fixture(scope="module")
+def retriever():
+    return ConditionRetriever(CONDITIONS, TEXTS)
+
+
+def brute_force(retriever, text, threshold, top_k=None):
+    matrix = retriever.vectorizer.transform(TEXTS)
+    scores = cosine_similarity(retriever.vectorizer.transform([text]), matrix)[0]
+    # Stable sort: ties keep catalog order
+    ranked = sorted(((name, float(score)) for name, score in zip(CONDITIONS, scores) if score > threshold),
+                    key=lambda match: -match[1])
+    return ranked if top_k is None else ranked[:top_k]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.1, -1.0])
+@pytest.mark.parametrize("top_k", [None, 1, 2, 10])
+def test_search_matches_a_full_scan(retriever, threshold, top_k):
+    for query in QUERIES:
+        expected = brute_force(retriever, query, threshold, top_k)
+        actual = retriever.search(query, threshold, top_k)
+        assert [name for name, _ in actual] == [name for name, _ in expected]
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected])
+
+
+def test_search_many_matches_search(retriever):
+    assert retriever.search_many(QUERIES, 0.0, 2) == [retriever.search(query, 0.0, 2) for query in QUERIES]
+
+
+def test_ties_are_broken_by_catalog_order():
+    candidates = np.array([4, 1, 3, 0, 2])
+    scores = np.array([0.5, 0.5, 0.9, 0.5, 0.1])
+    selected, selected_scores = select_top_k(candidates, scores, 0.2, top_k=3)
+    assert selected.tolist() == [3, 0, 1]
+    assert selected_scores.tolist() == [0.9, 0.5, 0.5]
+
+
+def test_top_k_zero_returns_nothing(retriever):
+    assert retriever.search(QUERIES[0], 0.0, top_k=0) == []
+    assert retriever.search_many(QUERIES, 0.0, top_k=0) == [[] for _ in QUERIES]
+
+
+def test_negative_top_k_is_rejected(retriever):
+    with pytest.raises(ValueError):
+        retriever.search(QUERIES[0], 0.0, top_k=-1)
+
+
+def test_empty_catalog_matches_nothing():
+    retriever = ConditionRetriever([], [])
+    assert len(retriever) == 0
+    assert retriever.search_many(["anxious"], 0.0) == [[]]
+
+
+def test_mismatched_catalog_is_rejected():
+    with pytest.raises(ValueError):
+        ConditionRetriever(CONDITIONS, TEXTS[:2])
+
+
+def test_sharded_search_matches_in_process(retriever):
+    sharded = ConditionRetriever(CONDITIONS, TEXTS, shards=2)
+    try:
+        assert sharded.shards == 2
+        for top_k in (None, 1, 3):
+            assert sharded.search_many(QUERIES, 0.0, top_k) == retriever.search_many(QUERIES, 0.0, top_k)
+    finally:
+        sharded.close()
+
+
+def test_research_service_keeps_empty_result_for_top_k_zero():
+    service = ResearchService()
+    symptoms = "anxious and worried, heart racing in social situations"
+    assert service.analyze_symptoms(symptoms)
+    assert service.analyze_symptoms(symptoms, top_k=0) == []
+    assert list(service.analyze_symptoms_batch([symptoms, symptoms], top_k=0)) == [[], []]
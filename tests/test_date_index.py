@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+from app.core.models.severity_level import SeverityLevel
+from app.core.services.calendar_planner import TherapyCalendarPlanner
+from app.core.services.date_index import DateIndex
+
+# A Wednesday, so the first ISO week straddles the plan start and a month boundary follows
+START = date(2024, 1, 24)
+
+
+class CountingSchedule:
+    """Wraps a schedule to record which ranges were generated"""
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.ranges = []
+
+    def __bool__(self):
+        return bool(self.schedule)
+
+    def __getattr__(self, name):
+        return getattr(self.schedule, name)
+
+    def iter_range(self, start, end):
+        self.ranges.append((start, end))
+        return self.schedule.iter_range(start, end)
+
+
+@pytest.fixture
+def schedule():
+    planner = TherapyCalendarPlanner()
+    return CountingSchedule(planner.plan_schedule("CBT", "weekly", ["Behavioral Activation"],
+                                                  SeverityLevel.LOW, weeks=8, start_date=START))
+
+
+@pytest.fixture
+def store(store, make_entry):
+    """The shared journal with two entries on January 25 and one on February 2"""
+    store.append_many([make_entry("2024-01-25"), make_entry("2024-01-25"), make_entry("2024-02-02")])
+    return store
+
+
+def test_month_holds_sessions_and_journal_counts(schedule, store):
+    index = DateIndex(schedule, store)
+    january = index.month(2024, 1)
+    assert [bucket.date.day for bucket in january.values()] == list(range(24, 32))
+    assert index.day(date(2024, 1, 25)).journal_count == 2
+    expected = [entry for entry in schedule.schedule.iter_range(date(2024, 1, 25), date(2024, 1, 25))]
+    assert index.day(date(2024, 1, 25)).sessions == expected
+    assert index.day(date(2024, 1, 10)).sessions == []
+
+
+def test_months_are_loaded_once_and_only_when_asked_for(schedule, store):
+    index = DateIndex(schedule, store)
+    index.month(2024, 1)
+    index.month(2024, 1)
+    index.day(date(2024, 1, 30))
+    assert schedule.ranges == [(date(2024, 1, 1), date(2024, 1, 31))]
+
+
+def test_week_spanning_two_months(schedule, store):
+    index = DateIndex(schedule, store)
+    week = index.week(2024, 5)
+    assert [bucket.date for bucket in week.values()] == [date(2024, 1, day) for day in range(29, 32)] + \
+        [date(2024, 2, day) for day in range(1, 5)]
+    assert week[date(2024, 2, 2).toordinal()].journal_count == 1
+
+
+def test_new_entries_update_loaded_months_only(schedule, store, make_entry):
+    index = DateIndex(schedule, store)
+    index.month(2024, 1)
+    for entry_date in ("2024-01-26", "2024-03-01"):
+        store.append(make_entry(entry_date))
+        index.add_journal_entry(date.fromisoformat(entry_date))
+    assert index.day(date(2024, 1, 26)).journal_count == 1
+    # March was not loaded yet, so the entry is counted once, from the store, when it is first viewed
+    assert index.day(date(2024, 3, 1)).journal_count == 1
+
+
+def test_schedule_weeks(schedule):
+    weeks = DateIndex(schedule).schedule_weeks()
+    assert weeks[0] == (2024, 4)
+    assert len(weeks) == 9
+    assert DateIndex().schedule_weeks() == []
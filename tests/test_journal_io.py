@@ -0,0 +1,119 @@
+import io
+
+import pytest
+
+from app.core.services.analysis_cache import AnalysisCache
+from app.core.services.journal_io import export_journal, export_journal_file, import_journal, journal_format
+from app.core.services.journal_store import JournalStore
+from app.core.services.sentiment_analyzer import SentimentAnalyzer
+from app.core.utils.exceptions import JournalImportError
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return SentimentAnalyzer(cache=AnalysisCache(max_entries=0))
+
+
+def read_file(content, file_format, store, analyzer, **kwargs):
+    return import_journal(io.BytesIO(content.encode("utf-8")), file_format, store, analyzer, **kwargs)
+
+
+def test_journal_format_from_file_name():
+    assert journal_format("journal.JSONL") == "jsonl"
+    assert journal_format("backup.ndjson") == "jsonl"
+    assert journal_format("export.csv") == "csv"
+    with pytest.raises(JournalImportError):
+        journal_format("journal.txt")
+
+
+@pytest.mark.parametrize("file_format", ["jsonl", "csv"])
+def test_export_and_import_round_trip(tmp_path, store, analyzer, file_format, make_entry):
+    store.append_many([make_entry("2024-05-01", "Felt calm"), make_entry("2024-05-02", "Felt happy", 0.8)])
+    exported = export_journal_file(store, file_format)
+
+    copy = JournalStore(tmp_path / "copy.db")
+    report = import_journal(exported, file_format, copy, analyzer)
+    assert report.imported == 2 and report.skipped == 0 and report.errors == []
+    assert [(entry["date"], entry["time"], entry["text"]) for entry in copy.iter_entries()] == [
+        ("2024-05-01", "09:00", "Felt calm"),
+        ("2024-05-02", "09:00", "Felt happy")
+    ]
+    assert not exported.closed
+
+
+def test_jsonl_keeps_the_exported_analysis_unless_asked_to_reanalyze(tmp_path, store, analyzer, make_entry):
+    store.append(make_entry("2024-05-01", "I am so happy today", score=0.123))
+    exported = io.StringIO()
+    assert export_journal(store, exported, "jsonl") == 1
+    content = exported.getvalue()
+
+    kept = JournalStore(tmp_path / "kept.db")
+    read_file(content, "jsonl", kept, analyzer)
+    assert next(kept.iter_entries())["sentiment"]["score"] == 0.123
+
+    # Stored without an analyzer version, so reanalyze recomputes it
+    redone = JournalStore(tmp_path / "redone.db")
+    read_file(content, "jsonl", redone, analyzer, reanalyze=True)
+    entry = next(redone.iter_entries())
+    assert entry["sentiment"]["emotions"] == ["joy"]
+    assert entry["analyzer_version"] == analyzer.version
+
+
+def test_csv_rows_are_analyzed_on_import(store, analyzer):
+    report = read_file("date,time,text\n2024-05-01T21:30:00,,I am so happy today\n", "csv", store, analyzer)
+    assert report.imported == 1
+    [entry] = store.get_by_date("2024-05-01")
+    assert entry["time"] == "21:30"
+    assert entry["sentiment"]["emotions"] == ["joy"]
+
+
+def test_invalid_rows_are_skipped_and_reported(store, analyzer):
+    content = "\n".join([
+        '{"date": "2024-05-01", "text": "Fine"}',
+        'not json',
+        '["a list"]',
+        '{"date": "05/01/2024", "text": "Wrong date"}',
+        '{"date": "2024-05-02", "time": "late", "text": "Wrong time"}',
+        '{"date": "2024-05-03", "text": "  "}',
+        '',
+        '{"date": "2024-05-04", "text": "Also fine"}'
+    ])
+    report = read_file(content, "jsonl", store, analyzer)
+    assert report.imported == 2
+    assert report.skipped == 5
+    assert report.errors[0].startswith("Line 2: invalid JSON")
+    assert report.errors[1:] == [
+        "Line 3: expected a JSON object",
+        "Line 4: invalid date '05/01/2024', expected YYYY-MM-DD",
+        "Line 5: invalid time 'late', expected HH:MM",
+        "Line 6: missing text"
+    ]
+    assert store.count() == 2
+
+
+def test_csv_without_required_columns_is_rejected(store, analyzer):
+    with pytest.raises(JournalImportError, match="text"):
+        read_file("date,note\n2024-05-01,hello\n", "csv", store, analyzer)
+
+
+def test_non_utf8_file_is_rejected(store, analyzer):
+    content = "date,text\n2024-05-01,caf\xe9\n".encode("latin-1")
+    with pytest.raises(JournalImportError, match="UTF-8"):
+        import_journal(io.BytesIO(content), "csv", store, analyzer)
+
+
+def test_progress_is_reported_after_every_batch(store, analyzer):
+    lines = [f'{{"date": "2024-05-{day:02d}", "text": "Day {day}"}}' for day in range(1, 6)]
+    updates = []
+    read_file("\n".join(lines), "jsonl", store, analyzer, batch_size=2, progress=updates.append)
+    assert [(update.rows_read, update.imported, update.skipped) for update in updates] == [
+        (2, 2, 0), (4, 4, 0), (5, 5, 0)
+    ]
+    assert updates[-1].bytes_read == len("\n".join(lines))
+
+
+def test_unknown_format_and_batch_size_are_rejected(store, analyzer):
+    with pytest.raises(JournalImportError):
+        read_file("", "xml", store, analyzer)
+    with pytest.raises(ValueError):
+        read_file("", "jsonl", store, analyzer, batch_size=0)
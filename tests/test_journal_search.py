@@ -0,0 +1,143 @@
+import sqlite3
+
+import pytest
+
+from app.core.services import journal_store
+from app.core.services.journal_search import build_emotion_filter, build_match_expression
+from app.core.utils.exceptions import JournalQueryError
+
+ENTRIES = [
+    ("2024-01-01", "Had a panic attack before the work meeting", ["fear", "anxiety"], "low"),
+    ("2024-01-02", "Work was fine, I felt calm and relaxed", ["calm"], "none"),
+    ("2024-01-03", "Panic rising again, the attack passed quickly", ["fear"], "none"),
+    ("2024-01-04", "Worked late. Feeling hopeless about everything", ["sadness"], "medium"),
+    ("2024-01-05", "A happy day with friends", ["joy"], "none"),
+]
+
+
+@pytest.fixture
+def store(store, make_entry):
+    """The shared journal holding ENTRIES"""
+    store.append_many(make_entry(entry_date, text, emotions=emotions, risk_level=risk_level)
+                      for entry_date, text, emotions, risk_level in ENTRIES)
+    return store
+
+
+def dates(results):
+    return sorted(entry["date"] for entry in results.entries)
+
+
+@pytest.mark.parametrize("query, expression", [
+    ("anxious work", '"anxious" "work"'),
+    ('"panic attack"', '"panic attack"'),
+    ('"panic att', '"panic att"'),
+    ("work*", '"work"*'),
+    ("sad -work", '("sad") NOT "work"'),
+    ("sad -work*", '("sad") NOT "work"*'),
+    ("sad OR happy", '"sad" OR "happy"'),
+    ("sad NOT happy", '"sad" NOT "happy"'),
+    ("NOT sad happy", '("happy") NOT "sad"'),
+    ("OR sad AND", '"sad"'),
+    ("sad OR OR happy", '"sad" OR "happy"'),
+    ("sad or happy", '"sad" "or" "happy"'),
+    ("c++ (x) NEAR/2 col:umn", '"c" "x" "NEAR 2" "col umn"'),
+])
+def test_match_expressions(query, expression):
+    assert build_match_expression(query) == expression
+
+
+@pytest.mark.parametrize("query", ["", "   ", "OR", "AND OR NOT", "-sad", "NOT sad", "-", "*", '""', "!!!"])
+def test_queries_without_a_term_to_match_are_rejected(query):
+    with pytest.raises(JournalQueryError):
+        build_match_expression(query)
+
+
+def test_journal_query_error_is_a_value_error():
+    assert issubclass(JournalQueryError, ValueError)
+
+
+def test_emotion_filter():
+    assert build_emotion_filter(["joy", "anxiety"]) == 'emotions : ("joy" OR "anxiety")'
+    assert build_emotion_filter([]) == ""
+    assert build_emotion_filter(["!!"]) == ""
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("panic", ["2024-01-01", "2024-01-03"]),
+    ('"panic attack"', ["2024-01-01"]),
+    ("attack panic", ["2024-01-01", "2024-01-03"]),
+    ("work", ["2024-01-01", "2024-01-02", "2024-01-04"]),
+    ("work -panic", ["2024-01-02", "2024-01-04"]),
+    ("NOT panic work", ["2024-01-02", "2024-01-04"]),
+    ("happy OR calm", ["2024-01-02", "2024-01-05"]),
+    ("hope*", ["2024-01-04"]),
+    ("fear", ["2024-01-01", "2024-01-03"]),
+    ("(panic)", ["2024-01-01", "2024-01-03"]),
+    ("nothing-like-this", []),
+])
+def test_search_finds_matching_entries(store, query, expected):
+    results = store.search(query)
+    assert results.total == len(expected)
+    assert dates(results) == expected
+
+
+def test_search_ranks_and_highlights(store):
+    results = store.search('"panic attack"')
+    assert "**panic attack**" in results.entries[0]["snippet"].lower()
+    assert "snippet" in store.search("panic OR calm").entries[-1]
+
+
+def test_filters_without_a_query_list_newest_first(store):
+    results = store.search(emotions=["fear"])
+    assert [entry["date"] for entry in results.entries] == ["2024-01-03", "2024-01-01"]
+    assert "snippet" not in results.entries[0]
+    assert dates(store.search(risk_levels=["low", "medium"])) == ["2024-01-01", "2024-01-04"]
+    assert dates(store.search(start="2024-01-02", end="2024-01-03")) == ["2024-01-02", "2024-01-03"]
+    assert store.search().total == len(ENTRIES)
+
+
+def test_query_and_filters_combine(store):
+    assert dates(store.search("panic", emotions=["anxiety"])) == ["2024-01-01"]
+    assert dates(store.search("work", risk_levels=["none"])) == ["2024-01-02"]
+    assert dates(store.search("panic", start="2024-01-02")) == ["2024-01-03"]
+
+
+def test_search_pages_through_matches(store):
+    first = store.search("work", limit=2)
+    second = store.search("work", limit=2, offset=2)
+    assert first.total == second.total == 3
+    assert len(first.entries) == 2 and len(second.entries) == 1
+    assert not {entry["id"] for entry in first.entries} & {entry["id"] for entry in second.entries}
+
+
+def test_search_is_per_user(store, make_entry):
+    store.append(make_entry("2024-02-01", "panic at the disco", emotions=["fear"]), user_id="someone-else")
+    assert store.search("panic").total == 2
+    assert store.search("panic", user_id="someone-else").total == 1
+
+
+def test_malformed_query_raises_journal_query_error(store):
+    with pytest.raises(JournalQueryError):
+        store.search("-panic")
+
+
+def test_fts5_syntax_errors_surface_as_journal_query_error(store, monkeypatch):
+    monkeypatch.setattr(journal_store, "build_match_expression", lambda query: '"unterminated')
+    with pytest.raises(JournalQueryError):
+        store.search("anything")
+
+
+def test_other_database_errors_are_not_masked(store, monkeypatch):
+    monkeypatch.setattr(journal_store, "build_match_expression", lambda query: '"panic"')
+    store._connection().execute("DROP TABLE journal_entries")
+    with pytest.raises(sqlite3.OperationalError):
+        store.search("panic")
+
+
+def test_index_follows_deleted_and_rebuilt_entries(store):
+    connection = store._connection()
+    connection.execute("DELETE FROM journal_entries WHERE entry_date = '2024-01-03'")
+    connection.commit()
+    assert dates(store.search("panic")) == ["2024-01-01"]
+    store.rebuild_search_index()
+    assert dates(store.search("panic")) == ["2024-01-01"]
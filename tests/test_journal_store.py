@@ -0,0 +1,119 @@
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from app.core.services.analysis_cache import text_fingerprint
+from app.core.services.journal_store import JournalStore
+
+
+def test_entries_round_trip(store, make_entry):
+    entry = make_entry("2024-05-01", text="Felt happy", score=0.8, emotions=["joy"])
+    entry_id = store.append(entry)
+    [stored] = store.get_by_date("2024-05-01")
+    assert stored["id"] == entry_id
+    assert {key: stored[key] for key in entry} == entry
+
+
+def test_entries_persist_across_instances(tmp_path, make_entry):
+    JournalStore(tmp_path / "journal.db").append(make_entry("2024-05-01"))
+    assert JournalStore(tmp_path / "journal.db").count() == 1
+
+
+def test_date_queries(store, make_entry):
+    store.append_many([
+        make_entry("2024-05-03", entry_time="08:00"),
+        make_entry("2024-05-01", entry_time="21:00"),
+        make_entry("2024-05-01", entry_time="07:30"),
+        make_entry("2024-06-10", entry_time="12:00"),
+    ])
+    assert [entry["time"] for entry in store.get_by_date("2024-05-01")] == ["07:30", "21:00"]
+    in_may = store.get_range("2024-05-01", "2024-05-31")
+    assert [(entry["date"], entry["time"]) for entry in in_may] == \
+        [("2024-05-01", "07:30"), ("2024-05-01", "21:00"), ("2024-05-03", "08:00")]
+    newest = store.get_range("2024-05-01", "2024-05-31", newest_first=True, limit=1, offset=1)
+    assert [(entry["date"], entry["time"]) for entry in newest] == [("2024-05-01", "21:00")]
+    assert store.dates_with_entries("2024-05-01", "2024-05-31") == {"2024-05-01", "2024-05-03"}
+
+
+def test_pages_are_newest_first(store, make_entry):
+    store.append_many(make_entry(f"2024-05-{day:02d}") for day in range(1, 6))
+    assert [entry["date"] for entry in store.page(2)] == ["2024-05-05", "2024-05-04"]
+    assert [entry["date"] for entry in store.page(2, offset=4)] == ["2024-05-01"]
+    assert [entry["date"] for entry in store.iter_entries(batch_size=2)] == \
+        [f"2024-05-{day:02d}" for day in range(1, 6)]
+
+
+def test_users_are_kept_apart(store, make_entry):
+    store.append(make_entry("2024-05-01"), user_id="alice")
+    store.append(make_entry("2024-05-01"), user_id="bob")
+    store.append(make_entry("2024-05-02"), user_id="bob")
+    assert store.count("alice") == 1 and store.count("bob") == 2
+    assert store.count() == 0
+    assert len(store.get_by_date("2024-05-01", user_id="bob")) == 1
+
+
+def test_failed_batch_stores_nothing(store, make_entry):
+    broken = make_entry("2024-05-02")
+    del broken["sentiment"]
+    with pytest.raises(KeyError):
+        store.append_many([make_entry("2024-05-01"), broken])
+    assert store.count() == 0
+    assert store.daily_mood() == []
+
+
+def test_threads_get_their_own_connections(store, make_entry):
+    store.append(make_entry("2024-05-01"))
+    counts = []
+
+    def write_and_count():
+        store.append(make_entry("2024-05-02"))
+        counts.append(store.count())
+
+    threads = [threading.Thread(target=write_and_count) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(counts) == 4
+    assert store.count() == 5
+
+
+def test_analysis_fingerprints_are_stored(store, make_entry):
+    store.append(dict(make_entry("2024-05-01", text="Felt calm"), analyzer_version="v1"))
+    store.append(make_entry("2024-05-02"))
+    first, second = store.iter_entries()
+    assert (first["text_hash"], first["analyzer_version"]) == (text_fingerprint("Felt calm"), "v1")
+    assert (second["text_hash"], second["analyzer_version"]) == (text_fingerprint("A quiet day"), None)
+
+
+def test_journals_from_before_fingerprints_are_migrated(tmp_path):
+    path = tmp_path / "journal.db"
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE journal_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, "
+        "entry_date TEXT NOT NULL, entry_time TEXT NOT NULL, text TEXT NOT NULL, "
+        "sentiment_score REAL NOT NULL, sentiment_label TEXT NOT NULL, emotions TEXT NOT NULL, "
+        "risk_level TEXT NOT NULL, details TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    connection.executemany(
+        "INSERT INTO journal_entries (user_id, entry_date, entry_time, text, sentiment_score, sentiment_label, "
+        "emotions, risk_level, details, created_at) VALUES ('local', ?, '09:00', ?, 0.5, 'NEUTRAL', ?, "
+        "'none', '{}', 0)",
+        [("2024-05-01", "Felt calm", json.dumps(["neutral"])), ("2024-05-02", "Felt panicky", json.dumps(["fear"]))]
+    )
+    connection.commit()
+    connection.close()
+
+    store = JournalStore(path)
+    entries = list(store.iter_entries())
+    assert [entry["text_hash"] for entry in entries] == [text_fingerprint("Felt calm"),
+                                                         text_fingerprint("Felt panicky")]
+    # Which analyzer produced the old analyses is unknown
+    assert [entry["analyzer_version"] for entry in entries] == [None, None]
+    assert [day["date"] for day in store.daily_mood()] == ["2024-05-01", "2024-05-02"]
+    assert store.search("panicky").total == 1
+
+    # Opening the migrated journal again leaves it as it is
+    assert list(JournalStore(path).iter_entries()) == entries
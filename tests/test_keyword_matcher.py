@@ -0,0 +1,69 @@
+import pytest
+
+from app.core.services.keyword_matcher import (
+    KeywordMatcher, KeywordScanner, get_keyword_scanner, scan_keywords, tokenize
+)
+
+
+def test_tokenize_keeps_contractions_together():
+    assert tokenize("I CAN’T go on, can't I? Self-harm") == ["i", "can't", "go", "on", "can't", "i", "self", "harm"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I might die", {"die"}),
+    ("on a diet", set()),
+    ("studied", set()),
+    ("I want to kill myself", {"kill myself"}),
+    ("kill. Myself", {"kill myself"}),
+    ("kill the myself", set()),
+    ("give give up", {"give up"}),
+])
+def test_keywords_match_whole_words_and_phrases(text, expected):
+    matcher = KeywordMatcher([("die", "die"), ("kill myself", "kill myself"), ("give up", "give up")])
+    assert matcher.find(text) == expected
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher([("end my life", "phrase"), ("my life", "suffix"), ("life", "word")])
+    assert matcher.find("I want to end my life") == {"phrase", "suffix", "word"}
+    assert matcher.find("the end of my life") == {"suffix", "word"}
+
+
+def test_scan_reports_emotions_in_table_order():
+    scan = scan_keywords("Feeling calm, then ANXIOUS, but happy")
+    assert scan.emotions == ["joy", "anxiety", "calm"]
+    assert scan.risk_level == "none"
+    assert not scan.crisis
+
+
+def test_scan_without_emotions_is_neutral():
+    assert scan_keywords("The weather report").emotions == ["neutral"]
+
+
+def test_most_severe_risk_level_wins():
+    assert scan_keywords("overwhelmed and hopeless").risk_level == "medium"
+    assert scan_keywords("exhausted, I want to die").risk_level == "high"
+    assert scan_keywords("I can't go on").risk_level == "medium"
+
+
+def test_crisis_language():
+    assert scan_keywords("thinking about self harm").crisis
+    assert scan_keywords("I don't want to live").crisis
+    assert not scan_keywords("I'm on a diet").crisis
+
+
+def test_custom_tables():
+    scanner = KeywordScanner(
+        emotion_keywords={"boredom": ["bored"], "joy": ["happy"]},
+        risk_keywords={"low": ["tired"], "high": ["in danger"]},
+        crisis_keywords=["help me"]
+    )
+    scan = scanner.scan("happy but bored, tired and in danger, help me")
+    assert scan.emotions == ["boredom", "joy"]
+    # Table order decides which level wins
+    assert scan.risk_level == "low"
+    assert scan.crisis
+
+
+def test_default_scanner_is_shared():
+    assert get_keyword_scanner() is get_keyword_scanner()
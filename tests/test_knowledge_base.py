@@ -0,0 +1,80 @@
+import os
+
+from app.core.services.knowledge_base import (
+    KnowledgeBaseWatcher, clear_catalog_caches, knowledge_base_version
+)
+from app.core.services.technique_database import load_technique_catalog
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_version_changes_when_a_file_changes(tmp_path):
+    techniques = tmp_path / "techniques.json"
+    articles = tmp_path / "articles.json"
+    write(techniques, "{}", 1_000_000_000)
+    paths = (techniques, articles)
+
+    version = knowledge_base_version(paths)
+    assert knowledge_base_version(paths) == version
+    write(articles, "[]", 1_000_000_000)
+    assert knowledge_base_version(paths) != version
+    version = knowledge_base_version(paths)
+    write(techniques, "{}", 2_000_000_000)
+    assert knowledge_base_version(paths) != version
+
+
+def test_watcher_waits_for_writes_to_settle(tmp_path):
+    path = tmp_path / "techniques.json"
+    write(path, "{}", 1_000_000_000)
+    reloads = []
+    watcher = KnowledgeBaseWatcher(reloads.append, paths=[path], interval=0)
+
+    assert not watcher.check()
+    write(path, '{"a": 1}', 2_000_000_000)
+    assert not watcher.check()
+    assert watcher.check()
+    assert reloads == [watcher.version] == [knowledge_base_version([path])]
+    assert not watcher.check()
+
+
+def test_watcher_keeps_the_current_version_when_reloading_fails(tmp_path):
+    path = tmp_path / "techniques.json"
+    write(path, "{}", 1_000_000_000)
+    attempts = []
+
+    def on_change(version):
+        attempts.append(version)
+        if len(attempts) == 1:
+            raise ValueError("invalid JSON")
+
+    watcher = KnowledgeBaseWatcher(on_change, paths=[path], interval=0)
+    original = watcher.version
+    write(path, "{", 2_000_000_000)
+    watcher.check()
+    assert not watcher.check()
+    assert watcher.version == original
+    # The broken version is not retried until the files change again
+    assert not watcher.check()
+    assert len(attempts) == 1
+
+    write(path, "{}", 3_000_000_000)
+    watcher.check()
+    assert watcher.check()
+    assert len(attempts) == 2
+    assert watcher.version != original
+
+
+def test_watcher_with_zero_interval_does_not_start_a_thread(tmp_path):
+    watcher = KnowledgeBaseWatcher(lambda version: None, paths=[tmp_path / "missing.json"], interval=0)
+    assert watcher.start()._thread is None
+    watcher.stop()
+
+
+def test_clear_catalog_caches_rereads_the_files():
+    catalog = load_technique_catalog()
+    assert load_technique_catalog() is catalog
+    clear_catalog_caches()
+    assert load_technique_catalog() is not catalog
@@ -0,0 +1,91 @@
+import pickle
+from itertools import takewhile
+
+import pytest
+
+from app.core.models.schemas import PatientInput, Schedule
+from app.core.models.severity_level import SeverityLevel
+from app.core.services.plan_service import TherapyPlanGenerator
+from app.core.utils.metrics import MetricsRegistry, metrics
+
+
+def test_counters_and_spans_render_as_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("mariposa_requests_total", "Requests by result")
+    registry.inc("mariposa_requests_total", result="hit")
+    registry.inc("mariposa_requests_total", 2, result="hit")
+    registry.observe("mariposa_stage_seconds", 0.003, stage="parse")
+    with registry.span("mariposa_stage_seconds", stage="parse"):
+        pass
+
+    text = registry.render_prometheus()
+    assert "# HELP mariposa_requests_total Requests by result\n" in text
+    assert "# TYPE mariposa_requests_total counter\n" in text
+    assert 'mariposa_requests_total{result="hit"} 3\n' in text
+    assert "# TYPE mariposa_stage_seconds histogram\n" in text
+    assert 'mariposa_stage_seconds_bucket{stage="parse",le="0.005"} 2\n' in text
+    assert 'mariposa_stage_seconds_bucket{stage="parse",le="+Inf"} 2\n' in text
+    assert 'mariposa_stage_seconds_count{stage="parse"} 2\n' in text
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("mariposa_errors_total", error='bad "quote"\n')
+    assert 'mariposa_errors_total{error="bad \\"quote\\"\\n"} 1' in registry.render_prometheus()
+
+
+def test_span_records_failures_and_reraises():
+    registry = MetricsRegistry()
+    with pytest.raises(ValueError):
+        with registry.span("mariposa_plan_generation_seconds"):
+            raise ValueError("boom")
+    with registry.span("mariposa_plan_generation_seconds", stage="done"):
+        pass
+
+    spans = registry.recent_spans()
+    assert [span["failed"] for span in spans] == [False, True]
+    assert spans[0]["labels"] == {"stage": "done"}
+    assert registry.recent_spans(limit=1) == spans[:1]
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.inc("mariposa_requests_total")
+    registry.observe("mariposa_stage_seconds", 0.1)
+    with registry.span("mariposa_stage_seconds") as span:
+        pass
+    assert registry.span("other") is span
+    assert registry.render_prometheus() == "\n"
+    assert registry.recent_spans() == []
+
+
+def test_drain_yields_deltas_that_merge_into_another_registry():
+    worker = MetricsRegistry()
+    worker.inc("mariposa_requests_total", result="miss")
+    worker.observe("mariposa_stage_seconds", 0.02, stage="match")
+    first = pickle.loads(pickle.dumps(worker.drain()))
+    assert worker.drain() == {"counters": [], "histograms": [], "spans": []}
+
+    worker.inc("mariposa_requests_total", result="miss")
+    second = worker.drain()
+
+    parent = MetricsRegistry()
+    parent.merge(first)
+    parent.merge(second)
+    text = parent.render_prometheus()
+    assert 'mariposa_requests_total{result="miss"} 2\n' in text
+    assert 'mariposa_stage_seconds_count{stage="match"} 1\n' in text
+    assert 'mariposa_stage_seconds_sum{stage="match"} 0.02\n' in text
+
+
+def test_plan_generation_times_every_stage():
+    generator = TherapyPlanGenerator()
+    generator.generate_therapy_plan(PatientInput(
+        symptoms="I worry constantly, feel restless and on edge, and cannot sleep",
+        severity=SeverityLevel.MODERATE,
+        schedule=Schedule(availability=["morning"])
+    ))
+    plan_spans = list(takewhile(lambda span: span["name"] != "mariposa_plan_generation_seconds",
+                                metrics.recent_spans()[1:]))
+    assert [span["labels"]["stage"] for span in reversed(plan_spans)] == \
+        ["symptom_matching", "dsm5_lookup", "article_retrieval", "treatment_analysis", "calendar_generation"]
@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from app.core.models.severity_level import SeverityLevel
+from app.core.services import registry as registry_module
+from app.core.services.calendar_planner import TherapyCalendarPlanner
+from app.core.services.journal_store import JournalStore
+from app.core.services.registry import _build_default_registry
+
+START = date(2024, 1, 1)
+TECHNIQUES = ["Cognitive Behavioral Therapy (CBT)", "Behavioral Activation"]
+
+
+@pytest.fixture(autouse=True)
+def registry(tmp_path, monkeypatch):
+    """A fresh service registry whose journal lives in a temporary directory"""
+    monkeypatch.setenv("MARIPOSA_WARM_UP", "0")
+    registry = _build_default_registry()
+    registry.register("journal_store", lambda resolve: JournalStore(tmp_path / "journal.db"), keep_on_reload=True)
+    monkeypatch.setattr(registry_module, "_default_registry", registry)
+    return registry
+
+
+def plan(start_date):
+    return TherapyCalendarPlanner().plan_schedule("Cognitive Behavioral Therapy", "weekly", TECHNIQUES,
+                                                  SeverityLevel.MODERATE, weeks=16, start_date=start_date)
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return plan(START)
+
+
+def run_page(path, schedule):
+    # Relative to this file
+    page = AppTest.from_file(path, default_timeout=60)
+    page.session_state["therapy_schedule"] = schedule
+    page.run()
+    assert not page.exception
+    return page
+
+
+def technique_blocks(page):
+    return [block.value for block in page.markdown if block.value.startswith("#### About this Technique")]
+
+
+def schedule_table(page):
+    return next(block.value for block in page.markdown if block.value.startswith("| Date"))
+
+
+def test_calendar_shows_one_week_at_a_time(schedule):
+    page = run_page("../app/main.py", schedule)
+    assert "2024-01-01" in schedule_table(page) and "2024-01-08" not in schedule_table(page)
+
+    page.number_input(key="therapy_calendar_week").set_value(2).run()
+    assert "2024-01-08" in schedule_table(page) and "2024-01-01" not in schedule_table(page)
+
+
+def test_calendar_renders_details_only_for_the_picked_technique(schedule):
+    page = run_page("../app/main.py", schedule)
+    assert technique_blocks(page) == []
+    picker = page.selectbox(key="therapy_calendar_technique")
+    picker.select_index(1).run()
+    assert not page.exception
+    assert len(technique_blocks(page)) == 1
+
+
+def test_daily_activities_render_details_on_demand():
+    # The calendar view opens on the current month
+    page = run_page("../app/pages/01_Calendar_and_Journal.py", plan(date.today().replace(day=1)))
+    page.radio[0].set_value("Calendar View").run()
+    day_buttons = [button for button in page.button if button.key and button.key.startswith("day_")]
+    day_buttons[0].click().run()
+    assert not page.exception
+
+    pickers = [box for box in page.selectbox if box.key and box.key.startswith("technique_details_")]
+    assert len(pickers) == 1 and technique_blocks(page) == []
+    pickers[0].select_index(1).run()
+    assert not page.exception
+    # The picked day stays open across the rerun
+    assert any(block.value.startswith("### Activities for") for block in page.markdown)
+    assert len(technique_blocks(page)) == 1
+
+
+def test_sessions_keep_separate_journals(registry):
+    store = registry.get("journal_store")
+    first = run_page("../app/pages/01_Calendar_and_Journal.py", None)
+    first.text_area[0].input("I am so happy today")
+    next(button for button in first.button if button.label == "Save Journal Entry").click().run()
+    assert not first.exception
+    first_user = first.session_state["journal_user_id"]
+    assert store.count(first_user) == 1
+    assert store.count() == 0
+
+    second = run_page("../app/pages/01_Calendar_and_Journal.py", None)
+    assert second.session_state["journal_user_id"] != first_user
+    assert not any(block.value == "### Journal History" for block in second.markdown)
+    first.run()
+    assert any(block.value == "### Journal History" for block in first.markdown)
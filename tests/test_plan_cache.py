@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+
+from app.core.models.schemas import TherapyPlan
+from app.core.services.plan_cache import PlanCache, normalize_symptoms, plan_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_plan(therapy_type="Cognitive Behavioral Therapy"):
+    return TherapyPlan(
+        identified_conditions=["Generalized Anxiety Disorder"],
+        confidence_scores={"Generalized Anxiety Disorder": 0.4},
+        therapy_type=therapy_type,
+        session_frequency="weekly",
+        goals=["Reduce symptom severity"],
+        techniques=["Mindfulness exercises"],
+        duration="12-16 weeks"
+    )
+
+
+def test_normalized_symptoms_share_a_key():
+    assert normalize_symptoms("  I feel ANXIOUS,   tired! ") == "i feel anxious tired"
+    assert plan_cache_key("I feel anxious", "low", "v1") == plan_cache_key("i feel... anxious", "low", "v1")
+    assert plan_cache_key("I feel anxious", "low", "v1") != plan_cache_key("I feel anxious", "severe", "v1")
+    assert plan_cache_key("I feel anxious", "low", "v1") != plan_cache_key("I feel anxious", "low", "v2")
+
+
+def test_get_or_compute_computes_once():
+    cache = PlanCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return make_plan()
+
+    first = cache.get_or_compute("anxious", "low", "v1", compute)
+    second = cache.get_or_compute("Anxious!", "low", "v1", compute)
+    assert len(calls) == 1
+    assert first == second
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_hits_are_copies():
+    cache = PlanCache()
+    plan = cache.get_or_compute("anxious", "low", "v1", make_plan)
+    plan.goals.append("changed by the caller")
+    hit = cache.get_or_compute("anxious", "low", "v1", make_plan)
+    hit.techniques.clear()
+    again = cache.get_or_compute("anxious", "low", "v1", make_plan)
+    assert again == make_plan()
+    assert hit is not again
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PlanCache(ttl_seconds=10, clock=clock)
+    cache.put("key", make_plan())
+    clock.now = 9.9
+    assert cache.get("key") is not None
+    clock.now = 10
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PlanCache(max_entries=2)
+    cache.put("a", make_plan("a"))
+    cache.put("b", make_plan("b"))
+    cache.get("a")
+    cache.put("c", make_plan("c"))
+    assert cache.get("b") is None
+    assert cache.get("a").therapy_type == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_new_knowledge_base_version_drops_cached_plans():
+    cache = PlanCache()
+    cache.get_or_compute("anxious", "low", "v1", make_plan)
+    cache.get_or_compute("sad", "low", "v1", make_plan)
+    assert len(cache) == 2
+    cache.get_or_compute("anxious", "low", "v2", make_plan)
+    assert len(cache) == 1
+    assert cache.stats()["kb_version"] == "v2"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_plan_from_a_superseded_version_is_not_stored():
+    cache = PlanCache()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_compute():
+        started.set()
+        release.wait(5)
+        return make_plan("old")
+
+    worker = threading.Thread(target=cache.get_or_compute, args=("anxious", "low", "v1", slow_compute))
+    worker.start()
+    started.wait(5)
+    # The knowledge base changes while the v1 plan is still being built
+    cache.get_or_compute("sad", "low", "v2", make_plan)
+    release.set()
+    worker.join(5)
+
+    assert len(cache) == 1
+    assert cache.stats()["kb_version"] == "v2"
+
+
+def test_older_versions_never_switch_the_cache_back():
+    cache = PlanCache()
+    cache.get_or_compute("anxious", "low", "v1", make_plan)
+    cache.get_or_compute("anxious", "low", "v2", lambda: make_plan("new"))
+    calls = []
+
+    def old_compute():
+        calls.append(1)
+        return make_plan("old")
+
+    # Requests still running on v1 interleave with ones on v2
+    for _ in range(3):
+        assert cache.get_or_compute("anxious", "low", "v1", old_compute).therapy_type == "old"
+        assert cache.get_or_compute("anxious", "low", "v2", make_plan).therapy_type == "new"
+    assert len(calls) == 3
+    assert len(cache) == 1
+    stats = cache.stats()
+    assert stats["kb_version"] == "v2"
+    assert stats["invalidations"] == 1
+    assert stats["stale"] == 3 and stats["hits"] == 3
+
+
+def test_advancing_brings_back_a_superseded_version():
+    cache = PlanCache()
+    cache.advance("v1")
+    cache.advance("v2")
+    cache.get_or_compute("anxious", "low", "v1", make_plan)
+    assert len(cache) == 0
+    # The v2 edit was reverted, so the v1 data is loaded again
+    cache.advance("v1")
+    cache.get_or_compute("anxious", "low", "v1", make_plan)
+    assert len(cache) == 1
+    cache.get_or_compute("anxious", "low", "v2", make_plan)
+    assert cache.stats()["kb_version"] == "v1"
+    assert cache.stats()["stale"] == 2
+
+
+def test_invalid_size_is_rejected():
+    with pytest.raises(ValueError):
+        PlanCache(max_entries=0)
@@ -0,0 +1,101 @@
+import random
+import sqlite3
+from collections import Counter, defaultdict
+
+import pytest
+
+from app.core.services.journal_store import RISK_RANKS, JournalStore
+from app.core.services.progress_service import build_progress_series
+
+RISK_LEVELS = ["unknown", "none", "low", "medium", "high"]
+EMOTIONS = ["joy", "sadness", "anxiety", "calm", "neutral"]
+
+
+def random_entries(make_entry, count, seed=7):
+    rng = random.Random(seed)
+    return [
+        make_entry(f"2024-05-{rng.randint(1, 9):02d}", score=round(rng.random(), 3),
+                   emotions=rng.sample(EMOTIONS, rng.randint(1, 2)), risk_level=rng.choice(RISK_LEVELS))
+        for _ in range(count)
+    ]
+
+
+def recomputed(entries):
+    """What the aggregates should hold, computed the slow way from the entries"""
+    days = defaultdict(list)
+    for entry in entries:
+        days[entry["date"]].append(entry)
+    daily = [
+        {
+            "date": day,
+            "count": len(day_entries),
+            "mean": pytest.approx(sum(e["sentiment"]["score"] for e in day_entries) / len(day_entries)),
+            "min": min(e["sentiment"]["score"] for e in day_entries),
+            "max": max(e["sentiment"]["score"] for e in day_entries),
+            "risk_level": max((e["sentiment"]["risk_level"] for e in day_entries), key=RISK_RANKS.get)
+        }
+        for day, day_entries in sorted(days.items())
+    ]
+    emotions = Counter(emotion for entry in entries for emotion in set(entry["sentiment"]["emotions"]))
+    return daily, emotions
+
+
+def test_incremental_aggregates_match_a_full_recompute(store, make_entry):
+    entries = random_entries(make_entry, 200)
+    for entry in entries[:50]:
+        store.append(entry)
+    store.append_many(entries[50:])
+    daily, emotions = recomputed(entries)
+    assert store.daily_mood() == daily
+    assert store.emotion_counts() == dict(emotions)
+    assert list(store.emotion_counts().values()) == sorted(emotions.values(), reverse=True)
+
+
+def test_rebuild_gives_the_same_aggregates(store, make_entry):
+    store.append_many(random_entries(make_entry, 100))
+    daily, emotions = store.daily_mood(), store.emotion_counts()
+    store.rebuild_aggregates()
+    assert store.daily_mood() == daily
+    assert store.emotion_counts() == emotions
+
+
+def test_daily_mood_range(store, make_entry):
+    store.append_many(random_entries(make_entry, 100))
+    assert [day["date"] for day in store.daily_mood(start="2024-05-03", end="2024-05-04")] == \
+        ["2024-05-03", "2024-05-04"]
+
+
+def test_journals_without_aggregate_tables_are_backfilled(tmp_path, make_entry):
+    path = tmp_path / "journal.db"
+    entries = random_entries(make_entry, 30)
+    JournalStore(path).append_many(entries)
+    connection = sqlite3.connect(path)
+    connection.executescript("DROP TABLE journal_daily_stats; DROP TABLE journal_emotion_counts;")
+    connection.close()
+
+    daily, emotions = recomputed(entries)
+    reopened = JournalStore(path)
+    assert reopened.daily_mood() == daily
+    assert reopened.emotion_counts() == dict(emotions)
+
+
+def test_progress_series(store, make_entry):
+    store.append_many([
+        make_entry("2024-05-01", score=0.2, emotions=["sadness"], risk_level="low"),
+        make_entry("2024-05-01", score=0.6, emotions=["joy", "sadness"], risk_level="none"),
+        make_entry("2024-05-02", score=0.9, emotions=["joy"], risk_level="unknown"),
+    ])
+    series = build_progress_series(store)
+    assert series["dates"] == ["2024-05-01", "2024-05-02"]
+    assert series["mean_score"] == [pytest.approx(0.4), 0.9]
+    assert series["min_score"] == [0.2, 0.9]
+    assert series["max_score"] == [0.6, 0.9]
+    # Days whose only analyses failed have no place on the risk chart
+    assert series["risk_dates"] == ["2024-05-01"]
+    assert series["risk"] == [0.33]
+    assert series["emotion_counts"] == {"sadness": 2, "joy": 2}
+
+
+def test_progress_series_of_an_empty_journal(store):
+    series = build_progress_series(store)
+    assert series["dates"] == [] and series["emotion_counts"] == {}
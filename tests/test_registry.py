@@ -0,0 +1,79 @@
+import pytest
+
+from app.core.services.registry import ServiceRegistry
+
+
+class Service:
+    def __init__(self, name, dependency=None):
+        self.name = name
+        self.dependency = dependency
+
+
+def make_registry(builds):
+    def factory(name, dependency=None):
+        def build(resolve):
+            builds.append(name)
+            return Service(name, resolve(dependency) if dependency else None)
+        return build
+
+    registry = ServiceRegistry()
+    registry.register("version", factory("version"))
+    registry.register("catalog", factory("catalog", dependency="version"))
+    registry.register("store", factory("store"), keep_on_reload=True)
+    registry.register("unused", factory("unused"))
+    return registry
+
+
+def test_services_are_built_once_with_their_dependencies():
+    builds = []
+    registry = make_registry(builds)
+
+    catalog = registry.get("catalog")
+    assert registry.get("catalog") is catalog
+    assert catalog.dependency is registry.get("version")
+    assert builds == ["catalog", "version"]
+    assert registry.loaded() == {"version": "Service", "catalog": "Service"}
+
+
+def test_unknown_service_raises():
+    with pytest.raises(KeyError, match="nothing"):
+        ServiceRegistry().get("nothing")
+
+
+def test_reload_rebuilds_services_in_use_and_keeps_the_rest():
+    builds = []
+    registry = make_registry(builds)
+    hooks = []
+    registry.on_reload(lambda: hooks.append(sorted(registry.loaded())))
+    old_catalog = registry.get("catalog")
+    store = registry.get("store")
+    builds.clear()
+
+    assert registry.reload() == 1
+    assert hooks == [["catalog", "store", "version"]]
+    # Rebuilt in registration order; kept and never-used services are not built
+    assert builds == ["version", "catalog"]
+    new_catalog = registry.get("catalog")
+    assert new_catalog is not old_catalog
+    assert new_catalog.dependency is registry.get("version")
+    assert registry.get("store") is store
+    assert "unused" not in registry.loaded()
+    assert registry.generation == 1
+
+
+def test_failed_reload_keeps_the_current_services():
+    registry = ServiceRegistry()
+    attempts = []
+
+    def build(resolve):
+        attempts.append(1)
+        if len(attempts) > 1:
+            raise ValueError("invalid data")
+        return Service("catalog")
+
+    registry.register("catalog", build)
+    catalog = registry.get("catalog")
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert registry.get("catalog") is catalog
+    assert registry.generation == 0
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+
+import pytest
+
+from core.services.research_cache import ArticleFetcher, TieredResearchCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetcher(ArticleFetcher):
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+        self.error = None
+
+    def fetch(self, disorder, max_results):
+        self.calls.append((disorder, max_results))
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [{"title": f"{disorder} study {i} (fetch {len(self.calls)})"} for i in range(max_results)]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fetcher():
+    return CountingFetcher()
+
+
+@pytest.fixture
+def cache(tmp_path, fetcher, clock):
+    cache = TieredResearchCache(fetcher, cache_dir=tmp_path, ttl_seconds=60, stale_ttl_seconds=600, clock=clock)
+    yield cache
+    cache.shutdown()
+
+
+def test_article_fetcher_is_abstract():
+    with pytest.raises(TypeError):
+        ArticleFetcher()
+
+
+def test_fresh_entries_are_served_from_memory(cache, fetcher):
+    first = cache.get("Depression", 3)
+    assert cache.get("depression", 3) == first
+    assert cache.get("depression", 2) == first[:2]
+    assert len(fetcher.calls) == 1
+    assert cache.stats()["memory_hits"] == 2
+
+
+def test_more_results_than_cached_refetches(cache, fetcher):
+    cache.get("depression", 2)
+    assert len(cache.get("depression", 4)) == 4
+    assert fetcher.calls == [("depression", 2), ("depression", 4)]
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path, fetcher, clock, cache):
+    articles = cache.get("Panic Disorder", 2)
+    other = TieredResearchCache(fetcher, cache_dir=tmp_path, ttl_seconds=60, clock=clock)
+    assert other.get("panic disorder", 2) == articles
+    assert len(fetcher.calls) == 1
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_legacy_list_files_are_read(tmp_path, fetcher):
+    (tmp_path / "insomnia_research.json").write_text(json.dumps([{"title": "old"}]))
+    cache = TieredResearchCache(fetcher, cache_dir=tmp_path, ttl_seconds=60, clock=time.time)
+    assert cache.get("insomnia", 1) == [{"title": "old"}]
+    assert fetcher.calls == []
+
+
+def test_unreadable_files_are_refetched(tmp_path, cache, fetcher):
+    (tmp_path / "insomnia_research.json").write_text("{not json")
+    assert len(cache.get("insomnia", 1)) == 1
+    assert len(fetcher.calls) == 1
+
+
+def test_stale_entries_are_served_while_refreshing(cache, fetcher, clock):
+    first = cache.get("depression", 2)
+    clock.now += 120
+    assert cache.get("depression", 2) == first
+    cache.shutdown()
+    assert len(fetcher.calls) == 2
+    assert cache.get("depression", 2) != first
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_expired_entries_are_fetched_on_the_callers_thread(cache, fetcher, clock):
+    first = cache.get("depression", 2)
+    clock.now += 601
+    assert cache.get("depression", 2) != first
+    assert len(fetcher.calls) == 2
+
+
+def test_failed_fetch_serves_any_cached_copy(cache, fetcher, clock):
+    first = cache.get("depression", 2)
+    clock.now += 10_000
+    fetcher.error = RuntimeError("offline")
+    assert cache.get("depression", 2) == first
+    assert cache.stats()["fetch_errors"] == 1
+
+
+def test_failed_fetch_without_cached_copy_raises(cache, fetcher):
+    fetcher.error = RuntimeError("offline")
+    with pytest.raises(RuntimeError):
+        cache.get("depression", 2)
+
+
+def test_concurrent_misses_share_one_fetch(tmp_path, clock):
+    fetcher = CountingFetcher(delay=0.2)
+    cache = TieredResearchCache(fetcher, cache_dir=tmp_path, clock=clock)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("depression", 2))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(fetcher.calls) == 1
+    assert len(results) == 4 and all(result == results[0] for result in results)
+    assert cache.stats()["shared_fetches"] == 3
+
+
+def test_invalidate_forgets_both_tiers(tmp_path, cache, fetcher):
+    cache.get("depression", 1)
+    cache.get("insomnia", 1)
+    cache.invalidate("Depression")
+    assert not (tmp_path / "depression_research.json").exists()
+    cache.get("depression", 1)
+    assert len(fetcher.calls) == 3
+    cache.invalidate()
+    assert list(tmp_path.glob("*_research.json")) == []
+    assert cache.stats()["memory_size"] == 0
@@ -0,0 +1,74 @@
+import pytest
+
+from app.core.services.research_database import (
+    ResearchDatabase, find_treatment_mentions, load_article_catalog, parse_article_catalog
+)
+from app.core.utils.exceptions import ArticleCatalogError
+
+
+def make_article(title, abstract):
+    return {"title": title, "author": "Doe, J.", "year": 2020, "abstract": abstract, "url": "https://example.org"}
+
+
+@pytest.fixture
+def database():
+    return ResearchDatabase(parse_article_catalog({
+        "Depression": [
+            make_article("A", "CBT and medication both helped."),
+            make_article("B", "Mindfulness outperformed medication."),
+            make_article("C", "Psychotherapy, including CBT, was effective.")
+        ]
+    }))
+
+
+def test_mentions_follow_the_term_order():
+    assert find_treatment_mentions("Medication after CBT") == ("cbt", "medication")
+    assert find_treatment_mentions("No treatment named") == ()
+
+
+def test_treatment_table(database):
+    assert database.get_treatment_mentions("Depression") == {
+        "cbt": {"mention_count": 2, "articles": ["A", "C"]},
+        "medication": {"mention_count": 2, "articles": ["A", "B"]},
+        "mindfulness": {"mention_count": 1, "articles": ["B"]},
+        "psychotherapy": {"mention_count": 1, "articles": ["C"]}
+    }
+    assert database.get_treatment_mentions("Depression", limit=1) == {
+        "cbt": {"mention_count": 1, "articles": ["A"]},
+        "medication": {"mention_count": 1, "articles": ["A"]}
+    }
+    assert database.get_treatment_mentions("Unknown") == {}
+
+
+def test_returned_data_does_not_change_the_catalog(database):
+    articles = database.get_articles("Depression")
+    articles[0]["title"] = "Changed"
+    database.get_treatment_mentions("Depression")["cbt"]["articles"].append("Changed")
+    assert database.get_articles("Depression")[0]["title"] == "A"
+    assert database.get_treatment_mentions("Depression")["cbt"]["articles"] == ["A", "C"]
+
+
+def test_invalid_catalogs_are_rejected(tmp_path):
+    with pytest.raises(ArticleCatalogError, match="list"):
+        parse_article_catalog({"Depression": make_article("A", "")})
+    with pytest.raises(ArticleCatalogError, match="missing url"):
+        parse_article_catalog({"Depression": [{"title": "A", "author": "", "year": 2020, "abstract": ""}]})
+    broken = tmp_path / "articles.json"
+    broken.write_text("{")
+    with pytest.raises(ArticleCatalogError):
+        load_article_catalog(broken)
+
+
+def test_bundled_catalog_loads_once():
+    assert load_article_catalog() is load_article_catalog()
+    assert ResearchDatabase().catalog is load_article_catalog()
+
+
+def test_indexed_articles_are_the_catalog_records(database):
+    indexed = database.get_indexed_articles("Depression", limit=2)
+    assert [article["title"] for article in indexed.articles] == ["A", "B"]
+    assert indexed.mentions == (("cbt", "medication"), ("medication", "mindfulness"))
+    assert not indexed.complete and database.get_indexed_articles("Depression").complete
+    with pytest.raises(TypeError):
+        indexed.articles[0]["title"] = "Changed"
+    assert database.tally_indexed_treatments(indexed) == database.get_treatment_mentions("Depression", limit=2)
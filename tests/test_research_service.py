@@ -0,0 +1,61 @@
+import importlib
+
+import pytest
+
+QUERY = "I worry constantly, feel restless and on edge, and cannot sleep"
+UNRELATED_QUERIES = [
+    "hearing voices and paranoid thoughts",
+    "nightmares flashbacks after trauma",
+    "low mood and loss of interest",
+    "astronomy, sourdough baking and a completely new vocabulary"
+]
+# The API's copy matches on the criteria alone, with a higher threshold
+EXPECTED_RANKING = {
+    "app.core.services.research_service": ["anxiety", "panic"],
+    "core.services.research_service": ["anxiety"]
+}
+
+
+@pytest.fixture(scope="module", params=list(EXPECTED_RANKING))
+def service_module(request):
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def service(service_module):
+    return importlib.import_module(service_module).ResearchService()
+
+
+def test_scores_do_not_depend_on_earlier_queries(service, service_module):
+    vocabulary = dict(service.retriever.vectorizer.vocabulary_)
+    postings = service.retriever.postings
+    before = service.analyze_symptoms(QUERY)
+    for query in UNRELATED_QUERIES:
+        service.analyze_symptoms(query)
+
+    assert service.analyze_symptoms(QUERY) == before
+    assert [condition for condition, _ in before] == EXPECTED_RANKING[service_module]
+    assert service.retriever.vectorizer.vocabulary_ == vocabulary
+    assert service.retriever.postings is postings
+
+
+def test_unrelated_text_matches_nothing(service):
+    assert service.analyze_symptoms("astronomy and sourdough baking") == []
+
+
+def test_batch_matches_single_calls(service):
+    texts = [QUERY] + UNRELATED_QUERIES + ["", "anxious, panicky and low"]
+    # Five chunks of two, the last one short
+    assert list(service.analyze_symptoms_batch(iter(texts), chunk_size=2)) == \
+        [service.analyze_symptoms(text) for text in texts]
+
+
+def test_batch_keeps_the_top_k(service):
+    texts = [QUERY, "anxious, panicky and low"]
+    assert list(service.analyze_symptoms_batch(texts, top_k=1)) == \
+        [service.analyze_symptoms(text)[:1] for text in texts]
+
+
+def test_batch_rejects_empty_chunks(service):
+    with pytest.raises(ValueError):
+        list(service.analyze_symptoms_batch([QUERY], chunk_size=0))
@@ -0,0 +1,56 @@
+from datetime import date
+
+from app.core.models.schedule import ENTRY_KEYS, ScheduleEntry, TherapySchedule
+from app.core.services.technique_database import EMPTY_TECHNIQUE, TechniqueDatabase
+
+START = date(2024, 3, 4)
+
+
+def make_entry(day_offset, time="08:00", activity="Morning Mindfulness", technique_id=None,
+               technique_db=None):
+    return ScheduleEntry(START.toordinal() + day_offset, time, activity, "Daily Practice", "20 minutes",
+                         technique_id, technique_db or TechniqueDatabase())
+
+
+def test_entry_reads_like_the_legacy_dict():
+    database = TechniqueDatabase()
+    technique_id = next(iter(database.catalog.by_id))
+    entry = make_entry(1, technique_id=technique_id, technique_db=database)
+    assert entry["date"] == "2024-03-05"
+    assert entry["day"] == "Tuesday"
+    assert entry["time"] == "08:00"
+    assert entry.get("duration") == "20 minutes"
+    assert entry["technique_details"] is database.get_technique_by_id(technique_id)
+    assert list(entry) == list(ENTRY_KEYS)
+    assert entry.as_dict() == {key: entry[key] for key in ENTRY_KEYS}
+    assert entry.get("missing", "default") == "default"
+
+
+def test_entry_without_technique_has_empty_details():
+    entry = make_entry(0)
+    assert entry.technique_details is EMPTY_TECHNIQUE
+    assert entry.get("technique_details", {}) == {}
+
+
+def test_entries_share_interned_strings():
+    first, second = make_entry(0, activity="".join(["Morning ", "Mindfulness"])), make_entry(1)
+    assert first.activity is second.activity
+
+
+def test_schedule_ranges_and_slices():
+    schedule = TherapySchedule([make_entry(day) for day in (0, 0, 1, 3, 6)])
+    assert len(schedule) == 5
+    assert schedule.start_date == START
+    assert schedule.end_date == date(2024, 3, 10)
+    in_range = list(schedule.iter_range(date(2024, 3, 5), date(2024, 3, 7)))
+    assert [entry["date"] for entry in in_range] == ["2024-03-05", "2024-03-07"]
+    assert list(schedule.iter_range(date(2024, 4, 1), date(2024, 4, 2))) == []
+    assert isinstance(schedule[1:3], TherapySchedule) and len(schedule[1:3]) == 2
+    assert schedule.as_dicts()[0]["date"] == "2024-03-04"
+
+
+def test_empty_schedule():
+    schedule = TherapySchedule([])
+    assert schedule.start_date is None and schedule.end_date is None
+    assert list(schedule.iter_range(START, START)) == []
+    assert repr(schedule) == "TherapySchedule([])"
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from app.core.services.analysis_cache import AnalysisCache, text_fingerprint
+from app.core.services.keyword_matcher import EMOTION_KEYWORDS, RISK_KEYWORDS, get_keyword_scanner
+from app.core.services.sentiment_analyzer import SentimentAnalyzer, get_shared_analyzer, warm_up_sentiment_analyzer
+
+CUSTOM_EMOTIONS = {'boredom': ['bored', 'dull'], **EMOTION_KEYWORDS}
+CUSTOM_RISK = {'high': ['in danger'], 'low': ['tired']}
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return SentimentAnalyzer(cache=AnalysisCache(max_entries=0))
+
+
+def test_default_tables_share_the_process_scanner(analyzer):
+    assert analyzer.emotion_keywords is EMOTION_KEYWORDS
+    assert analyzer.risk_keywords is RISK_KEYWORDS
+    assert analyzer.keyword_scanner is get_keyword_scanner()
+
+
+def test_analysis_reports_emotions_and_risk(analyzer):
+    result = analyzer.analyze("I am so happy today but a bit anxious and overwhelmed")
+    assert result["sentiment"]["emotions"] == ["joy", "anxiety"]
+    assert result["sentiment"]["risk_level"] == "low"
+    assert 0 <= result["sentiment"]["score"] <= 1
+    assert result["analyzer_version"] == analyzer.version
+
+
+def test_keyword_tables_passed_to_the_constructor_are_used():
+    analyzer = SentimentAnalyzer(cache=AnalysisCache(max_entries=0),
+                                 emotion_keywords=CUSTOM_EMOTIONS, risk_keywords=CUSTOM_RISK)
+    assert analyzer.detect_emotions("such a dull, boring day") == ["boredom"]
+    assert analyzer.assess_risk_level("I feel tired") == "low"
+    assert analyzer.assess_risk_level("I feel overwhelmed") == "none"
+    assert analyzer.analyze("I was bored and in danger")["sentiment"]["risk_level"] == "high"
+
+
+def test_assigned_keyword_tables_are_used():
+    analyzer = SentimentAnalyzer(cache=AnalysisCache(max_entries=0))
+    assert analyzer.detect_emotions("so bored") == ["neutral"]
+    analyzer.emotion_keywords = CUSTOM_EMOTIONS
+    analyzer.risk_keywords = CUSTOM_RISK
+    assert analyzer.detect_emotions("so bored") == ["boredom"]
+    assert analyzer.assess_risk_level("tired") == "low"
+
+
+def test_analyze_many_workers_use_the_analyzers_tables():
+    analyzer = SentimentAnalyzer(cache=AnalysisCache(max_entries=0), emotion_keywords=CUSTOM_EMOTIONS)
+    texts = ["so bored", "so happy", ""]
+    outcomes = list(analyzer.analyze_many(texts, max_workers=2, chunk_size=1))
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2]
+    assert [outcome.result["sentiment"]["emotions"] for outcome in outcomes] == \
+        [["boredom"], ["joy"], ["neutral"]]
+
+
+def test_repeated_texts_are_served_from_the_cache():
+    analyzer = SentimentAnalyzer(cache=AnalysisCache())
+    first = analyzer.analyze("I am so happy today")
+    second = analyzer.analyze("I am so happy today")
+    assert second == first and second is not first
+    assert first["text_hash"] == text_fingerprint("I am so happy today")
+    assert analyzer.cache.get(first["text_hash"], analyzer.version) == first
+
+
+def test_every_thread_gets_the_shared_analyzer():
+    analyzers = []
+    threads = [threading.Thread(target=lambda: analyzers.append(get_shared_analyzer())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert len(analyzers) == 4
+    assert all(shared is analyzers[0] for shared in analyzers)
+    assert warm_up_sentiment_analyzer() is analyzers[0]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_analyze_many_keeps_input_order_and_reports_failures(analyzer, max_workers):
+    texts = ["I am so happy today", None, "I feel sad and lonely", "Just a day"]
+    outcomes = list(analyzer.analyze_many(iter(texts), max_workers=max_workers, chunk_size=2,
+                                          max_pending_chunks=1))
+    assert [outcome.index for outcome in outcomes] == [0, 1, 2, 3]
+    assert outcomes[0].result == analyzer.analyze(texts[0])
+    assert outcomes[1].result is None
+    assert outcomes[1].error["type"] == "AttributeError"
+    assert outcomes[2].result["sentiment"]["emotions"] == ["sadness"]
+    assert outcomes[3].error is None
+
+
+def test_analyze_many_rejects_empty_chunks(analyzer):
+    with pytest.raises(ValueError):
+        list(analyzer.analyze_many(["text"], chunk_size=0))
+
+
+def test_version_follows_the_keyword_tables(analyzer):
+    custom = SentimentAnalyzer(cache=AnalysisCache(max_entries=0))
+    assert custom.version == analyzer.version
+    custom.risk_keywords = dict(RISK_KEYWORDS)
+    assert custom.version == analyzer.version
+    custom.risk_keywords = dict(reversed(list(RISK_KEYWORDS.items())))
+    assert custom.version != analyzer.version
+    custom.risk_keywords = RISK_KEYWORDS
+    custom.emotion_keywords = CUSTOM_EMOTIONS
+    assert custom.version != analyzer.version
+
+
+def test_cached_analyses_are_not_reused_across_keyword_tables():
+    analyzer = SentimentAnalyzer(cache=AnalysisCache())
+    before = analyzer.analyze("so bored today")
+    analyzer.emotion_keywords = CUSTOM_EMOTIONS
+    after = analyzer.analyze("so bored today")
+    assert before["sentiment"]["emotions"] == ["neutral"]
+    assert after["sentiment"]["emotions"] == ["boredom"]
+    assert after["analyzer_version"] != before["analyzer_version"]
+    assert after["text_hash"] == before["text_hash"]
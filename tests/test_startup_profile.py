@@ -0,0 +1,39 @@
+import pytest
+
+from app.core.utils.startup_profile import (
+    ImportTiming, StartupProfile, check_profile, profile_startup
+)
+
+
+def make_profile(loaded_modules, elapsed_ms=100.0):
+    timings = [
+        ImportTiming("json", 300, 900, 0),
+        ImportTiming("json.decoder", 600, 600, 1),
+        ImportTiming("app.core.services.registry", 200, 200, 0)
+    ]
+    return StartupProfile("main", elapsed_ms, timings, loaded_modules)
+
+
+def test_top_and_by_package():
+    profile = make_profile(["json"])
+    assert [timing.module for timing in profile.top(2)] == ["json", "json.decoder"]
+    assert profile.by_package() == pytest.approx({"json": 0.9, "app": 0.2})
+    assert list(profile.by_package()) == ["json", "app"]
+
+
+def test_check_profile_flags_heavy_packages_and_budget():
+    assert check_profile(make_profile(["json", "sklearn.base"]), budget_ms=None) == []
+    assert check_profile(make_profile(["json", "sklearn", "nltk"]), budget_ms=None) == [
+        "sklearn is imported at startup",
+        "nltk is imported at startup"
+    ]
+    assert check_profile(make_profile([], elapsed_ms=250), budget_ms=200) == [
+        "startup took 250 ms, budget is 200 ms"
+    ]
+
+
+def test_heavy_packages_stay_off_the_startup_path():
+    for module in ("main", "pages.01_Calendar_and_Journal"):
+        profile = profile_startup(module)
+        assert profile.timings
+        assert check_profile(profile, budget_ms=None) == []
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app.core.services.technique_database import (
+    EMPTY_TECHNIQUE, TechniqueDatabase, load_technique_catalog, parse_technique_catalog
+)
+from app.core.utils.exceptions import DuplicateTechniqueError, TechniqueCatalogError
+
+
+def make_record(technique_id, name):
+    return {
+        "id": technique_id,
+        "name": name,
+        "description": f"About {name}",
+        "steps": ["first", "second"],
+        "exercises": [{"name": "Practice", "duration": "5 minutes", "instructions": ["breathe"]}],
+        "resources": []
+    }
+
+
+def test_bundled_catalog_loads_and_is_indexed_both_ways():
+    database = TechniqueDatabase()
+    assert database.catalog.by_id
+    for technique_id, record in database.catalog.by_id.items():
+        assert database.get_technique_by_id(technique_id) is record
+        assert database.get_technique_info(record["name"]) is record
+
+
+def test_catalog_is_loaded_once_per_process():
+    assert load_technique_catalog() is load_technique_catalog()
+    assert TechniqueDatabase().catalog is TechniqueDatabase().catalog
+
+
+def test_records_are_read_only():
+    catalog = parse_technique_catalog([make_record("pmr", "Progressive Muscle Relaxation")])
+    record = catalog.by_id["pmr"]
+    with pytest.raises(TypeError):
+        record["name"] = "changed"
+    assert isinstance(record["steps"], tuple)
+    with pytest.raises(TypeError):
+        record["exercises"][0]["name"] = "changed"
+
+
+def test_unknown_techniques_get_the_empty_record():
+    database = TechniqueDatabase(parse_technique_catalog([make_record("pmr", "PMR")]))
+    assert database.get_technique_by_id("missing") is EMPTY_TECHNIQUE
+    assert database.get_technique_info("Missing") is EMPTY_TECHNIQUE
+    assert not database.get_technique_info("Missing").get("steps")
+
+
+def test_duplicates_are_all_reported():
+    records = [make_record("a", "A"), make_record("a", "Other"), make_record("b", "A"), make_record("c", "C")]
+    with pytest.raises(DuplicateTechniqueError) as error:
+        parse_technique_catalog(records, "techniques.json")
+    assert error.value.duplicates == ["Other", "A"]
+    assert error.value.path == "techniques.json"
+
+
+def test_missing_fields_are_rejected():
+    record = make_record("a", "A")
+    del record["steps"]
+    with pytest.raises(TechniqueCatalogError, match="missing steps"):
+        parse_technique_catalog([record])
+    with pytest.raises(TechniqueCatalogError):
+        parse_technique_catalog({"a": record})
+
+
+def test_unreadable_files_raise_catalog_errors(tmp_path):
+    broken = tmp_path / "techniques.json"
+    broken.write_text("[{")
+    with pytest.raises(TechniqueCatalogError):
+        load_technique_catalog(broken)
+    with pytest.raises(TechniqueCatalogError):
+        load_technique_catalog(tmp_path / "missing.json")
+    valid = tmp_path / "valid.json"
+    valid.write_text(json.dumps([make_record("a", "A")]))
+    assert list(load_technique_catalog(valid).by_id) == ["a"]